@@ -1,11 +1,54 @@
 """ Extract subtitles from a video file. """
 
+from concurrent.futures import ProcessPoolExecutor
 import argparse
+import glob
+import shutil
 import sys
 import os
+from extract_subtitles.utils.change_detector import (
+    BINARIZATION_THRESHOLD,
+    CHANGE_THRESHOLD,
+)
 from extract_subtitles.utils.mapper import get_writing_system
-from extract_subtitles.utils.video_converter import convert_to_images
-from extract_subtitles.utils.extractor import extract_subtitle
+from extract_subtitles.utils.text_filter import EMPTY_THRESHOLD
+from extract_subtitles.utils.frames import (
+    FRAME_BUFFER_SIZE,
+    buffer_frames,
+    read_frames_file,
+    save_frames,
+)
+from extract_subtitles.utils.video_converter import (
+    DECODERS,
+    FFMPEG_BINARY,
+    SAMPLING_MODES,
+    find_frame,
+    get_fps,
+    read_frames,
+    read_regions,
+    sampled_frames,
+)
+from extract_subtitles.utils.checkpoint import Checkpoint
+from extract_subtitles.utils.extractor import (
+    collect_subtitles,
+    extract_subtitle,
+    extract_subtitle_regions,
+    write_subtitles,
+)
+from extract_subtitles.utils.adaptive import COARSE_FRAME_RATE, recognize_adaptive
+from extract_subtitles.utils.area_detector import detect_subtitle_area
+from extract_subtitles.utils.merger import MERGE_THRESHOLD, merge_readings
+from extract_subtitles.utils.ocr_cache import OCR_CACHE_SIZE, OCRCache
+from extract_subtitles.utils.recognizer import (
+    OCR_PROFILE,
+    OCR_PROFILES,
+    get_ocr,
+    ocr_settings,
+)
+from extract_subtitles.utils.parallel import (
+    create_executor,
+    extract_subtitle_parallel,
+)
 
 
 def __parse_arguments() -> argparse.Namespace:
@@ -21,11 +64,22 @@ def __parse_arguments() -> argparse.Namespace:
 
     parser.add_argument(
         "--input-video",
-        help="the file name of the video to be processed",
-        required=True,
+        help="the file names or glob patterns of the videos to be processed",
+        nargs="+",
+        default=[],
+    )
+    parser.add_argument(
+        "--manifest",
+        help="the file listing the videos to be processed, one per line, "
+        "optionally followed by a tab and the language of their subtitles",
+    )
+    parser.add_argument(
+        "--output-subtitle",
+        help="the file name of the output subtitles of a single video",
     )
     parser.add_argument(
-        "--output-subtitle", help="the file name of the output subtitles", required=True
+        "--output-directory",
+        help="the directory to write the subtitles of each video to, named after the video",
     )
     parser.add_argument(
         "--input-language",
@@ -34,24 +88,347 @@ def __parse_arguments() -> argparse.Namespace:
     )
     parser.add_argument(
         "--subtitle-area",
-        help="the area of the subtitles on the frame (in percentage from the top left corner)",
-        required=True,
+        help="the area of the subtitles on the frame (in percentage from the top left corner): "
+        "the top of the area, the left, top, right and bottom of the area separated by commas, "
+        "or auto to detect the area; several areas named as name=area are extracted to a subtitle file each",
+        nargs="+",
+    )
+    parser.add_argument(
+        "--frame-rate",
+        help="the number of frames per second to be recognized",
+        type=int,
+        default=10,
+    )
+    parser.add_argument(
+        "--sampling",
+        help="read every frame, grab the skipped frames without decoding them or seek to each sampled frame",
+        choices=SAMPLING_MODES,
+        default="grab",
+    )
+    parser.add_argument(
+        "--empty-threshold",
+        help="the fraction of the high-contrast pixels below which the frame is considered to have no text "
+        "(0 to disable)",
+        type=float,
+        default=EMPTY_THRESHOLD,
+    )
+    parser.add_argument(
+        "--verify-empty",
+        help="recognize the frames considered to have no text anyway and report how many of them have text",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--merge-threshold",
+        help="the similarity (0-1) above which the neighbouring readings are merged into one subtitle "
+        "(1 to disable)",
+        type=float,
+        default=MERGE_THRESHOLD,
+    )
+    parser.add_argument(
+        "--ocr-profile",
+        help="recognize faster or more accurately: fast binarizes the frames and downscales their text the most, "
+        "accurate keeps the frames as they are and classifies the angle of the text",
+        choices=OCR_PROFILES,
+        default=OCR_PROFILE,
+    )
+    parser.add_argument(
+        "--localize-lines",
+        help="find the lines of text with image processing and recognize them without the text detector, "
+        "falling back to the detector on the frames whose lines are unclear",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--batch-size",
+        help="the number of changed frames to be recognized at once",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--workers",
+        help="the number of processes to extract the segments of the video in parallel",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--adaptive",
+        help="sample the frames at the coarse frame rate and search the exact frame of each change in between",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--coarse-frame-rate",
+        help="the number of frames per second sampled with adaptive sampling",
+        type=int,
+        default=COARSE_FRAME_RATE,
+    )
+    parser.add_argument(
+        "--resume",
+        help="continue the extraction interrupted before from its last checkpoint",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--frames-file",
+        help="the frame store to save the sampled frames to, to be extracted again with --input-frames",
+    )
+    parser.add_argument(
+        "--input-frames",
+        help="the frame store saved with --frames-file to extract the subtitles from "
+        "instead of decoding the video again",
+    )
+    parser.add_argument(
+        "--ocr-cache",
+        help="the database file to cache the recognized text of the frames in across the runs",
+    )
+    parser.add_argument(
+        "--ocr-cache-size",
+        help="the maximum size of the OCR cache in megabytes",
+        type=int,
+        default=OCR_CACHE_SIZE // (1024 * 1024),
+    )
+    parser.add_argument(
+        "--decoder",
+        help="decode the full frames with OpenCV or let ffmpeg sample, crop and convert them to grayscale",
+        choices=DECODERS,
+        default="opencv",
+    )
+    parser.add_argument(
+        "--change-threshold",
+        help="the fraction of the pixels that have to change to run OCR on the frame again (0 to disable)",
+        type=float,
+        default=CHANGE_THRESHOLD,
+    )
+    parser.add_argument(
+        "--binarization-threshold",
+        help="the brightness (0-255) above which a pixel is considered to be a part of the text",
+        type=int,
+        default=BINARIZATION_THRESHOLD,
     )
 
     return parser.parse_args()
 
 
+def __checkpoint_file(subtitle_file: str) -> str:
+    """
+    Returns the path to the checkpoint file of the extraction.
+
+    Args:
+        subtitle_file (str): The path to the output subtitle file.
+
+    Returns:
+        str: The path to the checkpoint file next to the output subtitle file.
+    """
+    return f"{subtitle_file}.checkpoint"
+
+
+def __find_videos(args: argparse.Namespace) -> list[tuple[str, str]]:
+    """
+    Lists the videos given by their file names, glob patterns and the manifest.
+
+    Args:
+        args (argparse.Namespace): The command-line arguments.
+
+    Returns:
+        list[tuple[str, str]]: The paths to the videos and the languages of their subtitles.
+    """
+    videos = []
+    for pattern in args.input_video:
+        # a pattern matching nothing is kept to be reported as a missing file
+        video_files = sorted(glob.glob(pattern)) or [pattern]
+        videos += [(video_file, args.input_language) for video_file in video_files]
+
+    if args.manifest is not None:
+        directory = os.path.dirname(args.manifest)
+        with open(args.manifest, "r", encoding="utf-8") as fp:
+            for line in fp:
+                line = line.strip()
+                if line == "" or line.startswith("#"):
+                    continue
+
+                video_file, _, language = line.partition("\t")
+                videos.append(
+                    (
+                        os.path.join(directory, video_file.strip()),
+                        language.strip() or args.input_language,
+                    )
+                )
+
+    return videos
+
+
+def __video_name(video_file: str) -> str:
+    """
+    Returns the name of the video the files of its extraction are named after.
+
+    Args:
+        video_file (str): The path to the video file.
+
+    Returns:
+        str: The file name of the video without the extension.
+    """
+    return os.path.splitext(os.path.basename(video_file))[0]
+
+
+def __parse_subtitle_area(value: str) -> tuple[int, int, int, int] | None:
+    """
+    Parses the area of the subtitles given as the top of the area or as its left, top, right and bottom.
+
+    Args:
+        value (str): The value of the subtitle area argument.
+
+    Returns:
+        tuple[int, int, int, int] | None: The percentages of the area: left, right, top and bottom,
+                                          or None if the value is invalid.
+    """
+    parts = value.split(",")
+    if len(parts) not in (1, 4) or not all(part.strip().isnumeric() for part in parts):
+        return None
+
+    percents = [int(part) for part in parts]
+    if any(percent > 100 for percent in percents):
+        return None
+
+    if len(percents) == 1:
+        return 0, 100, percents[0], 100
+
+    x1, y1, x2, y2 = percents
+    if x1 >= x2 or y1 >= y2:
+        return None
+
+    return x1, x2, y1, y2
+
+
+def __parse_regions(values: list[str]) -> dict[str, str] | None:
+    """
+    Parses the areas of the subtitles given as a single area or as several named ones.
+
+    Args:
+        values (list[str]): The values of the subtitle area argument.
+
+    Returns:
+        dict[str, str] | None: The area of each region, the single area is named with an empty string,
+                               or None if the values are invalid.
+    """
+    if len(values) == 1 and "=" not in values[0]:
+        area = values[0]
+        if area != "auto" and __parse_subtitle_area(area) is None:
+            return None
+
+        return {"": area}
+
+    regions = {}
+    for value in values:
+        name, _, area = value.partition("=")
+        if name == "" or name in regions or __parse_subtitle_area(area) is None:
+            return None
+
+        regions[name] = area
+
+    return regions
+
+
+def __subtitle_files(args: argparse.Namespace, subtitle_file: str) -> dict[str, str]:
+    """
+    Returns the paths to the output subtitle files of each region.
+
+    Args:
+        args (argparse.Namespace): The command-line arguments.
+        subtitle_file (str): The path to the output subtitle file.
+
+    Returns:
+        dict[str, str]: The subtitle file of each region named after it, or the subtitle file itself
+                        for the single area.
+    """
+    regions = __parse_regions(args.subtitle_area)
+    if "" in regions:
+        return {"": subtitle_file}
+
+    root, extension = os.path.splitext(subtitle_file)
+
+    return {name: f"{root}.{name}{extension}" for name in regions}
+
+
 def __check_arguments(args: argparse.Namespace, language: str) -> None:
     """
     Check the validity of the input arguments.
 
-    This function checks if the input video file exists, if the output subtitle file already exists,
-    and if the subtitle area value is within the valid range of 0 to 100.
+    This function checks if the videos and the output are given, if the subtitle area values are
+    within the valid range of 0 to 100, and if the other options are within their ranges.
 
     If any of the checks fail, an appropriate error message is printed and the program exits.
     """
-    if not os.path.isfile(args.input_video):
-        sys.exit(f"File {args.input_video} does not exist")
+    if args.input_frames is not None:
+        __check_input_frames(args, language)
+        return
+
+    if not args.input_video and args.manifest is None:
+        sys.exit("Input video or manifest is required")
+
+    if args.manifest is not None and not os.path.isfile(args.manifest):
+        sys.exit(f"File {args.manifest} does not exist")
+
+    if (args.output_subtitle is None) == (args.output_directory is None):
+        sys.exit("Either output subtitle or output directory is required")
+
+    if args.output_directory is not None and not os.path.isdir(args.output_directory):
+        sys.exit(f"Directory {args.output_directory} does not exist")
+
+    if language == "Unknown":
+        sys.exit(f"Language {args.input_language} is not supported")
+
+    if args.subtitle_area is None:
+        sys.exit("Subtitle area is required")
+
+    regions = __parse_regions(args.subtitle_area)
+    if regions is None:
+        sys.exit(
+            "Subtitle area should be auto, a value or four values (left, top, right, bottom) between 0 and 100, "
+            "or several of them named as name=area"
+        )
+
+    if "" not in regions and (
+        args.workers > 1 or args.adaptive or args.resume or args.frames_file is not None
+    ):
+        sys.exit(
+            "Several subtitle areas do not support workers, adaptive sampling, resuming and saving frames"
+        )
+
+    if args.frame_rate <= 0:
+        sys.exit("Frame rate should be greater than 0")
+
+    if args.coarse_frame_rate <= 0:
+        sys.exit("Coarse frame rate should be greater than 0")
+
+    if args.resume and (args.workers > 1 or args.adaptive):
+        sys.exit("Resuming does not support workers and adaptive sampling")
+
+    if args.workers <= 0:
+        sys.exit("Number of workers should be greater than 0")
+
+    if args.adaptive and (args.workers > 1 or args.frames_file is not None):
+        sys.exit("Adaptive sampling does not support workers and saving frames")
+
+    if args.decoder == "ffmpeg" and shutil.which(FFMPEG_BINARY) is None:
+        sys.exit(f"Decoder {FFMPEG_BINARY} is not found")
+
+    __check_recognition_arguments(args)
+
+
+def __check_input_frames(args: argparse.Namespace, language: str) -> None:
+    """
+    Check the validity of the arguments of the extraction from a frame store.
+
+    The frames of the store have been sampled and cropped when it was saved, so the options of the reading
+    and the options that read the video again are not supported.
+
+    If any of the checks fail, an appropriate error message is printed and the program exits.
+    """
+    if not os.path.isfile(args.input_frames):
+        sys.exit(f"File {args.input_frames} does not exist")
+
+    if args.input_video or args.manifest is not None:
+        sys.exit("Input frames do not support input videos and manifest")
+
+    if args.output_subtitle is None:
+        sys.exit("Output subtitle is required for input frames")
 
     if os.path.isfile(args.output_subtitle):
         sys.exit(f"File {args.output_subtitle} already exists")
@@ -59,15 +436,415 @@ def __check_arguments(args: argparse.Namespace, language: str) -> None:
     if language == "Unknown":
         sys.exit(f"Language {args.input_language} is not supported")
 
-    if (
-        not args.subtitle_area.isnumeric()
-        or int(args.subtitle_area) < 0
-        or int(args.subtitle_area) > 100
-    ):
-        sys.exit("Subtitle area should be between 0 and 100")
+    if args.subtitle_area is not None:
+        sys.exit(
+            "Input frames have been cropped to the subtitle area when they were saved"
+        )
+
+    if args.workers > 1 or args.adaptive or args.resume or args.frames_file is not None:
+        sys.exit(
+            "Input frames do not support workers, adaptive sampling, resuming and saving frames"
+        )
+
+    __check_recognition_arguments(args)
+
+
+def __check_recognition_arguments(args: argparse.Namespace) -> None:
+    """
+    Check the validity of the arguments of the recognition, shared by the videos and the frame store.
+
+    If any of the checks fail, an appropriate error message is printed and the program exits.
+    """
+    if not 0 <= args.empty_threshold <= 1:
+        sys.exit("Empty threshold should be between 0 and 1")
+
+    if not 0 <= args.merge_threshold <= 1:
+        sys.exit("Merge threshold should be between 0 and 1")
+
+    if args.batch_size <= 0:
+        sys.exit("Batch size should be greater than 0")
+
+    if args.ocr_cache_size <= 0:
+        sys.exit("OCR cache size should be greater than 0")
+
+    if not 0 <= args.change_threshold <= 1:
+        sys.exit("Change threshold should be between 0 and 1")
+
+    if not 0 <= args.binarization_threshold <= 255:
+        sys.exit("Binarization threshold should be between 0 and 255")
+
+
+def __check_video(
+    args: argparse.Namespace,
+    video_file: str,
+    language: str,
+    subtitle_file: str,
+    resume: bool,
+) -> None:
+    """
+    Check the validity of a video to be processed.
+
+    This function checks if the video file exists and can be read, if the output subtitle files already exist,
+    if the language is supported and if there is the checkpoint to resume from.
+
+    If any of the checks fail, an appropriate error message is printed and the program exits.
+    """
+    if not os.path.isfile(video_file):
+        sys.exit(f"File {video_file} does not exist")
+
+    if get_fps(video_file) <= 0:
+        sys.exit(f"File {video_file} is not a readable video")
+
+    for output_file in __subtitle_files(args, subtitle_file).values():
+        if os.path.isfile(output_file) and not resume:
+            sys.exit(f"File {output_file} already exists")
+
+    if get_writing_system(language) == "Unknown":
+        sys.exit(f"Language {language} is not supported")
+
+    if resume and not os.path.isfile(__checkpoint_file(subtitle_file)):
+        sys.exit(f"File {__checkpoint_file(subtitle_file)} does not exist")
+
+
+def __recognition_options(args: argparse.Namespace) -> dict:
+    """
+    Returns the options of the recognition of the command-line arguments.
+
+    Args:
+        args (argparse.Namespace): The command-line arguments.
+
+    Returns:
+        dict: The keyword arguments of `recognize_frames`.
+    """
+    return {
+        "change_threshold": args.change_threshold,
+        "binarization_threshold": args.binarization_threshold,
+        "batch_size": args.batch_size,
+        "empty_threshold": args.empty_threshold,
+        "verify_empty": args.verify_empty,
+        "profile": args.ocr_profile,
+        "localize": args.localize_lines,
+    }
+
+
+def __cache_options(args: argparse.Namespace) -> dict | None:
+    """
+    Returns the options of the OCR cache of the command-line arguments.
+
+    Args:
+        args (argparse.Namespace): The command-line arguments.
+
+    Returns:
+        dict | None: The keyword arguments of `OCRCache` except for the settings, or None not to use the cache.
+    """
+    if args.ocr_cache is None:
+        return None
+
+    return {
+        "cache_file": args.ocr_cache,
+        "max_size": args.ocr_cache_size * 1024 * 1024,
+    }
+
+
+def __extract_frames(args: argparse.Namespace) -> None:
+    """
+    Extracts the subtitles from the frames saved to the frame store, without decoding the video again.
+
+    Args:
+        args (argparse.Namespace): The command-line arguments.
+
+    Returns:
+        None
+    """
+    cache = None
+    cache_options = __cache_options(args)
+    if cache_options is not None:
+        cache = OCRCache(
+            settings=ocr_settings(
+                args.input_language,
+                args.batch_size,
+                args.ocr_profile,
+                args.localize_lines,
+            ),
+            **cache_options,
+        )
+
+    try:
+        extract_subtitle(
+            buffer_frames(read_frames_file(args.input_frames)),
+            args.input_language,
+            args.output_subtitle,
+            cache=cache,
+            merge_threshold=args.merge_threshold,
+            **__recognition_options(args),
+        )
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def __extract_video(
+    args: argparse.Namespace,
+    video_file: str,
+    language: str,
+    subtitle_file: str,
+    frames_file: str | None,
+    resume: bool,
+    executor: ProcessPoolExecutor | None = None,
+) -> None:
+    """
+    Extracts the subtitles from a video with the options of the command-line arguments.
+
+    Args:
+        args (argparse.Namespace): The command-line arguments.
+        video_file (str): The path to the video file.
+        language (str): The language of the subtitles.
+        subtitle_file (str): The path to the output subtitle file.
+        frames_file (str | None): The frame store to save the sampled frames to, or None not to save them.
+        resume (bool): Whether to continue the extraction from its checkpoint.
+        executor (ProcessPoolExecutor | None, optional): The pool of the worker processes shared by the videos.
+                                                         Defaults to None.
+
+    Returns:
+        None
+    """
+    regions = __parse_regions(args.subtitle_area)
+    if "" not in regions:
+        __extract_regions(args, video_file, language, subtitle_file, regions)
+        return
 
+    if regions[""] == "auto":
+        x1, x2, y1, y2 = detect_subtitle_area(video_file)
+    else:
+        x1, x2, y1, y2 = __parse_subtitle_area(regions[""])
 
-FRAMES_DIR = "frames"
+    read_options = {
+        "frame_rate": args.frame_rate,
+        "x1_percent": x1,
+        "x2_percent": x2,
+        "y1_percent": y1,
+        "y2_percent": y2,
+        "sampling": args.sampling,
+        "decoder": args.decoder,
+        # the buffers of the frames waiting in the queue and in a batch are not reused
+        "pool_size": FRAME_BUFFER_SIZE + args.batch_size + 2,
+    }
+    recognition_options = __recognition_options(args)
+
+    cache_options = __cache_options(args)
+
+    if args.workers > 1:
+        extract_subtitle_parallel(
+            video_file,
+            language,
+            subtitle_file,
+            args.workers,
+            read_options,
+            recognition_options,
+            frames_file,
+            cache_options,
+            args.merge_threshold,
+            executor,
+        )
+        return
+
+    cache = None
+    if cache_options is not None:
+        # adaptive sampling recognizes a single crop at a time
+        batch_size = 1 if args.adaptive else args.batch_size
+        cache = OCRCache(
+            settings=ocr_settings(
+                language, batch_size, args.ocr_profile, args.localize_lines
+            ),
+            **cache_options,
+        )
+
+    try:
+        if args.adaptive:
+            readings = recognize_adaptive(
+                video_file,
+                get_ocr(language, 1, args.ocr_profile),
+                args.coarse_frame_rate,
+                x1_percent=x1,
+                x2_percent=x2,
+                y1_percent=y1,
+                y2_percent=y2,
+                change_threshold=args.change_threshold,
+                binarization_threshold=args.binarization_threshold,
+                empty_threshold=args.empty_threshold,
+                cache=cache,
+                profile=args.ocr_profile,
+                localize=args.localize_lines,
+            )
+            readings = merge_readings(readings, args.merge_threshold)
+            write_subtitles(collect_subtitles(readings), subtitle_file)
+            return
+
+        checkpoint = Checkpoint(
+            __checkpoint_file(subtitle_file),
+            subtitle_file,
+            # a checkpoint made with other settings would mix two extractions in one subtitle file
+            {
+                "input_video": video_file,
+                "input_language": language,
+                "merge_threshold": args.merge_threshold,
+            }
+            | read_options
+            | recognition_options,
+        )
+        start_frame = 0
+        if resume:
+            if not checkpoint.load():
+                sys.exit("Checkpoint has been made with other arguments")
+
+            if checkpoint.timestamp is not None:
+                start_frame = find_frame(video_file, checkpoint.timestamp) + 1
+                print(f"Resume the extraction after {checkpoint.timestamp}")
+
+        frames = read_frames(video_file, start_frame=start_frame, **read_options)
+        if frames_file is not None:
+            frame_numbers = sampled_frames(
+                video_file, read_options["frame_rate"], start_frame
+            )
+            frames = save_frames(frames, frames_file, frame_numbers)
+
+        extract_subtitle(
+            buffer_frames(frames),
+            language,
+            subtitle_file,
+            cache=cache,
+            checkpoint=checkpoint,
+            merge_threshold=args.merge_threshold,
+            **recognition_options,
+        )
+        checkpoint.remove()
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def __extract_regions(
+    args: argparse.Namespace,
+    video_file: str,
+    language: str,
+    subtitle_file: str,
+    regions: dict[str, str],
+) -> None:
+    """
+    Extracts the subtitles of several regions of a video, decoding it once, to a subtitle file each.
+
+    Args:
+        args (argparse.Namespace): The command-line arguments.
+        video_file (str): The path to the video file.
+        language (str): The language of the subtitles.
+        subtitle_file (str): The path to the output subtitle file the files of the regions are named after.
+        regions (dict[str, str]): The area of each region.
+
+    Returns:
+        None
+    """
+    frames = read_regions(
+        video_file,
+        {name: __parse_subtitle_area(area) for name, area in regions.items()},
+        args.frame_rate,
+        args.sampling,
+        decoder=args.decoder,
+        # the buffers of the frames waiting in the queue and in a batch of each region are not reused
+        pool_size=FRAME_BUFFER_SIZE + args.batch_size + 2,
+    )
+
+    cache_options = __cache_options(args)
+
+    extract_subtitle_regions(
+        frames,
+        language,
+        __subtitle_files(args, subtitle_file),
+        args.change_threshold,
+        args.binarization_threshold,
+        args.batch_size,
+        args.empty_threshold,
+        args.verify_empty,
+        cache_options,
+        args.merge_threshold,
+        args.ocr_profile,
+        args.localize_lines,
+    )
+
+
+def __extract_videos(
+    args: argparse.Namespace,
+    videos: list[tuple[str, str]],
+    executor: ProcessPoolExecutor | None = None,
+) -> None:
+    """
+    Extracts the subtitles from each video to the output directory and reports the videos that have failed.
+
+    A failed video does not stop the others. When resuming, the videos whose subtitles have been written
+    without a checkpoint left are skipped, and the videos without a checkpoint are started over.
+
+    Args:
+        args (argparse.Namespace): The command-line arguments.
+        videos (list[tuple[str, str]]): The paths to the videos and the languages of their subtitles.
+        executor (ProcessPoolExecutor | None, optional): The pool of the worker processes shared by the videos.
+                                                         Defaults to None.
+
+    Returns:
+        None
+    """
+    failures = []
+    for number, (video_file, language) in enumerate(videos, 1):
+        name = __video_name(video_file)
+        subtitle_file = os.path.join(args.output_directory, f"{name}.srt")
+        checkpoint_file = __checkpoint_file(subtitle_file)
+        print(f"[{number}/{len(videos)}] Extract the subtitles of {video_file}")
+
+        if (
+            args.resume
+            and os.path.isfile(subtitle_file)
+            and not os.path.isfile(checkpoint_file)
+        ):
+            print(f"File {subtitle_file} has already been extracted")
+            continue
+
+        resume = args.resume and os.path.isfile(checkpoint_file)
+        frames_file = None
+        if args.frames_file is not None:
+            frames_file = f"{args.frames_file}.{name}"
+
+        try:
+            # the checks of a video exit with their message
+            __check_video(args, video_file, language, subtitle_file, resume)
+        except SystemExit as error:
+            print(error)
+            failures.append((video_file, str(error)))
+            continue
+
+        try:
+            __extract_video(
+                args, video_file, language, subtitle_file, frames_file, resume, executor
+            )
+        # a failed video is reported and the next one is processed
+        except (Exception, SystemExit) as error:
+            message = str(error)
+            if not isinstance(error, SystemExit):
+                message = f"{type(error).__name__}: {error}"
+            print(message)
+            failures.append((video_file, message))
+
+            # without a checkpoint to resume from, the partial subtitles would look finished
+            if not os.path.isfile(checkpoint_file):
+                for output_file in __subtitle_files(args, subtitle_file).values():
+                    if os.path.isfile(output_file):
+                        os.remove(output_file)
+
+    print(
+        f"Subtitles have been extracted from {len(videos) - len(failures)} of {len(videos)} videos"
+    )
+    for video_file, message in failures:
+        print(f"{video_file}: {message}")
+
+    if failures:
+        sys.exit(f"Extracting the subtitles has failed for {len(failures)} videos")
 
 
 def main():
@@ -85,8 +862,46 @@ def main():
     language = get_writing_system(args.input_language)
     __check_arguments(args, language)
 
-    convert_to_images(args.input_video, FRAMES_DIR, y1_percent=int(args.subtitle_area))
-    extract_subtitle(FRAMES_DIR, args.input_language, args.output_subtitle)
+    if args.input_frames is not None:
+        __extract_frames(args)
+        return
+
+    videos = __find_videos(args)
+    if not videos:
+        sys.exit("No videos have been found")
+
+    if args.output_subtitle is not None and len(videos) > 1:
+        sys.exit("Output directory is required for several videos")
+
+    names = [__video_name(video_file) for video_file, _ in videos]
+    if args.output_directory is not None and len(set(names)) < len(names):
+        sys.exit(
+            "Videos should have different names to be written to the output directory"
+        )
+
+    # the workers load the OCR models once for all the videos
+    executor = create_executor(args.workers) if args.workers > 1 else None
+    try:
+        if args.output_directory is not None:
+            __extract_videos(args, videos, executor)
+            return
+
+        video_file, video_language = videos[0]
+        __check_video(
+            args, video_file, video_language, args.output_subtitle, args.resume
+        )
+        __extract_video(
+            args,
+            video_file,
+            video_language,
+            args.output_subtitle,
+            args.frames_file,
+            args.resume,
+            executor,
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,293 @@
+""" This module contains functions to measure the extraction of the subtitles from the synthetic videos. """
+
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+import collections.abc
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import srt
+from srt import Subtitle
+
+from extract_subtitles.tests.synthetic_video import (
+    TemplateOCR,
+    boundary_errors,
+    generate_video,
+    make_subtitles,
+)
+from extract_subtitles.utils.extractor import extract_subtitle
+from extract_subtitles.utils.frames import buffer_frames, load_frames
+from extract_subtitles.utils.recognizer import create_ocr
+from extract_subtitles.utils.video_converter import convert_to_frames, read_frames
+
+# The synthetic videos: the name, the width, the height, the frame rate and the duration in seconds
+BENCHMARK_CASES = (
+    ("360p25", 640, 360, 25, 60),
+    ("720p30", 1280, 720, 30, 60),
+    ("1080p25", 1920, 1080, 25, 60),
+    ("1080p60", 1920, 1080, 60, 30),
+)
+
+# The video the converter and the recognizer are benchmarked with, the synthetic 720p one if not set
+BENCHMARK_VIDEO = os.getenv("BENCHMARK_VIDEO")
+
+# The measurements that are better when higher, the rest are better when lower
+HIGHER_IS_BETTER = ("decode_fps", "frames_per_second", "ocr_calls_per_second")
+
+# The relative change of a measurement from the baseline considered to be a regression
+REGRESSION_TOLERANCE = 0.2
+
+
+class CountingOCR:
+    """
+    The OCR engine that counts the calls of the wrapped engine and the time spent in them.
+    """
+
+    def __init__(self, ocr) -> None:
+        """
+        Wraps the OCR engine.
+
+        Args:
+            ocr: The OCR engine, PaddleOCR or TemplateOCR.
+        """
+        self.wrapped = ocr
+        self.use_angle_cls = ocr.use_angle_cls
+        self.calls = 0
+        self.elapsed = 0.0
+
+    def ocr(self, image, det: bool = True, cls: bool = False) -> list:
+        """
+        Recognizes the lines on the image with the wrapped engine.
+
+        Args:
+            image (np.ndarray | list[np.ndarray]): The image, or the lines when not detecting them.
+            det (bool, optional): Whether to detect the lines on the image. Defaults to True.
+            cls (bool, optional): Whether to classify the angle of the lines. Defaults to False.
+
+        Returns:
+            list: The result of the wrapped engine.
+        """
+        started = time.perf_counter()
+        result = self.wrapped.ocr(image, det=det, cls=cls)
+        self.elapsed += time.perf_counter() - started
+        self.calls += 1
+
+        return result
+
+
+def prepare_video(
+    directory: str, name: str, width: int, height: int, fps: int, duration: int
+) -> tuple[str, list[Subtitle]]:
+    """
+    Generates the synthetic video unless it has been generated before.
+
+    Args:
+        directory (str): The directory to keep the videos in.
+        name (str): The name of the video.
+        width (int): The width of the frames.
+        height (int): The height of the frames.
+        fps (int): The frame rate.
+        duration (int): The duration in seconds.
+
+    Returns:
+        tuple[str, list[Subtitle]]: The path to the video and its subtitles.
+    """
+    frame_total = fps * duration
+    subs = make_subtitles(frame_total, fps)
+
+    video_file = os.path.join(directory, f"{name}.avi")
+    if not os.path.isfile(video_file):
+        generate_video(video_file, subs, frame_total, fps, width, height)
+
+    return video_file, subs
+
+
+def benchmark_video(directory: str) -> str:
+    """
+    Returns the video given by BENCHMARK_VIDEO, or generates the synthetic 720p one.
+
+    Args:
+        directory (str): The directory to generate the synthetic video in.
+
+    Returns:
+        str: The path to the video.
+    """
+    if BENCHMARK_VIDEO is not None:
+        return BENCHMARK_VIDEO
+
+    name, width, height, fps, duration = BENCHMARK_CASES[1]
+    video_file, _ = prepare_video(directory, name, width, height, fps, duration)
+
+    return video_file
+
+
+def peak_memory() -> float:
+    """
+    Returns the peak resident set size of the current process.
+
+    Returns:
+        float: The peak resident set size in megabytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # the size is in bytes on macOS and in kilobytes elsewhere
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def measure_conversion(video_file: str, frames_file: str, options: dict) -> dict:
+    """
+    Measures the conversion of the video to a frame store.
+
+    Args:
+        video_file (str): The path to the video file.
+        frames_file (str): The path to the frame store.
+        options (dict): The keyword arguments of `convert_to_frames`.
+
+    Returns:
+        dict: The number of the sampled frames, the number of them decoded per second
+              and the peak resident set size in megabytes.
+    """
+    started = time.perf_counter()
+    convert_to_frames(video_file, frames_file, **options)
+    elapsed = time.perf_counter() - started
+
+    frames = len(load_frames(frames_file)[0])
+    os.remove(frames_file)
+
+    return {
+        "frames": frames,
+        "decode_fps": frames / elapsed,
+        "peak_rss_mb": peak_memory(),
+    }
+
+
+def measure_extraction(
+    video_file: str,
+    subs: list[Subtitle],
+    height: int,
+    subtitle_file: str,
+    options: dict,
+    engine: str = "template",
+) -> dict:
+    """
+    Measures the extraction of the subtitles and compares them with the known ones.
+
+    Args:
+        video_file (str): The path to the video file.
+        subs (list[Subtitle]): The known subtitles of the video.
+        height (int): The height of the frames.
+        subtitle_file (str): The path to the output subtitle file.
+        options (dict): The keyword arguments of `read_frames` and `extract_subtitle`.
+        engine (str, optional): "template" to recognize the known subtitles offline,
+                                "paddle" to use PaddleOCR. Defaults to "template".
+
+    Returns:
+        dict: The number of the sampled frames, the number of them processed per second, the number of
+              the OCR calls and the number of them per second, the peak resident set size in megabytes,
+              and the errors of the extracted subtitles.
+    """
+    read_options = {
+        key: options[key]
+        for key in ("frame_rate", "y1_percent", "sampling", "decoder")
+        if key in options
+    }
+    recognition_options = {
+        key: value for key, value in options.items() if key not in read_options
+    }
+
+    if engine == "template":
+        ocr = CountingOCR(TemplateOCR([sub.content for sub in subs], height))
+    else:
+        ocr = CountingOCR(
+            create_ocr(
+                "en",
+                recognition_options.get("batch_size", 1),
+                recognition_options.get("profile", "balanced"),
+            )
+        )
+
+    frames = 0
+
+    def count(
+        frames_to_count: collections.abc.Iterable,
+    ) -> collections.abc.Generator:
+        nonlocal frames
+        for frame in frames_to_count:
+            frames += 1
+            yield frame
+
+    started = time.perf_counter()
+    with mock.patch("extract_subtitles.utils.extractor.get_ocr", return_value=ocr):
+        extract_subtitle(
+            buffer_frames(count(read_frames(video_file, **read_options))),
+            "en",
+            subtitle_file,
+            **recognition_options,
+        )
+    elapsed = time.perf_counter() - started
+
+    with open(subtitle_file, "r", encoding="utf-8") as fp:
+        actual = list(srt.parse(fp.read()))
+    os.remove(subtitle_file)
+
+    return {
+        "frames": frames,
+        "frames_per_second": frames / elapsed,
+        "ocr_calls": ocr.calls,
+        "ocr_calls_per_second": ocr.calls / ocr.elapsed if ocr.elapsed > 0 else 0.0,
+        "peak_rss_mb": peak_memory(),
+    } | boundary_errors(subs, actual)
+
+
+def run_isolated(function: collections.abc.Callable, *args) -> dict:
+    """
+    Runs the measurement in a new process, so its peak memory does not include the previous ones.
+
+    Args:
+        function (collections.abc.Callable): The measurement.
+        *args: The arguments of the measurement.
+
+    Returns:
+        dict: The result of the measurement.
+    """
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        return executor.submit(function, *args).result()
+
+
+def compare_results(
+    results: dict, baseline: dict, tolerance: float = REGRESSION_TOLERANCE
+) -> list[str]:
+    """
+    Finds the measurements that have become worse than the baseline by more than the tolerance.
+
+    Args:
+        results (dict): The measurements of each video and stage.
+        baseline (dict): The measurements of the baseline in the same format.
+        tolerance (float, optional): The relative change considered to be a regression. Defaults to 0.2.
+
+    Returns:
+        list[str]: The descriptions of the regressions.
+    """
+    regressions = []
+    for name, stages in results.items():
+        for stage, measurements in stages.items():
+            expected = baseline.get(name, {}).get(stage, {})
+            for key, value in measurements.items():
+                if key not in expected:
+                    continue
+
+                if key in HIGHER_IS_BETTER:
+                    regressed = value < expected[key] * (1 - tolerance)
+                else:
+                    regressed = value > expected[key] * (1 + tolerance)
+
+                if regressed:
+                    regressions.append(
+                        f"{name} {stage} {key}: {value:.3f} (baseline {expected[key]:.3f})"
+                    )
+
+    return regressions
@@ -0,0 +1,96 @@
+""" Benchmark the extraction of the subtitles from the synthetic videos. """
+
+import json
+import os
+import tempfile
+import unittest
+
+from extract_subtitles.tests.benchmark.harness import (
+    BENCHMARK_CASES,
+    compare_results,
+    measure_conversion,
+    measure_extraction,
+    prepare_video,
+    run_isolated,
+)
+from extract_subtitles.tests.synthetic_video import SUBTITLE_AREA
+
+# The directory to keep the generated videos in between the runs, a temporary one if not set
+BENCHMARK_DIRECTORY = os.getenv("BENCHMARK_DIRECTORY")
+
+# "template" to recognize the known subtitles offline, "paddle" to measure PaddleOCR
+BENCHMARK_OCR = os.getenv("BENCHMARK_OCR", "template")
+
+# The file to write the measurements to, and the file of the measurements to compare them with
+BENCHMARK_RESULTS = os.getenv("BENCHMARK_RESULTS")
+BENCHMARK_BASELINE = os.getenv("BENCHMARK_BASELINE")
+
+# Whether to recognize the lines located without the text detector
+BENCHMARK_LOCALIZE = os.getenv("BENCHMARK_LOCALIZE") == "1"
+
+# The options of the extraction
+BENCHMARK_OPTIONS = {"frame_rate": 10, "y1_percent": SUBTITLE_AREA}
+if BENCHMARK_LOCALIZE:
+    BENCHMARK_OPTIONS["localize"] = True
+
+
+@unittest.skipUnless(
+    os.getenv("TEST_TYPE") == "benchmark", "Skipping non-benchmark tests"
+)
+class TestExtraction(unittest.TestCase):
+    """
+    Benchmark suite for the extraction of the subtitles.
+    """
+
+    def test_synthetic_videos(self) -> None:
+        """
+        Measure the decoding and the extraction of each synthetic video, and compare them with the baseline.
+        """
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            directory = BENCHMARK_DIRECTORY or temporary_directory
+            os.makedirs(directory, exist_ok=True)
+
+            results = {}
+            for name, width, height, fps, duration in BENCHMARK_CASES:
+                video_file, subs = prepare_video(
+                    directory, name, width, height, fps, duration
+                )
+
+                conversion = run_isolated(
+                    measure_conversion,
+                    video_file,
+                    os.path.join(temporary_directory, f"{name}.frames"),
+                    BENCHMARK_OPTIONS,
+                )
+                extraction = run_isolated(
+                    measure_extraction,
+                    video_file,
+                    subs,
+                    height,
+                    os.path.join(temporary_directory, f"{name}.srt"),
+                    BENCHMARK_OPTIONS,
+                    BENCHMARK_OCR,
+                )
+                results[name] = {"conversion": conversion, "extraction": extraction}
+
+                print(
+                    f"{name}: decoded {conversion['decode_fps']:.1f} frames per second "
+                    f"({conversion['peak_rss_mb']:.0f} MB), extracted {extraction['frames_per_second']:.1f} "
+                    f"frames per second with {extraction['ocr_calls']} OCR calls "
+                    f"({extraction['ocr_calls_per_second']:.1f} per second, {extraction['peak_rss_mb']:.0f} MB), "
+                    f"{extraction['missing']} of {extraction['subtitles']} subtitles missed, "
+                    f"{extraction['extra']} extra, boundary error {extraction['mean_error']:.3f} s "
+                    f"(max {extraction['max_error']:.3f} s)"
+                )
+                if BENCHMARK_OCR == "template":
+                    self.assertEqual(0, extraction["missing"], name)
+
+        if BENCHMARK_RESULTS is not None:
+            with open(BENCHMARK_RESULTS, "w", encoding="utf-8") as fp:
+                json.dump(results, fp, indent=2)
+
+        if BENCHMARK_BASELINE is not None:
+            with open(BENCHMARK_BASELINE, "r", encoding="utf-8") as fp:
+                baseline = json.load(fp)
+
+            self.assertEqual([], compare_results(results, baseline))
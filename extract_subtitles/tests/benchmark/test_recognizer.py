@@ -0,0 +1,105 @@
+""" Benchmark the recognizer module. """
+
+import os
+import tempfile
+import time
+import unittest
+
+from extract_subtitles.tests.benchmark.harness import benchmark_video
+from extract_subtitles.utils.merger import text_similarity
+from extract_subtitles.utils.recognizer import (
+    OCR_PROFILES,
+    create_ocr,
+    recognize_batch,
+)
+from extract_subtitles.utils.video_converter import read_frames
+
+# The number of frames of the video to be recognized with each batch size
+BENCHMARK_FRAMES = 64
+
+
+@unittest.skipUnless(
+    os.getenv("TEST_TYPE") == "benchmark", "Skipping non-benchmark tests"
+)
+class TestRecognizer(unittest.TestCase):
+    """
+    Benchmark suite for the recognizer module.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Set up the benchmark by preparing the video.
+        """
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.video_file = benchmark_video(cls.directory.name)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Remove the generated video.
+        """
+        cls.directory.cleanup()
+
+    def __read_images(self) -> list:
+        """
+        Read the first frames of the video.
+
+        Returns:
+            list: The cropped images.
+        """
+        images = []
+        for _, image in read_frames(self.video_file):
+            images.append(image)
+            if len(images) == BENCHMARK_FRAMES:
+                break
+
+        return images
+
+    def test_batch_sizes(self) -> None:
+        """
+        Measure the number of recognized frames per second for each batch size.
+        """
+        images = self.__read_images()
+
+        for batch_size in (1, 2, 4, 8, 16):
+            ocr = create_ocr("en", batch_size)
+
+            started = time.perf_counter()
+            for index in range(0, len(images), batch_size):
+                recognize_batch(ocr, images[index : index + batch_size])
+            elapsed = time.perf_counter() - started
+
+            print(
+                f"batch size {batch_size}: {len(images)} frames in {elapsed:.2f} s "
+                f"({len(images) / elapsed:.1f} frames per second)"
+            )
+
+    def test_profiles(self) -> None:
+        """
+        Measure the number of recognized frames per second for each profile and the similarity of its text
+        to the text recognized with the accurate profile.
+        """
+        images = self.__read_images()
+
+        results = {}
+        for profile in reversed(OCR_PROFILES):
+            ocr = create_ocr("en", profile=profile)
+
+            started = time.perf_counter()
+            results[profile] = [
+                text
+                for image in images
+                for text, _ in recognize_batch(ocr, [image], profile=profile)
+            ]
+            elapsed = time.perf_counter() - started
+
+            similarity = sum(
+                text_similarity(text, reference)
+                for text, reference in zip(results[profile], results["accurate"])
+            ) / len(images)
+
+            print(
+                f"{profile}: {len(images)} frames in {elapsed:.2f} s "
+                f"({len(images) / elapsed:.1f} frames per second, {similarity:.2%} similar to accurate)"
+            )
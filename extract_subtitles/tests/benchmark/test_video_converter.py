@@ -0,0 +1,77 @@
+""" Benchmark the video converter module. """
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from extract_subtitles.tests.benchmark.harness import benchmark_video
+from extract_subtitles.utils.video_converter import (
+    DECODERS,
+    FFMPEG_BINARY,
+    SAMPLING_MODES,
+    read_frames,
+)
+
+
+@unittest.skipUnless(
+    os.getenv("TEST_TYPE") == "benchmark", "Skipping non-benchmark tests"
+)
+class TestVideoConverter(unittest.TestCase):
+    """
+    Benchmark suite for the video converter module.
+    """
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """
+        Set up the benchmark by preparing the video.
+        """
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.video_file = benchmark_video(cls.directory.name)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """
+        Remove the generated video.
+        """
+        cls.directory.cleanup()
+
+    def test_sampling_modes(self) -> None:
+        """
+        Measure the number of sampled frames per second for each sampling mode and frame rate.
+        """
+        for frame_rate in (10, 1):
+            for sampling in SAMPLING_MODES:
+                started = time.perf_counter()
+                frames = sum(
+                    1
+                    for _ in read_frames(self.video_file, frame_rate, sampling=sampling)
+                )
+                elapsed = time.perf_counter() - started
+
+                print(
+                    f"{sampling} at {frame_rate} fps: {frames} frames in {elapsed:.2f} s "
+                    f"({frames / elapsed:.1f} frames per second)"
+                )
+                self.assertGreater(frames, 0)
+
+    @unittest.skipIf(shutil.which(FFMPEG_BINARY) is None, "Skipping missing ffmpeg")
+    def test_decoders(self) -> None:
+        """
+        Measure the number of sampled frames per second and the CPU time of each decoder.
+        """
+        for decoder in DECODERS:
+            started = time.perf_counter()
+            # the CPU time of ffmpeg is spent in a child process
+            cpu_started = sum(os.times()[:4])
+            frames = sum(1 for _ in read_frames(self.video_file, decoder=decoder))
+            cpu = sum(os.times()[:4]) - cpu_started
+            elapsed = time.perf_counter() - started
+
+            print(
+                f"{decoder}: {frames} frames in {elapsed:.2f} s "
+                f"({frames / elapsed:.1f} frames per second, {cpu:.2f} s of CPU time)"
+            )
+            self.assertGreater(frames, 0)
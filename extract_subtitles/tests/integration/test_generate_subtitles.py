@@ -0,0 +1,147 @@
+""" Integration tests for the extract subtitles module. """
+
+from unittest import mock
+import os
+import tempfile
+import unittest
+import srt
+
+from extract_subtitles.extract_subtitles import main
+from extract_subtitles.tests.synthetic_video import (
+    TemplateOCR,
+    boundary_errors,
+    generate_video,
+    make_subtitles,
+)
+
+
+@unittest.skipUnless(
+    os.getenv("TEST_TYPE") == "integration", "Skipping non-integration tests"
+)
+class TestGenerateSubtitles(unittest.TestCase):
+    """
+    Integration test suite for the extract subtitles module.
+    """
+
+    fps = 25
+    frame_rate = 10
+    frame_total = 500
+
+    def setUp(self) -> None:
+        """
+        Generate a synthetic video with known subtitles.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.video_file = os.path.join(self.directory.name, "video.avi")
+        self.output_subtitle = os.path.join(self.directory.name, "video.srt")
+
+        self.subs = make_subtitles(self.frame_total, self.fps)
+        generate_video(self.video_file, self.subs, self.frame_total, self.fps, 640, 360)
+
+    def tearDown(self) -> None:
+        """
+        Remove the video and the subtitles.
+        """
+        self.directory.cleanup()
+
+    def test_extract_subtitles(self) -> None:
+        """
+        Test the extract_subtitles script finds the area of the subtitles and their exact timing.
+        """
+        ocr = TemplateOCR([sub.content for sub in self.subs], 360)
+
+        with (
+            mock.patch("extract_subtitles.utils.extractor.get_ocr", return_value=ocr),
+            mock.patch(
+                "sys.argv",
+                [
+                    "extract_subtitles",
+                    "--input-video",
+                    self.video_file,
+                    "--output-subtitle",
+                    self.output_subtitle,
+                    "--input-language",
+                    "en",
+                    "--subtitle-area",
+                    "auto",
+                    "--frame-rate",
+                    str(self.frame_rate),
+                ],
+            ),
+        ):
+            main()
+
+        with open(self.output_subtitle, "r", encoding="utf-8") as fp:
+            actual = list(srt.parse(fp.read()))
+
+        errors = boundary_errors(self.subs, actual)
+        self.assertEqual(0, errors["missing"])
+        self.assertEqual(0, errors["extra"])
+        # a subtitle starts and ends on the first sampled frame showing the change
+        self.assertLessEqual(errors["max_error"], 1 / self.frame_rate + 1 / self.fps)
+        self.assertGreater(ocr.calls, 0)
+
+    def test_extract_subtitles_frames_file(self) -> None:
+        """
+        Test the extract_subtitles script extracts the same subtitles from the frame store saved before
+        without reading the video again.
+        """
+        ocr = TemplateOCR([sub.content for sub in self.subs], 360)
+        frames_file = os.path.join(self.directory.name, "video.frames")
+        frames_subtitle = os.path.join(self.directory.name, "frames.srt")
+
+        with (
+            mock.patch("extract_subtitles.utils.extractor.get_ocr", return_value=ocr),
+            mock.patch(
+                "sys.argv",
+                [
+                    "extract_subtitles",
+                    "--input-video",
+                    self.video_file,
+                    "--output-subtitle",
+                    self.output_subtitle,
+                    "--input-language",
+                    "en",
+                    "--subtitle-area",
+                    "80",
+                    "--frame-rate",
+                    str(self.frame_rate),
+                    "--frames-file",
+                    frames_file,
+                ],
+            ),
+        ):
+            main()
+
+        with (
+            mock.patch("extract_subtitles.utils.extractor.get_ocr", return_value=ocr),
+            mock.patch(
+                "extract_subtitles.extract_subtitles.read_frames",
+                side_effect=AssertionError("The video has been read again"),
+            ),
+            mock.patch(
+                "sys.argv",
+                [
+                    "extract_subtitles",
+                    "--input-frames",
+                    frames_file,
+                    "--output-subtitle",
+                    frames_subtitle,
+                    "--input-language",
+                    "en",
+                ],
+            ),
+        ):
+            main()
+
+        with open(self.output_subtitle, "r", encoding="utf-8") as fp:
+            expected = list(srt.parse(fp.read()))
+        with open(frames_subtitle, "r", encoding="utf-8") as fp:
+            actual = list(srt.parse(fp.read()))
+
+        self.assertGreater(len(expected), 0)
+        self.assertListEqual(expected, actual)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,352 @@
+""" This module contains functions to generate synthetic videos with known subtitles and to read them back. """
+
+from datetime import timedelta
+import random
+import cv2
+import numpy as np
+from srt import Subtitle
+
+# The words the text of the subtitles is made of
+WORDS = (
+    "anchor breeze candle dinner engine forest garden harbor island jacket kettle "
+    "ladder meadow needle orange pepper quarry rabbit saddle tunnel velvet window"
+).split()
+
+# The font of the subtitles
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+# The height of the frames the font scale of 1 is used for
+FONT_HEIGHT = 480
+
+# The top of the subtitle area in percentage of the frame height, the subtitles are drawn below it
+SUBTITLE_AREA = 80
+
+# The number of blank rows that separate two lines of text on a crop
+LINE_GAP = 6
+
+# The fraction of the template pixels a line has to overlap to be recognized as its text
+MATCH_THRESHOLD = 0.6
+
+
+def make_subtitles(frame_total: int, fps: float, seed: int = 0) -> list[Subtitle]:
+    """
+    Makes the subtitles of a video with random text and the exact frames they appear and disappear on.
+
+    Most subtitles are followed by a pause, the rest are replaced by the next one at once.
+
+    Args:
+        frame_total (int): The number of frames in the video.
+        fps (float): The frame rate of the video.
+        seed (int, optional): The seed of the random text and timing. Defaults to 0.
+
+    Returns:
+        list[Subtitle]: The subtitles starting and ending on the timestamps of their first frame
+                        and the frame after the last one.
+    """
+    rng = random.Random(seed)
+
+    subs = []
+    frame = round(fps * rng.uniform(0.5, 1.5))
+    while True:
+        end = frame + round(fps * rng.uniform(1, 3))
+        if end >= frame_total:
+            break
+
+        content = " ".join(rng.sample(WORDS, 3))
+        subs.append(
+            Subtitle(
+                index=len(subs) + 1,
+                start=timedelta(seconds=frame / fps),
+                end=timedelta(seconds=end / fps),
+                content=content,
+            )
+        )
+
+        frame = end
+        if rng.random() < 0.7:
+            frame += round(fps * rng.uniform(0.3, 1.5))
+
+    return subs
+
+
+def draw_subtitle(image: np.ndarray, content: str) -> None:
+    """
+    Draws the subtitle centered at the bottom of the frame, white with a black outline.
+
+    Args:
+        image (np.ndarray): The frame to draw on.
+        content (str): The text of the subtitle.
+
+    Returns:
+        None
+    """
+    height, width = image.shape[:2]
+    scale = height / FONT_HEIGHT
+    thickness = max(round(2 * scale), 1)
+
+    (text_width, _), _ = cv2.getTextSize(content, FONT, scale, thickness)
+    origin = ((width - text_width) // 2, round(height * 0.93))
+
+    cv2.putText(image, content, origin, FONT, scale, (0, 0, 0), thickness * 3)
+    cv2.putText(image, content, origin, FONT, scale, (255, 255, 255), thickness)
+
+
+def generate_video(
+    video_file: str,
+    subs: list[Subtitle],
+    frame_total: int,
+    fps: float,
+    width: int = 1280,
+    height: int = 720,
+) -> None:
+    """
+    Writes a video with the subtitles drawn over a moving background.
+
+    The background is dim in the subtitle area, so only the text is bright enough to be recognized.
+
+    Args:
+        video_file (str): The path to the video file, an AVI file encoded with Motion JPEG.
+        subs (list[Subtitle]): The subtitles to be drawn.
+        frame_total (int): The number of frames in the video.
+        fps (float): The frame rate of the video.
+        width (int, optional): The width of the frames. Defaults to 1280.
+        height (int, optional): The height of the frames. Defaults to 720.
+
+    Returns:
+        None
+    """
+    x = np.linspace(0, 4 * np.pi, width)
+    y = np.linspace(0, 2 * np.pi, height)[:, np.newaxis]
+    pattern = (np.sin(x) + np.cos(y) + 2) / 4
+    # the picture above the subtitle area is brighter than the one behind the subtitles
+    rows = np.arange(height)[:, np.newaxis]
+    brightness = np.where(rows < height * SUBTITLE_AREA / 100, 200, 80)
+    background = (pattern * brightness).astype(np.uint8)
+
+    writer = cv2.VideoWriter(
+        video_file, cv2.VideoWriter_fourcc(*"MJPG"), fps, (width, height)
+    )
+    try:
+        sub_index = 0
+        for frame in range(frame_total):
+            shift = frame * 4 % width
+            image = cv2.cvtColor(np.roll(background, shift, axis=1), cv2.COLOR_GRAY2BGR)
+
+            timestamp = timedelta(seconds=frame / fps)
+            while sub_index < len(subs) and subs[sub_index].end <= timestamp:
+                sub_index += 1
+            if sub_index < len(subs) and subs[sub_index].start <= timestamp:
+                draw_subtitle(image, subs[sub_index].content)
+
+            writer.write(image)
+    finally:
+        writer.release()
+
+
+class TemplateOCR:
+    """
+    The OCR engine that recognizes the known subtitles by comparing the lines with the rendered text.
+
+    It takes the same images and returns the same result as `PaddleOCR.ocr`, so the extraction can be
+    measured and checked offline, without the models and their variance.
+    """
+
+    def __init__(self, contents: list[str], height: int = FONT_HEIGHT) -> None:
+        """
+        Renders the text of each subtitle.
+
+        Args:
+            contents (list[str]): The texts of the subtitles.
+            height (int, optional): The height of the frames the subtitles are drawn on. Defaults to 480.
+        """
+        self.use_angle_cls = False
+        self.calls = 0
+        self.templates = []
+
+        for content in dict.fromkeys(contents):
+            scale = height / FONT_HEIGHT
+            thickness = max(round(2 * scale), 1)
+            (text_width, text_height), baseline = cv2.getTextSize(
+                content, FONT, scale, thickness
+            )
+
+            image = np.zeros(
+                (text_height + baseline + 4 * thickness, text_width + 4 * thickness),
+                dtype=np.uint8,
+            )
+            cv2.putText(
+                image,
+                content,
+                (2 * thickness, text_height + 2 * thickness),
+                FONT,
+                scale,
+                255,
+                thickness,
+            )
+            self.templates.append((content, self.__crop(image > 160)))
+
+    @staticmethod
+    def __text_mask(image: np.ndarray) -> np.ndarray:
+        """
+        Returns the pixels of the white text on the image.
+
+        Args:
+            image (np.ndarray): The image, in color or grayscale.
+
+        Returns:
+            np.ndarray: The boolean mask of the text pixels.
+        """
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+        return image > 160
+
+    @staticmethod
+    def __bounds(indices: np.ndarray, gap: int) -> list[tuple[int, int]]:
+        """
+        Groups the indices separated by less than `gap` missing ones.
+
+        Args:
+            indices (np.ndarray): The sorted indices.
+            gap (int): The number of missing indices that separates two groups.
+
+        Returns:
+            list[tuple[int, int]]: The first index and the index after the last one of each group.
+        """
+        if len(indices) == 0:
+            return []
+
+        parts = np.split(indices, np.flatnonzero(np.diff(indices) > gap) + 1)
+
+        return [(int(part[0]), int(part[-1]) + 1) for part in parts]
+
+    @staticmethod
+    def __crop(mask: np.ndarray) -> np.ndarray:
+        """
+        Crops the mask to the bounding box of its pixels.
+
+        Args:
+            mask (np.ndarray): The boolean mask.
+
+        Returns:
+            np.ndarray: The mask cropped to its pixels.
+        """
+        rows = np.flatnonzero(mask.any(axis=1))
+        columns = np.flatnonzero(mask.any(axis=0))
+
+        return mask[rows[0] : rows[-1] + 1, columns[0] : columns[-1] + 1]
+
+    def match(self, mask: np.ndarray) -> tuple[str, float]:
+        """
+        Finds the subtitle whose rendered text is the most similar to the line.
+
+        Args:
+            mask (np.ndarray): The pixels of the line cropped to their bounding box.
+
+        Returns:
+            tuple[str, float]: The text of the subtitle and the fraction of the pixels the two masks share,
+                               or an empty string if no subtitle is similar enough.
+        """
+        best = ("", 0.0)
+        for content, template in self.templates:
+            ratio = (mask.shape[1] / mask.shape[0]) / (
+                template.shape[1] / template.shape[0]
+            )
+            if not 0.8 < ratio < 1.25:
+                continue
+
+            resized = cv2.resize(
+                mask.astype(np.uint8),
+                (template.shape[1], template.shape[0]),
+                interpolation=cv2.INTER_NEAREST,
+            ).astype(bool)
+            overlap = np.count_nonzero(resized & template) / np.count_nonzero(
+                resized | template
+            )
+            if overlap > best[1]:
+                best = (content, overlap)
+
+        return best if best[1] >= MATCH_THRESHOLD else ("", 0.0)
+
+    def ocr(
+        self, image: np.ndarray | list[np.ndarray], det: bool = True, cls: bool = False
+    ) -> list:
+        """
+        Recognizes the lines of the known subtitles on the image.
+
+        Args:
+            image (np.ndarray | list[np.ndarray]): The image, or the images of the lines when not detecting them.
+            det (bool, optional): Whether to detect the lines on the image. Defaults to True.
+            cls (bool, optional): Ignored, the lines are never rotated. Defaults to False.
+
+        Returns:
+            list: The box, the text and the confidence of each line, or the text and the confidence
+                  of each image of a line when not detecting them, in the format of `PaddleOCR.ocr`.
+        """
+        self.calls += 1
+        if not det:
+            lines = []
+            for line in image:
+                mask = self.__text_mask(line)
+                lines.append(self.match(self.__crop(mask)) if mask.any() else ("", 0.0))
+
+            return [lines]
+
+        mask = self.__text_mask(image)
+
+        lines = []
+        for top, bottom in self.__bounds(np.flatnonzero(mask.any(axis=1)), LINE_GAP):
+            band = mask[top:bottom]
+            columns = np.flatnonzero(band.any(axis=0))
+            left, right = int(columns[0]), int(columns[-1]) + 1
+
+            content, confidence = self.match(self.__crop(band[:, left:right]))
+            if content != "":
+                box = [[left, top], [right, top], [right, bottom], [left, bottom]]
+                lines.append([box, (content, confidence)])
+
+        return [lines or None]
+
+
+def boundary_errors(expected: list[Subtitle], actual: list[Subtitle]) -> dict:
+    """
+    Compares the extracted subtitles with the known ones.
+
+    Each known subtitle is matched with the extracted subtitle of the same text that overlaps it the most.
+
+    Args:
+        expected (list[Subtitle]): The known subtitles.
+        actual (list[Subtitle]): The extracted subtitles.
+
+    Returns:
+        dict: The number of the known, missing and extra subtitles, and the mean and maximum difference
+              between the start and end timestamps of the matched subtitles in seconds.
+    """
+    errors = []
+    matched = set()
+    for sub in expected:
+        best = None
+        best_overlap = timedelta(0)
+        for index, candidate in enumerate(actual):
+            overlap = min(sub.end, candidate.end) - max(sub.start, candidate.start)
+            if (
+                index not in matched
+                and candidate.content == sub.content
+                and overlap > best_overlap
+            ):
+                best, best_overlap = index, overlap
+
+        if best is None:
+            continue
+
+        matched.add(best)
+        errors.append(abs(actual[best].start - sub.start).total_seconds())
+        errors.append(abs(actual[best].end - sub.end).total_seconds())
+
+    return {
+        "subtitles": len(expected),
+        "missing": len(expected) - len(matched),
+        "extra": len(actual) - len(matched),
+        "mean_error": float(np.mean(errors)) if errors else 0.0,
+        "max_error": max(errors, default=0.0),
+    }
@@ -0,0 +1,87 @@
+""" Test the adaptive module. """
+
+from unittest import mock
+
+import os
+import datetime
+import tempfile
+import unittest
+import cv2
+import numpy as np
+
+from extract_subtitles.utils.adaptive import recognize_adaptive
+from extract_subtitles.utils.extractor import collect_subtitles
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestAdaptive(unittest.TestCase):
+    """
+    Unit test suite for the adaptive module.
+    """
+
+    def setUp(self) -> None:
+        """
+        Write a video with a bright subtitle area between the frames 37 and 61.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.video_file = os.path.join(self.directory.name, "video.avi")
+
+        writer = cv2.VideoWriter(
+            self.video_file, cv2.VideoWriter_fourcc(*"MJPG"), 25, (64, 48)
+        )
+        for index in range(100):
+            frame = np.zeros((48, 64, 3), dtype=np.uint8)
+            if 37 <= index < 61:
+                frame[40:46, 8:56:2] = 255
+            writer.write(frame)
+        writer.release()
+
+        self.ocr = mock.Mock()
+        self.ocr.ocr.side_effect = lambda image, cls: (
+            [[[[[0, 0]], ("Hello", 0.9)]]] if image.max() > 128 else [None]
+        )
+
+    def tearDown(self) -> None:
+        """
+        Remove the video.
+        """
+        self.directory.cleanup()
+
+    def test_recognize_adaptive(self) -> None:
+        """
+        Test the recognize_adaptive function finds the exact frames where the subtitle starts and ends.
+        """
+        readings = recognize_adaptive(self.video_file, self.ocr, 1, empty_threshold=0)
+        actual = list(collect_subtitles(readings))
+
+        self.assertEqual(1, len(actual))
+        self.assertEqual("Hello", actual[0].content)
+        self.assertEqual(datetime.timedelta(seconds=1.48), actual[0].start)
+        self.assertEqual(datetime.timedelta(seconds=2.44), actual[0].end)
+        self.assertLess(self.ocr.ocr.call_count, 10)
+
+    def test_recognize_adaptive_grabs_samples(self) -> None:
+        """
+        Test the recognize_adaptive function seeks only to the frames searched between the samples.
+        """
+        captures = []
+        video_capture = cv2.VideoCapture
+
+        def capture(video_file: str) -> mock.Mock:
+            cap = mock.Mock(wraps=video_capture(video_file))
+            captures.append(cap)
+            return cap
+
+        with mock.patch(
+            "extract_subtitles.utils.adaptive.cv2.VideoCapture", side_effect=capture
+        ):
+            list(recognize_adaptive(self.video_file, self.ocr, 1, empty_threshold=0))
+
+        seeks = [
+            call
+            for call in captures[0].set.call_args_list
+            if call.args[0] == cv2.CAP_PROP_POS_FRAMES
+        ]
+        # four samples at the frames 0, 25, 50 and 75 are read after grabbing
+        self.assertEqual(captures[0].read.call_count - 4, len(seeks))
+        self.assertGreater(captures[0].grab.call_count, 0)
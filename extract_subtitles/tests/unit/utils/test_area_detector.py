@@ -0,0 +1,87 @@
+""" Test the area detector module. """
+
+import os
+import tempfile
+import unittest
+import cv2
+import numpy as np
+
+from extract_subtitles.utils.area_detector import (
+    DEFAULT_AREA,
+    detect_subtitle_area,
+    find_subtitle_area,
+)
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestAreaDetector(unittest.TestCase):
+    """
+    Unit test suite for the area detector module.
+    """
+
+    def test_find_subtitle_area(self) -> None:
+        """
+        Test that the band of the subtitles is found and the static logo is ignored.
+        """
+        heatmap = np.zeros((100, 200))
+        heatmap[80:90, 50:150] = 0.3  # subtitles shown on some of the frames
+        heatmap[5:15, 170:190] = 1.0  # logo shown on every frame
+
+        self.assertEqual((23, 77, 78, 92), find_subtitle_area(heatmap))
+
+    def test_find_subtitle_area_two_lines(self) -> None:
+        """
+        Test that the lines of the subtitles close to each other are one area.
+        """
+        heatmap = np.zeros((100, 200))
+        heatmap[70:78, 60:140] = 0.2
+        heatmap[80:88, 40:160] = 0.3
+
+        self.assertEqual((18, 82, 68, 90), find_subtitle_area(heatmap))
+
+    def test_find_subtitle_area_empty(self) -> None:
+        """
+        Test that no area is found without text.
+        """
+        self.assertIsNone(find_subtitle_area(np.zeros((100, 200))))
+
+    def test_detect_subtitle_area(self) -> None:
+        """
+        Test that the area of the text is detected on a video and the default one is used without text.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            video_file = os.path.join(directory, "video.avi")
+            empty_file = os.path.join(directory, "empty.avi")
+
+            writer = cv2.VideoWriter(
+                video_file, cv2.VideoWriter_fourcc(*"MJPG"), 25, (320, 240)
+            )
+            empty_writer = cv2.VideoWriter(
+                empty_file, cv2.VideoWriter_fourcc(*"MJPG"), 25, (320, 240)
+            )
+            for index in range(50):
+                image = np.zeros((240, 320, 3), dtype=np.uint8)
+                empty_writer.write(image)
+                if index % 2 == 0:
+                    cv2.putText(
+                        image,
+                        f"Subtitle {index}",
+                        (100, 210),
+                        cv2.FONT_HERSHEY_SIMPLEX,
+                        0.6,
+                        (255, 255, 255),
+                        2,
+                    )
+                writer.write(image)
+            writer.release()
+            empty_writer.release()
+
+            x1, x2, y1, y2 = detect_subtitle_area(video_file, samples=20)
+            self.assertTrue(x1 <= 31 and x2 >= 50 and x2 <= 70)
+            self.assertTrue(y1 <= 83 and y1 >= 75 and y2 >= 88)
+
+            self.assertEqual(DEFAULT_AREA, detect_subtitle_area(empty_file, samples=20))
+
+
+if __name__ == "__main__":
+    unittest.main()
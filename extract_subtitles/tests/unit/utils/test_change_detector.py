@@ -0,0 +1,51 @@
+""" Test the change detector module. """
+
+import os
+import unittest
+import numpy as np
+
+from extract_subtitles.utils.change_detector import (
+    compute_signature,
+    signature_difference,
+)
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestChangeDetector(unittest.TestCase):
+    """
+    Unit test suite for the change detector module.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up the test case by initializing the necessary variables.
+        """
+        self.blank = np.full((54, 512, 3), 40, dtype=np.uint8)
+        self.text = self.blank.copy()
+        self.text[20:34, 100:400] = 255
+
+    def test_compute_signature(self) -> None:
+        """
+        Test the compute_signature function downscales and binarizes the crop.
+        """
+        signature = compute_signature(self.text, width=256)
+
+        self.assertEqual((27, 256), signature.shape)
+        self.assertEqual(bool, signature.dtype)
+        self.assertTrue(signature[13, 100])
+        self.assertFalse(signature[0, 0])
+
+    def test_signature_difference(self) -> None:
+        """
+        Test the signature_difference function.
+        """
+        text = compute_signature(self.text)
+        blank = compute_signature(self.blank)
+        noisy = self.text.copy()
+        noisy[noisy < 255] += 10
+        noisy = compute_signature(noisy)
+
+        self.assertEqual(0.0, signature_difference(text, text))
+        self.assertEqual(0.0, signature_difference(text, noisy))
+        self.assertGreater(signature_difference(text, blank), 0.1)
+        self.assertEqual(1.0, signature_difference(text, text[:10]))
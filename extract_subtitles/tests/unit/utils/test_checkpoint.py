@@ -0,0 +1,226 @@
+""" Test the checkpoint module. """
+
+import collections.abc
+import itertools
+import os
+import datetime
+import tempfile
+import unittest
+
+from extract_subtitles.utils.checkpoint import Checkpoint
+from extract_subtitles.utils.extractor import collect_subtitles, write_subtitles
+from extract_subtitles.utils.merger import merge_readings
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestCheckpoint(unittest.TestCase):
+    """
+    Unit test suite for the checkpoint module.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up the test case by initializing the necessary variables.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint_file = os.path.join(
+            self.directory.name, "output.srt.checkpoint"
+        )
+        self.subtitle_file = os.path.join(self.directory.name, "output.srt")
+        self.options = {"input_video": "input.mp4", "frame_rate": 10}
+        self.readings = [
+            (datetime.timedelta(seconds=0), "", 0.0),
+            (datetime.timedelta(seconds=1), "Hello", 0.9),
+            (datetime.timedelta(seconds=2), "Hello", 0.9),
+            (datetime.timedelta(seconds=3), "World", 0.9),
+            (datetime.timedelta(seconds=4), "World", 0.9),
+            (datetime.timedelta(seconds=5), "World", 0.9),
+            (datetime.timedelta(seconds=6), "", 0.0),
+            (datetime.timedelta(seconds=7), "Bye", 0.9),
+        ]
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def __create_checkpoint(self, interval: float = 0) -> Checkpoint:
+        """
+        Create a checkpoint of the subtitle file.
+
+        Args:
+            interval (float, optional): The number of seconds between the checkpoints. Defaults to 0.
+
+        Returns:
+            Checkpoint: The checkpoint.
+        """
+        return Checkpoint(
+            self.checkpoint_file, self.subtitle_file, self.options, interval
+        )
+
+    def __extract(
+        self, checkpoint: Checkpoint, readings: list, tracked: int = None
+    ) -> None:
+        """
+        Write the subtitles collected from the merged readings through the checkpoint.
+
+        Args:
+            checkpoint (Checkpoint): The checkpoint.
+            readings (list): The timestamps and texts of the frames.
+            tracked (int, optional): The number of the tracked readings to crash after,
+                                     None not to crash. Defaults to None.
+        """
+        readings = checkpoint.track(merge_readings(checkpoint.replay(readings)))
+        if tracked is not None:
+            readings = self.__crash(itertools.islice(readings, tracked))
+
+        subs = checkpoint.record(collect_subtitles(readings))
+        write_subtitles(subs, self.subtitle_file, checkpoint.count + 1)
+
+    def __read(self) -> str:
+        """
+        Read the subtitle file.
+
+        Returns:
+            str: The content of the subtitle file.
+        """
+        with open(self.subtitle_file, "r", encoding="utf-8") as fp:
+            return fp.read()
+
+    def __crash(self, readings: collections.abc.Iterable) -> collections.abc.Generator:
+        """
+        Yield the readings and crash.
+
+        Args:
+            readings (collections.abc.Iterable): The timestamps and texts of the frames.
+
+        Yields:
+            tuple: The readings.
+        """
+        yield from readings
+        raise RuntimeError("Crash")
+
+    def __resume(self, readings: list) -> str:
+        """
+        Extract the subtitles of the readings interrupted after each of them and resumed from the checkpoint.
+
+        Args:
+            readings (list): The timestamps and texts of the frames.
+
+        Returns:
+            str: The content of the subtitle file extracted without an interruption.
+        """
+        self.__extract(self.__create_checkpoint(), readings)
+        expected = self.__read()
+
+        for interrupted in range(len(readings)):
+            checkpoint = self.__create_checkpoint()
+            with self.assertRaises(RuntimeError):
+                self.__extract(checkpoint, self.__crash(readings[: interrupted + 1]))
+
+            checkpoint = self.__create_checkpoint()
+            self.assertTrue(checkpoint.load())
+
+            # the readings held back by the merging are read again
+            resumed = 0
+            if checkpoint.timestamp is not None:
+                resumed = [reading[0] for reading in readings].index(
+                    checkpoint.timestamp
+                ) + 1
+            self.assertLessEqual(resumed, interrupted + 1)
+
+            self.__extract(checkpoint, readings[resumed:])
+            self.assertEqual(expected, self.__read(), f"interrupted at {interrupted}")
+
+        return expected
+
+    def test_resume(self) -> None:
+        """
+        Test the extraction resumed in the middle of a subtitle gives the same subtitles.
+        """
+        expected = self.__resume(self.readings)
+
+        write_subtitles(collect_subtitles(self.readings), self.subtitle_file)
+        self.assertEqual(self.__read(), expected)
+
+    def test_resume_merged(self) -> None:
+        """
+        Test the text restored on resume in the middle of a merged subtitle is merged with the near-identical
+        readings after it into the same subtitle.
+        """
+        readings = [
+            (datetime.timedelta(seconds=0), "", 0.0),
+            (datetime.timedelta(seconds=1), "Hello World", 0.9),
+            (datetime.timedelta(seconds=2), "Hello world", 0.6),
+            (datetime.timedelta(seconds=3), "Hello wor1d", 0.5),
+            (datetime.timedelta(seconds=4), "Hello world", 0.6),
+            (datetime.timedelta(seconds=5), "", 0.0),
+            (datetime.timedelta(seconds=6), "Bye", 0.9),
+        ]
+
+        expected = self.__resume(readings)
+        self.assertEqual(2, expected.count("-->"))
+        self.assertIn("Hello World", expected)
+
+        # the merged readings are tracked one by one, so the extraction stops in the middle of the subtitle
+        for tracked in range(2, len(readings)):
+            checkpoint = self.__create_checkpoint()
+            with self.assertRaises(RuntimeError):
+                self.__extract(checkpoint, readings, tracked)
+
+            checkpoint = self.__create_checkpoint()
+            self.assertTrue(checkpoint.load())
+            resumed = [reading[0] for reading in readings].index(
+                checkpoint.timestamp
+            ) + 1
+
+            self.__extract(checkpoint, readings[resumed:])
+            self.assertEqual(expected, self.__read(), f"tracked {tracked}")
+
+    def test_resume_before_interval(self) -> None:
+        """
+        Test the extraction that crashes before the first periodic checkpoint can be resumed from the start.
+        """
+        write_subtitles(collect_subtitles(self.readings), self.subtitle_file)
+        expected = self.__read()
+
+        checkpoint = self.__create_checkpoint(interval=3600)
+        with self.assertRaises(RuntimeError):
+            self.__extract(checkpoint, self.__crash(self.readings[:7]))
+        self.assertEqual(2, self.__read().count("-->"))
+
+        checkpoint = self.__create_checkpoint()
+        self.assertTrue(checkpoint.load())
+        self.assertIsNone(checkpoint.timestamp)
+        self.assertEqual("", self.__read())
+
+        self.__extract(checkpoint, self.readings)
+        self.assertEqual(expected, self.__read())
+
+    def test_save_periodically(self) -> None:
+        """
+        Test the checkpoint is saved with the state of the last reading.
+        """
+        checkpoint = self.__create_checkpoint()
+        self.__extract(checkpoint, self.readings[:4])
+        self.assertEqual(2, self.__read().count("-->"))
+
+        checkpoint = self.__create_checkpoint()
+        self.assertTrue(checkpoint.load())
+        self.assertEqual(datetime.timedelta(seconds=3), checkpoint.timestamp)
+        self.assertEqual("World", checkpoint.prev)
+        self.assertEqual(1, checkpoint.count)
+        self.assertEqual(1, self.__read().count("-->"))
+
+    def test_load_other_options(self) -> None:
+        """
+        Test the checkpoint made with other options or missing is not loaded.
+        """
+        checkpoint = self.__create_checkpoint()
+        self.assertFalse(checkpoint.load())
+        checkpoint.save()
+
+        self.options["frame_rate"] = 5
+        checkpoint = self.__create_checkpoint()
+        self.assertFalse(checkpoint.load())
+
+        checkpoint.remove()
+        self.assertFalse(os.path.isfile(self.checkpoint_file))
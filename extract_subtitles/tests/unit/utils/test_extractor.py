@@ -0,0 +1,244 @@
+""" Test the extractor module. """
+
+from unittest import mock
+
+import os
+import datetime
+import tempfile
+import unittest
+import numpy as np
+import srt
+
+from extract_subtitles.utils.extractor import (
+    collect_subtitles,
+    extract_subtitle_regions,
+    recognize_frames,
+    write_subtitles,
+)
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestExtractor(unittest.TestCase):
+    """
+    Unit test suite for the extractor module.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up the test case by initializing the necessary variables.
+        """
+        self.readings = [
+            (datetime.timedelta(seconds=0), "", 0.0),
+            (datetime.timedelta(seconds=1), "Hello", 0.9),
+            (datetime.timedelta(seconds=2), "Hello", 0.9),
+            (datetime.timedelta(seconds=3), "World", 0.9),
+            (datetime.timedelta(seconds=4), "", 0.0),
+            (datetime.timedelta(seconds=5), "Bye", 0.9),
+            (datetime.timedelta(seconds=6), "Bye", 0.9),
+        ]
+
+        self.subtitles = [
+            srt.Subtitle(
+                index=1,
+                start=datetime.timedelta(seconds=1),
+                end=datetime.timedelta(seconds=3),
+                content="Hello",
+            ),
+            srt.Subtitle(
+                index=1,
+                start=datetime.timedelta(seconds=3),
+                end=datetime.timedelta(seconds=4),
+                content="World",
+            ),
+            srt.Subtitle(
+                index=1,
+                start=datetime.timedelta(seconds=5),
+                end=datetime.timedelta(seconds=6),
+                content="Bye",
+            ),
+        ]
+
+    def test_collect_subtitles(self) -> None:
+        """
+        Test the collect_subtitles function.
+        """
+        actual = list(collect_subtitles(self.readings))
+        self.assertListEqual(self.subtitles, actual)
+
+    def test_write_subtitles(self) -> None:
+        """
+        Test the write_subtitles function numbers the subtitles and writes each one before the next is collected.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            subtitle_file = os.path.join(directory, "output.srt")
+
+            def subtitles():
+                for index, sub in enumerate(self.subtitles):
+                    if index > 0:
+                        with open(subtitle_file, "r", encoding="utf-8") as fp:
+                            self.assertEqual(index, fp.read().count("-->"))
+                    yield sub
+
+            write_subtitles(subtitles(), subtitle_file)
+            write_subtitles(iter(self.subtitles[:1]), subtitle_file, index=4)
+
+            with open(subtitle_file, "r", encoding="utf-8") as fp:
+                actual = list(srt.parse(fp.read()))
+
+        self.assertListEqual([1, 2, 3, 4], [sub.index for sub in actual])
+        self.assertListEqual(
+            [sub.content for sub in self.subtitles + self.subtitles[:1]],
+            [sub.content for sub in actual],
+        )
+
+    def test_recognize_frames(self) -> None:
+        """
+        Test the recognize_frames function joins the recognized lines of each frame.
+        """
+        ocr = mock.Mock()
+        ocr.ocr.side_effect = [
+            [None],
+            [[[[[0, 0]], ("Hello", 1.0)], [[[0, 1]], ("World", 0.5)]]],
+        ]
+        frames = [
+            (datetime.timedelta(seconds=index), np.zeros((4, 8, 3), dtype=np.uint8))
+            for index in range(2)
+        ]
+
+        actual = list(
+            recognize_frames(frames, ocr, change_threshold=0, empty_threshold=0)
+        )
+
+        self.assertListEqual(
+            [
+                (datetime.timedelta(seconds=0), "", 0.0),
+                (datetime.timedelta(seconds=1), "Hello World", 0.75),
+            ],
+            actual,
+        )
+
+    def test_recognize_frames_unchanged(self) -> None:
+        """
+        Test the recognize_frames function reuses the text of the unchanged frames.
+        """
+        ocr = mock.Mock()
+        ocr.ocr.side_effect = [
+            [[[[[0, 0]], ("Hello", 0.9)]]],
+            [[[[[0, 0]], ("World", 0.9)]]],
+        ]
+        blank = np.zeros((20, 200, 3), dtype=np.uint8)
+        text = blank.copy()
+        text[5:15, 20:180] = 255
+        frames = [
+            (datetime.timedelta(seconds=index), image)
+            for index, image in enumerate([text, text, text.copy(), blank])
+        ]
+
+        actual = list(recognize_frames(frames, ocr, empty_threshold=0))
+
+        self.assertEqual(2, ocr.ocr.call_count)
+        self.assertListEqual(
+            ["Hello", "Hello", "Hello", "World"], [sub for _, sub, _ in actual]
+        )
+
+    @mock.patch(
+        "extract_subtitles.utils.extractor.recognize_batch",
+        side_effect=lambda _, images, cache, profile, localize: [
+            (str(int(image.max())), 0.9) for image in images
+        ],
+    )
+    def test_recognize_frames_batch(self, recognize_batch: mock.MagicMock) -> None:
+        """
+        Test the recognize_frames function recognizes the changed frames in batches and keeps their order.
+        """
+        images = []
+        for value in (0, 200, 200, 250, 0, 220):
+            image = np.zeros((20, 200, 3), dtype=np.uint8)
+            image[5:15, 20 : 20 + value // 2] = value
+            images.append(image)
+        frames = [
+            (datetime.timedelta(seconds=index), image)
+            for index, image in enumerate(images)
+        ]
+
+        actual = list(
+            recognize_frames(frames, mock.Mock(), batch_size=2, empty_threshold=0)
+        )
+
+        self.assertListEqual(
+            ["0", "200", "200", "250", "0", "220"], [sub for _, sub, _ in actual]
+        )
+        self.assertListEqual(
+            [2, 2, 1], [len(call.args[1]) for call in recognize_batch.call_args_list]
+        )
+
+    def test_recognize_frames_empty(self) -> None:
+        """
+        Test the recognize_frames function does not recognize the empty frames unless they are verified.
+        """
+        blank = np.full((20, 200, 3), 40, dtype=np.uint8)
+        text = blank.copy()
+        text[5:15, 20:180:4] = 255
+        frames = [
+            (datetime.timedelta(seconds=index), image)
+            for index, image in enumerate([blank, text, blank])
+        ]
+
+        ocr = mock.Mock()
+        ocr.ocr.side_effect = [[[[[[0, 0]], ("Hello", 0.9)]]]]
+        actual = list(recognize_frames(frames, ocr))
+
+        self.assertEqual(1, ocr.ocr.call_count)
+        self.assertListEqual(["", "Hello", ""], [sub for _, sub, _ in actual])
+
+        ocr = mock.Mock()
+        ocr.ocr.side_effect = [[None], [[[[[0, 0]], ("Hello", 0.9)]]], [None]]
+        with mock.patch("builtins.print") as print_mock:
+            actual = list(recognize_frames(frames, ocr, verify_empty=True))
+
+        self.assertEqual(3, ocr.ocr.call_count)
+        self.assertListEqual(["", "Hello", ""], [sub for _, sub, _ in actual])
+        print_mock.assert_any_call(
+            "Text has been found on 0 of 2 empty frames (0.00% false negative rate)"
+        )
+
+    @mock.patch("extract_subtitles.utils.extractor.get_ocr")
+    def test_extract_subtitle_regions(self, get_ocr: mock.MagicMock) -> None:
+        """
+        Test the extract_subtitle_regions function writes the subtitles of each region to its own file.
+        """
+        get_ocr.return_value.ocr.side_effect = lambda image, cls: [
+            [[[[0, 0]], ("Top" if image.mean() > 100 else "Bottom", 0.9)]]
+        ]
+        frames = [
+            (
+                datetime.timedelta(seconds=index),
+                {
+                    "top": np.full((4, 8, 3), 255, dtype=np.uint8),
+                    "bottom": np.zeros((4, 8, 3), dtype=np.uint8),
+                },
+            )
+            for index in range(3)
+        ]
+
+        with tempfile.TemporaryDirectory() as directory:
+            subtitle_files = {
+                name: os.path.join(directory, f"{name}.srt")
+                for name in ("top", "bottom")
+            }
+            extract_subtitle_regions(
+                iter(frames),
+                "en",
+                subtitle_files,
+                change_threshold=0,
+                empty_threshold=0,
+            )
+
+            for name, content in (("top", "Top"), ("bottom", "Bottom")):
+                with open(subtitle_files[name], "r", encoding="utf-8") as fp:
+                    subs = list(srt.parse(fp.read()))
+
+                self.assertEqual([content], [sub.content for sub in subs])
+                self.assertEqual(datetime.timedelta(seconds=2), subs[0].end)
+
+        get_ocr.assert_called_once()
@@ -0,0 +1,170 @@
+""" Test the frames module. """
+
+import os
+import datetime
+import tempfile
+import unittest
+import numpy as np
+
+from extract_subtitles.utils.frames import (
+    buffer_frames,
+    distribute_frames,
+    load_frames,
+    read_frames_file,
+    save_frames,
+)
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestFrames(unittest.TestCase):
+    """
+    Unit test suite for the frames module.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up the test case by initializing the necessary variables.
+        """
+        self.frames = [
+            (
+                datetime.timedelta(seconds=index / 10),
+                np.full((4, 8, 3), index * 10, dtype=np.uint8),
+            )
+            for index in range(20)
+        ]
+
+    def test_buffer_frames(self) -> None:
+        """
+        Test that the buffer_frames function yields every frame in order.
+        """
+        actual = list(buffer_frames(iter(self.frames), size=2))
+
+        self.assertEqual([ts for ts, _ in self.frames], [ts for ts, _ in actual])
+        for (_, expected), (_, image) in zip(self.frames, actual):
+            np.testing.assert_array_equal(expected, image)
+
+    def test_buffer_frames_error(self) -> None:
+        """
+        Test that the buffer_frames function raises the error of the producer in the consumer.
+        """
+
+        def failing_frames():
+            yield self.frames[0]
+            raise ValueError("decoding failed")
+
+        with self.assertRaises(ValueError):
+            list(buffer_frames(failing_frames(), size=2))
+
+    def test_buffer_frames_close(self) -> None:
+        """
+        Test that the buffer_frames function stops the producer when the consumer stops early.
+        """
+        frames = buffer_frames(iter(self.frames), size=2)
+        next(frames)
+        frames.close()
+
+    def test_distribute_frames(self) -> None:
+        """
+        Test that the distribute_frames function feeds each consumer the crops of its region in order.
+        """
+        frames = [
+            (timestamp, {"top": image[:2], "bottom": image[2:]})
+            for timestamp, image in self.frames
+        ]
+        received = {"top": [], "bottom": []}
+
+        distribute_frames(
+            iter(frames),
+            {name: received[name].extend for name in received},
+            size=2,
+        )
+
+        for name, crops in received.items():
+            self.assertEqual([ts for ts, _ in self.frames], [ts for ts, _ in crops])
+            for (_, expected), (_, crop) in zip(frames, crops):
+                self.assertIs(expected[name], crop)
+
+    def test_distribute_frames_error(self) -> None:
+        """
+        Test that the distribute_frames function raises the error of a consumer once the others have finished.
+        """
+        frames = [
+            (timestamp, {"a": image, "b": image}) for timestamp, image in self.frames
+        ]
+        received = []
+
+        def failing_consumer(crops) -> None:
+            next(iter(crops))
+            raise ValueError("recognition failed")
+
+        with self.assertRaises(ValueError):
+            distribute_frames(
+                iter(frames), {"a": failing_consumer, "b": received.extend}, size=2
+            )
+
+        self.assertLessEqual(len(received), len(frames))
+
+    def test_save_and_load_frames(self) -> None:
+        """
+        Test that the frames saved by save_frames are mapped back with their index.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            frames_file = os.path.join(directory, "video.frames")
+            saved = list(save_frames(iter(self.frames), frames_file, range(3, 63, 3)))
+            index, images = load_frames(frames_file)
+
+            self.assertEqual(len(self.frames), len(saved))
+            self.assertIsInstance(images, np.memmap)
+            self.assertEqual((20, 4, 8, 3), images.shape)
+            self.assertListEqual(list(range(3, 63, 3)), list(index["frame"]))
+            self.assertListEqual(
+                [ts.total_seconds() for ts, _ in self.frames], list(index["pts"])
+            )
+            np.testing.assert_array_equal(self.frames[7][1], images[7])
+
+            loaded = list(read_frames_file(frames_file))
+            self.assertEqual([ts for ts, _ in self.frames], [ts for ts, _ in loaded])
+            del index, images, loaded
+
+    def test_save_frames_grayscale(self) -> None:
+        """
+        Test that save_frames saves the crops without the channel axis in grayscale.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            frames_file = os.path.join(directory, "video.frames")
+            list(save_frames(iter(self.frames), frames_file, range(20), grayscale=True))
+            _, images = load_frames(frames_file)
+
+            self.assertEqual((20, 4, 8), images.shape)
+            self.assertEqual(50, images[5, 0, 0])
+            del images
+
+    def test_save_frames_stopped(self) -> None:
+        """
+        Test that save_frames completes the store when the frames stop early.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            frames_file = os.path.join(directory, "video.frames")
+            frames = save_frames(iter(self.frames), frames_file, range(20))
+            next(frames)
+            next(frames)
+            frames.close()
+
+            index, _ = load_frames(frames_file)
+            self.assertEqual(2, len(index))
+
+            list(save_frames(iter([]), frames_file, range(20)))
+            index, images = load_frames(frames_file)
+            self.assertEqual(0, len(index))
+            self.assertEqual(0, len(images))
+            del index, images
+
+    def test_save_frames_shape(self) -> None:
+        """
+        Test that save_frames rejects the crops of another shape.
+        """
+        frames = self.frames[:2] + [(self.frames[2][0], np.zeros((5, 8, 3), np.uint8))]
+        with tempfile.TemporaryDirectory() as directory:
+            frames_file = os.path.join(directory, "video.frames")
+            with self.assertRaises(ValueError):
+                list(save_frames(iter(frames), frames_file, range(20)))
@@ -0,0 +1,62 @@
+""" Test the line locator module. """
+
+import os
+import unittest
+import cv2
+import numpy as np
+
+from extract_subtitles.utils.line_locator import LOCATION_THRESHOLD, locate_lines
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestLineLocator(unittest.TestCase):
+    """
+    Unit test suite for the line locator module.
+    """
+
+    def test_locate_lines(self) -> None:
+        """
+        Test that each line of the text is located, from top to bottom.
+        """
+        image = np.zeros((216, 1920, 3), dtype=np.uint8)
+        cv2.putText(
+            image,
+            "The first line of text",
+            (500, 80),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.8,
+            (255, 255, 255),
+            4,
+        )
+        cv2.putText(
+            image,
+            "The second one",
+            (600, 170),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.8,
+            (255, 255, 255),
+            4,
+        )
+
+        boxes, confidence = locate_lines(image)
+
+        self.assertGreaterEqual(confidence, LOCATION_THRESHOLD)
+        self.assertEqual(2, len(boxes))
+        first, second = boxes
+        self.assertTrue(first[0] < 500 and first[1] < 45 and first[3] > 80)
+        self.assertTrue(second[0] < 600 and second[1] > 80 and second[3] > 170)
+        self.assertLessEqual(first[3], second[1] + (second[3] - second[1]) // 2)
+
+    def test_locate_lines_unclear(self) -> None:
+        """
+        Test that no lines are located on a crop without text or with a busy background.
+        """
+        self.assertEqual(([], 0.0), locate_lines(np.zeros((100, 400), dtype=np.uint8)))
+
+        noise = (np.random.default_rng(0).random((100, 400)) * 255).astype(np.uint8)
+        _, confidence = locate_lines(noise)
+        self.assertLess(confidence, LOCATION_THRESHOLD)
+
+
+if __name__ == "__main__":
+    unittest.main()
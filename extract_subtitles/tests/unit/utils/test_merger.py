@@ -0,0 +1,85 @@
+""" Test the merger module. """
+
+from unittest import mock
+
+import os
+import datetime
+import unittest
+
+from extract_subtitles.utils.extractor import collect_subtitles
+from extract_subtitles.utils.merger import (
+    edit_distance,
+    merge_readings,
+    text_similarity,
+)
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestMerger(unittest.TestCase):
+    """
+    Unit test suite for the merger module.
+    """
+
+    def test_edit_distance(self) -> None:
+        """
+        Test the edit_distance function counts the inserted, deleted and substituted characters.
+        """
+        self.assertEqual(0, edit_distance("Hello", "Hello"))
+        self.assertEqual(5, edit_distance("", "Hello"))
+        self.assertEqual(3, edit_distance("kitten", "sitting"))
+        self.assertEqual(3, edit_distance("sitting", "kitten"))
+        self.assertEqual(2, edit_distance("flaw", "lawn"))
+        self.assertEqual(1, edit_distance("Привет", "Привeт"))
+
+    def test_text_similarity(self) -> None:
+        """
+        Test the text_similarity function normalizes the edit distance by the length of the longer string.
+        """
+        self.assertEqual(1.0, text_similarity("", ""))
+        self.assertEqual(0.9, text_similarity("Subtitles!", "Subtit1es!"))
+        self.assertEqual(0.0, text_similarity("Yes", ""))
+
+    def test_merge_readings(self) -> None:
+        """
+        Test the merge_readings function merges the flickering readings into the most confident one.
+        """
+        readings = [
+            ("", 0.0),
+            ("Hello World", 0.8),
+            ("Hell0 World", 0.6),
+            ("Hello World!", 0.95),
+            ("Hello World", 0.9),
+            ("Goodbye", 0.9),
+            ("", 0.0),
+            ("Hello World", 0.9),
+        ]
+        readings = [
+            (datetime.timedelta(seconds=index), sub, confidence)
+            for index, (sub, confidence) in enumerate(readings)
+        ]
+
+        with mock.patch("builtins.print") as print_mock:
+            actual = list(collect_subtitles(merge_readings(readings)))
+
+        self.assertListEqual(
+            [
+                ("Hello World!", 1, 5),
+                ("Goodbye", 5, 6),
+                ("Hello World", 7, 7),
+            ],
+            [(sub.content, sub.start.seconds, sub.end.seconds) for sub in actual],
+        )
+        print_mock.assert_called_with(
+            "Merging the near-identical readings has removed 3 cues"
+        )
+
+    def test_merge_readings_disabled(self) -> None:
+        """
+        Test the merge_readings function keeps the readings with the threshold of 1.
+        """
+        readings = [
+            (datetime.timedelta(seconds=index), sub, 0.9)
+            for index, sub in enumerate(["Hello", "Hello", "Hell0", ""])
+        ]
+
+        self.assertListEqual(readings, list(merge_readings(readings, 1)))
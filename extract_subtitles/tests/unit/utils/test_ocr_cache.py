@@ -0,0 +1,87 @@
+""" Test the ocr_cache module. """
+
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from extract_subtitles.utils.ocr_cache import OCRCache
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestOCRCache(unittest.TestCase):
+    """
+    Unit test suite for the ocr_cache module.
+    """
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.directory.name, "cache.db")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def __create_image(self, value: int) -> np.ndarray:
+        """
+        Create a crop filled with the value.
+
+        Args:
+            value (int): The brightness of the crop.
+
+        Returns:
+            np.ndarray: The crop.
+        """
+        return np.full((20, 100, 3), value, dtype=np.uint8)
+
+    def test_get_put(self) -> None:
+        """
+        Test the cache returns the stored lines and counts the hits and misses.
+        """
+        cache = OCRCache(self.cache_file, "lang=en")
+
+        self.assertIsNone(cache.get(self.__create_image(1)))
+        cache.put(self.__create_image(1), [("Hello", 0.9), ("World", 0.8)])
+        self.assertListEqual(
+            [("Hello", 0.9), ("World", 0.8)], cache.get(self.__create_image(1))
+        )
+        self.assertIsNone(cache.get(self.__create_image(2)))
+        self.assertEqual((1, 2), (cache.hits, cache.misses))
+
+        cache.close()
+
+    def test_persistence(self) -> None:
+        """
+        Test the results are kept across the runs and only for the same settings.
+        """
+        cache = OCRCache(self.cache_file, "lang=en")
+        cache.put(self.__create_image(1), [("Hello", 0.9)])
+        cache.close()
+
+        cache = OCRCache(self.cache_file, "lang=en")
+        self.assertListEqual([("Hello", 0.9)], cache.get(self.__create_image(1)))
+        cache.close()
+
+        cache = OCRCache(self.cache_file, "lang=ch")
+        self.assertIsNone(cache.get(self.__create_image(1)))
+        cache.close()
+
+    def test_eviction(self) -> None:
+        """
+        Test the least recently used results are evicted when the cache gets full.
+        """
+        cache = OCRCache(self.cache_file, "lang=en")
+        cache.put(self.__create_image(0), [("Text", 0.9)])
+        size = cache.size
+
+        cache.max_size = 3 * size
+        for value in range(1, 3):
+            cache.put(self.__create_image(value), [("Text", 0.9)])
+        cache.get(self.__create_image(0))
+        cache.put(self.__create_image(3), [("Text", 0.9)])
+
+        self.assertLessEqual(cache.size, 3 * size)
+        self.assertIsNotNone(cache.get(self.__create_image(0)))
+        self.assertIsNone(cache.get(self.__create_image(1)))
+        self.assertIsNotNone(cache.get(self.__create_image(3)))
+
+        cache.close()
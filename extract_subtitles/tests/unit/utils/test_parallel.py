@@ -0,0 +1,118 @@
+""" Test the parallel module. """
+
+from unittest import mock
+
+import os
+import datetime
+import unittest
+import srt
+
+from extract_subtitles.utils.parallel import (
+    __extract_segment as extract_segment,
+    split_frames,
+    stitch_subtitles,
+)
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestParallel(unittest.TestCase):
+    """
+    Unit test suite for the parallel module.
+    """
+
+    def __create_subtitle(self, start: float, end: float, content: str) -> srt.Subtitle:
+        """
+        Create a subtitle object with the given timing and content.
+
+        Args:
+            start (float): The start of the subtitle in seconds.
+            end (float): The end of the subtitle in seconds.
+            content (str): The content of the subtitle.
+
+        Returns:
+            srt.Subtitle: The created subtitle object.
+        """
+        return srt.Subtitle(
+            index=1,
+            start=datetime.timedelta(seconds=start),
+            end=datetime.timedelta(seconds=end),
+            content=content,
+        )
+
+    def test_split_frames(self) -> None:
+        """
+        Test the split_frames function covers every frame once.
+        """
+        self.assertListEqual([(0, 33), (33, 66), (66, 100)], split_frames(100, 3))
+        self.assertListEqual([(0, 1), (1, 2)], split_frames(2, 4))
+
+    def test_stitch_subtitles(self) -> None:
+        """
+        Test the stitch_subtitles function merges only the subtitles cut by a boundary.
+        """
+        segments = [
+            [
+                self.__create_subtitle(1, 2, "One"),
+                self.__create_subtitle(3, 4.9, "Two"),
+            ],
+            [
+                self.__create_subtitle(5, 6, "Two"),
+                self.__create_subtitle(6, 9.9, "Three"),
+            ],
+            [],
+            [
+                self.__create_subtitle(10.5, 11, "Three"),
+                self.__create_subtitle(12, 13, "Four"),
+            ],
+            [self.__create_subtitle(16, 17, "Four")],
+        ]
+
+        actual = list(stitch_subtitles(segments, datetime.timedelta(seconds=0.15)))
+
+        self.assertListEqual(
+            [
+                self.__create_subtitle(1, 2, "One"),
+                self.__create_subtitle(3, 6, "Two"),
+                self.__create_subtitle(6, 9.9, "Three"),
+                self.__create_subtitle(10.5, 11, "Three"),
+                self.__create_subtitle(12, 13, "Four"),
+                self.__create_subtitle(16, 17, "Four"),
+            ],
+            actual,
+        )
+
+    @mock.patch("extract_subtitles.utils.parallel.get_ocr")
+    @mock.patch("extract_subtitles.utils.parallel.read_frames")
+    @mock.patch("extract_subtitles.utils.parallel.get_fps", return_value=10)
+    @mock.patch("extract_subtitles.utils.parallel.recognize_frames")
+    def test_stitch_subtitles_boundary(
+        self, recognize_frames, _, read_frames, __
+    ) -> None:
+        """
+        Test a subtitle ending exactly on the boundary of two segments ends on it, not on the last frame before it.
+        """
+        texts = {
+            (0, 10): ["", "", "", "", "", "One", "One", "One", "One", "One"],
+            (10, 20): ["", "", "Two", "Two", "Two", "Two", "Two", "Two", "Two", "Two"],
+        }
+        recognize_frames.side_effect = lambda frames, *_, **__: frames
+        read_frames.side_effect = lambda *_, start_frame, end_frame, **__: [
+            (datetime.timedelta(seconds=frame / 10), text, 0.9)
+            for frame, text in zip(
+                range(start_frame, end_frame), texts[(start_frame, end_frame)]
+            )
+        ]
+
+        segments = [
+            extract_segment("video.mp4", segment, "en", {}, {})
+            for segment in split_frames(20, 2)
+        ]
+        actual = list(stitch_subtitles(segments, datetime.timedelta(seconds=0.15)))
+
+        self.assertListEqual(
+            [
+                self.__create_subtitle(0.5, 1, "One"),
+                self.__create_subtitle(1.2, 2, "Two"),
+            ],
+            actual,
+        )
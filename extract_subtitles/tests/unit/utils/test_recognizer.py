@@ -0,0 +1,214 @@
+""" Test the recognizer module. """
+
+from unittest import mock
+
+import os
+import tempfile
+import unittest
+import cv2
+import numpy as np
+
+from extract_subtitles.utils.ocr_cache import OCRCache
+from extract_subtitles.utils.recognizer import (
+    MOSAIC_GAP,
+    MOSAIC_WIDTH,
+    OCR_PROFILES,
+    build_mosaic,
+    create_ocr,
+    get_ocr,
+    ocr_settings,
+    preprocess,
+    recognize,
+    recognize_batch,
+)
+from extract_subtitles.utils.text_filter import estimate_text_height
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestRecognizer(unittest.TestCase):
+    """
+    Unit test suite for the recognizer module.
+    """
+
+    def __create_line(self, top: int, bottom: int, text: str) -> list:
+        """
+        Create a line of the PaddleOCR result.
+
+        Args:
+            top (int): The top of the box.
+            bottom (int): The bottom of the box.
+            text (str): The recognized text.
+
+        Returns:
+            list: The box and the text with its confidence.
+        """
+        return [[[0, top], [100, top], [100, bottom], [0, bottom]], (text, 0.9)]
+
+    def test_recognize(self) -> None:
+        """
+        Test the recognize function joins the recognized lines.
+        """
+        ocr = mock.Mock()
+        ocr.ocr.return_value = [
+            [self.__create_line(0, 10, "Hello"), self.__create_line(10, 20, "World")]
+        ]
+
+        text, confidence = recognize(ocr, np.zeros((20, 100, 3), dtype=np.uint8))
+        self.assertEqual("Hello World", text)
+        self.assertAlmostEqual(0.9, confidence)
+
+        ocr.ocr.return_value = [None]
+        self.assertEqual(
+            ("", 0.0), recognize(ocr, np.zeros((20, 100, 3), dtype=np.uint8))
+        )
+
+    def test_build_mosaic(self) -> None:
+        """
+        Test the build_mosaic function stacks, pads and downscales the images.
+        """
+        images = [
+            np.full((50, 400, 3), 1, dtype=np.uint8),
+            np.full((20, 200), 2, dtype=np.uint8),
+            np.full((200, 2 * MOSAIC_WIDTH, 3), 3, dtype=np.uint8),
+        ]
+
+        mosaic, offsets = build_mosaic(images)
+
+        self.assertListEqual([0, 50 + MOSAIC_GAP, 70 + 2 * MOSAIC_GAP], list(offsets))
+        self.assertEqual((170 + 3 * MOSAIC_GAP, MOSAIC_WIDTH, 3), mosaic.shape)
+        self.assertEqual(1, mosaic[0, 399, 0])
+        self.assertEqual(0, mosaic[0, 400, 0])
+        self.assertEqual(2, mosaic[offsets[1], 0, 2])
+        self.assertEqual(3, mosaic[offsets[2] + 99, MOSAIC_WIDTH - 1, 1])
+
+    def test_recognize_batch(self) -> None:
+        """
+        Test the recognize_batch function maps the lines of the mosaic back to the images.
+        """
+        step = 20 + MOSAIC_GAP
+        ocr = mock.Mock()
+        ocr.ocr.return_value = [
+            [
+                self.__create_line(2, 10, "One"),
+                self.__create_line(10, 18, "line"),
+                self.__create_line(2 * step + 2, 2 * step + 18, "Three"),
+            ]
+        ]
+        images = [np.zeros((20, 100, 3), dtype=np.uint8) for _ in range(3)]
+
+        self.assertListEqual(
+            ["One line", "", "Three"],
+            [text for text, _ in recognize_batch(ocr, images)],
+        )
+        self.assertEqual(1, ocr.ocr.call_count)
+
+    def test_recognize_batch_cache(self) -> None:
+        """
+        Test the recognize_batch function recognizes only the images missing from the cache.
+        """
+        ocr = mock.Mock()
+        ocr.ocr.return_value = [[self.__create_line(0, 10, "New")]]
+        cached = np.full((20, 100, 3), 1, dtype=np.uint8)
+        missing = np.full((20, 100, 3), 2, dtype=np.uint8)
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = OCRCache(os.path.join(directory, "cache.db"), "lang=en")
+            cache.put(cached, [("Old", 0.8)])
+
+            self.assertListEqual(
+                [("Old", 0.8), ("New", 0.9)],
+                recognize_batch(ocr, [cached, missing], cache),
+            )
+            self.assertEqual(("New", 0.9), recognize(ocr, missing, cache))
+            self.assertEqual(1, ocr.ocr.call_count)
+            cache.close()
+
+    def test_recognize_batch_localize(self) -> None:
+        """
+        Test the recognize_batch function recognizes the located lines without the detector
+        and passes the images with unclear lines to it.
+        """
+        located = np.zeros((100, 600), dtype=np.uint8)
+        cv2.putText(located, "One", (50, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, 255, 2)
+        cv2.putText(located, "Two", (50, 85), cv2.FONT_HERSHEY_SIMPLEX, 1, 255, 2)
+        unclear = (np.random.default_rng(0).random((100, 600)) * 255).astype(np.uint8)
+
+        def recognize_lines(image, det: bool = True, cls: bool = False) -> list:
+            if det:
+                return [[self.__create_line(0, 10, "Detected")]]
+
+            self.assertTrue(all(line.ndim == 3 for line in image))
+            return [[("One", 0.9), ("Two", 0.8), ("", 0.1)][: len(image)]]
+
+        ocr = mock.Mock()
+        ocr.use_angle_cls = False
+        ocr.ocr.side_effect = recognize_lines
+
+        actual = recognize_batch(
+            ocr, [located, unclear], profile="accurate", localize=True
+        )
+
+        self.assertEqual(("One Two", 0.85), (actual[0][0], round(actual[0][1], 2)))
+        self.assertEqual(("Detected", 0.9), actual[1])
+        self.assertEqual(2, ocr.ocr.call_count)
+        self.assertEqual(2, len(ocr.ocr.call_args_list[0].args[0]))
+
+    @mock.patch("extract_subtitles.utils.recognizer.PaddleOCR")
+    def test_create_ocr(self, paddle_ocr: mock.MagicMock) -> None:
+        """
+        Test the create_ocr function sets up the OCR as the profile says.
+        """
+        create_ocr("en", 4, "fast")
+
+        paddle_ocr.assert_called_once_with(
+            use_angle_cls=False,
+            lang="en",
+            det_limit_side_len=4 * OCR_PROFILES["fast"]["det_limit_side_len"],
+            rec_batch_num=OCR_PROFILES["fast"]["rec_batch_num"],
+        )
+
+    @mock.patch("extract_subtitles.utils.recognizer.PaddleOCR")
+    def test_get_ocr(self, paddle_ocr: mock.MagicMock) -> None:
+        """
+        Test the get_ocr function creates the OCR once per language and keeps it for the next videos.
+        """
+        get_ocr.cache_clear()
+        paddle_ocr.side_effect = lambda **options: mock.Mock(lang=options["lang"])
+
+        english = get_ocr("en", 1, "fast")
+        self.assertIs(english, get_ocr("en", 1, "fast"))
+        self.assertEqual("ch", get_ocr("ch", 1, "fast").lang)
+        self.assertEqual(2, paddle_ocr.call_count)
+        get_ocr.cache_clear()
+
+    def test_ocr_settings(self) -> None:
+        """
+        Test the ocr_settings function describes every setting the recognized text depends on.
+        """
+        self.assertEqual(
+            "lang=en;mosaic=False;profile=balanced;localize=False", ocr_settings("en")
+        )
+        self.assertEqual(
+            "lang=ch;mosaic=True;profile=fast;localize=True",
+            ocr_settings("ch", 4, "fast", localize=True),
+        )
+
+    def test_preprocess(self) -> None:
+        """
+        Test the preprocess function converts and downscales the crop as the profile says.
+        """
+        image = np.full((216, 1920, 3), 40, dtype=np.uint8)
+        cv2.putText(
+            image, "Hello", (700, 150), cv2.FONT_HERSHEY_SIMPLEX, 4, (255, 255, 255), 8
+        )
+
+        np.testing.assert_array_equal(image, preprocess(image, "accurate"))
+
+        balanced = preprocess(image, "balanced")
+        self.assertEqual(2, balanced.ndim)
+        self.assertLess(balanced.shape[0], image.shape[0])
+        self.assertLessEqual(abs(estimate_text_height(balanced) - 48), 4)
+
+        fast = preprocess(image, "fast")
+        self.assertLess(fast.shape[0], balanced.shape[0])
+        self.assertSetEqual({0, 255}, set(np.unique(fast)))
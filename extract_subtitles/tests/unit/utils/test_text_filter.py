@@ -0,0 +1,60 @@
+""" Test the text filter module. """
+
+import os
+import unittest
+import cv2
+import numpy as np
+
+from extract_subtitles.utils.text_filter import (
+    estimate_text_height,
+    is_empty,
+    text_density,
+)
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestTextFilter(unittest.TestCase):
+    """
+    Unit test suite for the text filter module.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up the test case by initializing the necessary variables.
+        """
+        rng = np.random.default_rng(0)
+        noise = rng.integers(-30, 31, (216, 1920, 3))
+        self.blank = np.clip(40 + noise, 0, 255).astype(np.uint8)
+
+        self.text = self.blank.copy()
+        cv2.putText(
+            self.text,
+            "Yes.",
+            (900, 150),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1.2,
+            (255, 255, 255),
+            2,
+        )
+
+    def test_text_density(self) -> None:
+        """
+        Test the text_density function.
+        """
+        self.assertEqual(0.0, text_density(self.blank))
+        self.assertGreater(text_density(self.text), 0.002)
+
+    def test_is_empty(self) -> None:
+        """
+        Test the is_empty function.
+        """
+        self.assertIs(True, is_empty(self.blank))
+        self.assertIs(False, is_empty(self.text))
+        self.assertIs(True, is_empty(self.text, 0.5))
+
+    def test_estimate_text_height(self) -> None:
+        """
+        Test the estimate_text_height function.
+        """
+        self.assertEqual(0, estimate_text_height(self.blank))
+        self.assertTrue(20 <= estimate_text_height(self.text) <= 40)
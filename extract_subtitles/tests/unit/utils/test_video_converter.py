@@ -0,0 +1,166 @@
+""" Test the video converter module. """
+
+from unittest import mock
+
+import os
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+
+from extract_subtitles.utils.video_converter import (
+    FFMPEG_BINARY,
+    SAMPLING_MODES,
+    read_frames,
+    read_regions,
+    sampled_frames,
+)
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestVideoConverter(unittest.TestCase):
+    """
+    Unit test suite for the video converter module.
+    """
+
+    def setUp(self) -> None:
+        """
+        Write a short video where the brightness of each frame is its number.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.video_file = os.path.join(self.directory.name, "video.avi")
+
+        writer = cv2.VideoWriter(
+            self.video_file, cv2.VideoWriter_fourcc(*"MJPG"), 25, (64, 48)
+        )
+        for index in range(50):
+            writer.write(np.full((48, 64, 3), index * 5, dtype=np.uint8))
+        writer.release()
+
+    def tearDown(self) -> None:
+        """
+        Remove the video.
+        """
+        self.directory.cleanup()
+
+    def test_read_frames(self) -> None:
+        """
+        Test that every sampling mode yields the same cropped frames at the same timestamps.
+        """
+        expected = None
+        for sampling in SAMPLING_MODES:
+            actual = list(read_frames(self.video_file, 5, sampling=sampling))
+            timestamps = [timestamp.total_seconds() for timestamp, _ in actual]
+            brightness = [round(float(np.mean(image)) / 5) for _, image in actual]
+
+            self.assertEqual((10, 64, 3), actual[0][1].shape)
+            self.assertEqual(10, len(actual))
+            if expected is None:
+                expected = (timestamps, brightness)
+            self.assertEqual(expected, (timestamps, brightness), sampling)
+
+        self.assertEqual([index * 5 for index in range(10)], expected[1])
+
+    def test_sampled_frames(self) -> None:
+        """
+        Test that the sampled frame numbers are the numbers of the frames read at the same frame rate.
+        """
+        for start_frame in [0, 7]:
+            actual = sampled_frames(self.video_file, 5, start_frame)
+            frames = read_frames(self.video_file, 5, start_frame=start_frame)
+            brightness = [round(float(np.mean(image)) / 5) for _, image in frames]
+
+            self.assertEqual(brightness, list(actual))
+
+        self.assertEqual(range(10, 30, 5), sampled_frames(self.video_file, 5, 7, 30))
+
+    def test_read_regions(self) -> None:
+        """
+        Test that each region is cropped as if the frames had been read for the region alone.
+        """
+        regions = {"top": (0, 50, 0, 25), "bottom": (25, 100, 80, 100)}
+
+        actual = list(read_regions(self.video_file, regions, 5))
+        for name, area in regions.items():
+            expected = list(read_frames(self.video_file, 5, *area))
+
+            self.assertEqual([ts for ts, _ in expected], [ts for ts, _ in actual])
+            for (_, image), (_, crops) in zip(expected, actual):
+                np.testing.assert_array_equal(image, crops[name])
+
+    @unittest.skipIf(shutil.which(FFMPEG_BINARY) is None, "Skipping missing ffmpeg")
+    def test_read_frames_ffmpeg(self) -> None:
+        """
+        Test that ffmpeg yields the same frames as OpenCV in grayscale.
+        """
+        for start_frame in (0, 21):
+            expected = list(
+                read_frames(self.video_file, 5, start_frame=start_frame, end_frame=45)
+            )
+            actual = [
+                (timestamp, image.copy())
+                for timestamp, image in read_frames(
+                    self.video_file,
+                    5,
+                    start_frame=start_frame,
+                    end_frame=45,
+                    decoder="ffmpeg",
+                    pool_size=2,
+                )
+            ]
+
+            self.assertEqual((10, 64), actual[0][1].shape)
+            self.assertEqual([ts for ts, _ in expected], [ts for ts, _ in actual])
+            for (_, color), (_, gray) in zip(expected, actual):
+                self.assertAlmostEqual(
+                    float(np.mean(color)), float(np.mean(gray)), delta=2
+                )
+
+    def __fake_ffmpeg(self, script: str) -> str:
+        """
+        Write a shell script that stands in for ffmpeg.
+
+        Args:
+            script (str): The body of the script.
+
+        Returns:
+            str: The path to the script.
+        """
+        ffmpeg_file = os.path.join(self.directory.name, "ffmpeg")
+        with open(ffmpeg_file, "w", encoding="utf-8") as fp:
+            fp.write(f"#!/bin/sh\n{script}\n")
+        os.chmod(ffmpeg_file, 0o755)
+
+        return ffmpeg_file
+
+    def test_read_frames_ffmpeg_exit_code(self) -> None:
+        """
+        Test that a failure of ffmpeg is raised even if it has written some frames, and that stopping early
+        kills ffmpeg without an error.
+        """
+        # 10 frames of the bottom 20% of 64x48, 640 bytes each
+        scripts = {
+            "head -c 6400 /dev/zero": 10,
+            # ffmpeg closes the output before it exits with the error
+            "head -c 640 /dev/zero; exec >&-; sleep 0.2; echo 'Invalid data' >&2; exit 1": None,
+        }
+        for script, expected in scripts.items():
+            with mock.patch(
+                "extract_subtitles.utils.video_converter.FFMPEG_BINARY",
+                self.__fake_ffmpeg(script),
+            ):
+                frames = read_frames(self.video_file, 5, decoder="ffmpeg")
+                if expected is None:
+                    with self.assertRaisesRegex(RuntimeError, "Invalid data"):
+                        list(frames)
+                else:
+                    self.assertEqual(expected, len(list(frames)))
+
+        with mock.patch(
+            "extract_subtitles.utils.video_converter.FFMPEG_BINARY",
+            self.__fake_ffmpeg("cat /dev/zero"),
+        ):
+            frames = read_frames(self.video_file, 5, decoder="ffmpeg")
+            next(frames)
+            frames.close()
@@ -0,0 +1,147 @@
+""" This module contains functions to recognize the subtitles by sampling the video sparsely and refining the changes. """
+
+from datetime import timedelta
+import collections.abc
+import cv2
+import numpy as np
+from paddleocr import PaddleOCR
+
+from extract_subtitles.utils.change_detector import (
+    BINARIZATION_THRESHOLD,
+    CHANGE_THRESHOLD,
+    compute_signature,
+    signature_difference,
+)
+from extract_subtitles.utils.ocr_cache import OCRCache
+from extract_subtitles.utils.recognizer import OCR_PROFILE, recognize
+from extract_subtitles.utils.text_filter import EMPTY_THRESHOLD, is_empty
+from extract_subtitles.utils.video_converter import read_frame
+
+# The number of frames per second sampled before the changes are searched
+COARSE_FRAME_RATE = 1
+
+# A reading of a frame: its number, timestamp, signature, recognized text and its confidence
+Reading = tuple[int, timedelta, np.ndarray | None, str, float]
+
+
+def recognize_adaptive(
+    video_file: str,
+    ocr: PaddleOCR,
+    frame_rate: int = COARSE_FRAME_RATE,
+    x1_percent: int = 0,
+    x2_percent: int = 100,
+    y1_percent: int = 80,
+    y2_percent: int = 100,
+    change_threshold: float = CHANGE_THRESHOLD,
+    binarization_threshold: int = BINARIZATION_THRESHOLD,
+    empty_threshold: float = EMPTY_THRESHOLD,
+    cache: OCRCache = None,
+    profile: str = OCR_PROFILE,
+    localize: bool = False,
+) -> collections.abc.Generator[tuple[timedelta, str, float]]:
+    """
+    Recognizes the text on the frames sampled at a low frame rate and finds the exact frame of each change.
+
+    Wherever the text differs between two samples, the frames in between are binary searched for
+    the first frame showing the new text, so the subtitles start and end on the exact frame.
+    A subtitle that appears and disappears between two samples is not found.
+    The samples are read one after another, and only the frames searched in between are seeked to.
+
+    Args:
+        video_file (str): The path to the video file.
+        ocr (PaddleOCR): The OCR engine.
+        frame_rate (int, optional): The number of frames per second to be sampled. Defaults to 1.
+        x1_percent (int, optional): The percentage of the width to start cropping from (left side). Defaults to 0.
+        x2_percent (int, optional): The percentage of the width to end cropping at (right side). Defaults to 100.
+        y1_percent (int, optional): The percentage of the height to start cropping from (top side). Defaults to 80.
+        y2_percent (int, optional): The percentage of the height to end cropping at (bottom side). Defaults to 100.
+        change_threshold (float, optional): The fraction of the signature pixels that have to differ
+                                            for the frame to be recognized again, 0 to recognize every frame.
+                                            Defaults to 0.001.
+        binarization_threshold (int, optional): The brightness above which a signature pixel is set.
+                                                Defaults to 160.
+        empty_threshold (float, optional): The fraction of the high-contrast pixels below which the crop
+                                           is considered empty, 0 to recognize every changed crop.
+                                           Defaults to 0.002.
+        cache (OCRCache, optional): The cache of the recognized lines. Defaults to None.
+        profile (str, optional): The name of the profile in OCR_PROFILES to preprocess the crops with.
+                                 Defaults to "balanced".
+        localize (bool, optional): Whether to locate the lines without the text detector when possible.
+                                   Defaults to False.
+
+    Yields:
+        tuple[timedelta, str, float]: The timestamp of the frame, the recognized text and its confidence.
+    """
+    cap = cv2.VideoCapture(video_file)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    capture_rate = max(round(fps / frame_rate), 1)
+    print(
+        f"Capture the image every {capture_rate} frames and search the changes in between."
+    )
+
+    recognized = 0
+
+    def read(
+        frame_number: int, references: list[Reading], grab: bool = False
+    ) -> Reading | None:
+        nonlocal recognized
+
+        frame = read_frame(
+            cap, frame_number, x1_percent, x2_percent, y1_percent, y2_percent, grab
+        )
+        if frame is None:
+            return None
+
+        timestamp, image = frame
+        signature = None
+        if change_threshold > 0:
+            signature = compute_signature(image, binarization_threshold)
+
+            # the crop of a known frame has the same text
+            for _, _, reference, sub, confidence in references:
+                if signature_difference(signature, reference) < change_threshold:
+                    return frame_number, timestamp, signature, sub, confidence
+
+        if empty_threshold > 0 and is_empty(image, empty_threshold):
+            sub, confidence = "", 0.0
+        else:
+            sub, confidence = recognize(ocr, image, cache, profile, localize)
+            recognized += 1
+            print(f"{timestamp}: {sub}")
+
+        return frame_number, timestamp, signature, sub, confidence
+
+    def search(left: Reading, right: Reading) -> list[Reading]:
+        if right[0] - left[0] <= 1:
+            return []
+
+        middle = read((left[0] + right[0]) // 2, [left, right])
+        if middle is None:
+            return []
+
+        if middle[3] == left[3]:
+            return [middle] + search(middle, right)
+
+        if middle[3] == right[3]:
+            return search(left, middle) + [middle]
+
+        return search(left, middle) + [middle] + search(middle, right)
+
+    try:
+        previous = None
+        for frame_number in range(0, frame_total, capture_rate):
+            current = read(frame_number, [previous] if previous else [], grab=True)
+            if current is None:
+                break
+
+            if previous is not None and previous[3] != current[3]:
+                for _, timestamp, _, sub, confidence in search(previous, current):
+                    yield timestamp, sub, confidence
+
+            yield current[1], current[3], current[4]
+            previous = current
+    finally:
+        cap.release()
+
+    print(f"OCR has recognized {recognized} of {frame_total} frames")
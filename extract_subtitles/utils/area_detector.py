@@ -0,0 +1,158 @@
+""" This module contains functions to find the area of the subtitles on the video frames. """
+
+import math
+import cv2
+import numpy as np
+
+from extract_subtitles.utils.text_filter import CONTRAST_THRESHOLD
+from extract_subtitles.utils.video_converter import count_frames, read_frame
+
+# The number of frames sampled evenly across the video to find the subtitles on
+CALIBRATION_SAMPLES = 300
+
+# The width the frames are downscaled to before their high-contrast pixels are counted
+CALIBRATION_WIDTH = 480
+
+# The fraction of the sampled frames above which a high-contrast pixel belongs to the static graphics
+STATIC_THRESHOLD = 0.9
+
+# The fraction of the text presence of the most frequent row or column above which a row or column
+# is a part of the subtitles
+BAND_THRESHOLD = 0.2
+
+# The margin added to each side of the found area in percentage of the frame size
+AREA_MARGIN = 2
+
+# The area of the subtitles when no text is found: the full width of the bottom 20% of the frame
+DEFAULT_AREA = (0, 100, 80, 100)
+
+
+def __band(profile: np.ndarray, gap: int) -> tuple[int, int] | None:
+    """
+    Finds the band around the maximum of the profile where it stays above BAND_THRESHOLD of the maximum.
+
+    Args:
+        profile (np.ndarray): The text presence of each row or column.
+        gap (int): The number of the rows or columns below the threshold the band can span,
+                   such as the space between two lines.
+
+    Returns:
+        tuple[int, int] | None: The first index and the index after the last one, or None if there is no text.
+    """
+    if profile.max() <= 0:
+        return None
+
+    above = np.flatnonzero(profile > BAND_THRESHOLD * profile.max())
+    peak = int(np.argmax(profile))
+
+    # split the indices above the threshold at the gaps wider than allowed and take the part with the peak
+    parts = np.split(above, np.flatnonzero(np.diff(above) > gap + 1) + 1)
+    for part in parts:
+        if part[0] <= peak <= part[-1]:
+            return int(part[0]), int(part[-1]) + 1
+
+    return None
+
+
+def compute_heatmap(
+    video_file: str, samples: int = CALIBRATION_SAMPLES, width: int = CALIBRATION_WIDTH
+) -> np.ndarray | None:
+    """
+    Computes the fraction of the sampled frames where each pixel is a high-contrast one, such as a text stroke.
+
+    Args:
+        video_file (str): The path to the video file.
+        samples (int, optional): The number of frames sampled evenly across the video. Defaults to 300.
+        width (int, optional): The width the frames are downscaled to. Defaults to 480.
+
+    Returns:
+        np.ndarray | None: The text presence of each pixel of the downscaled frame,
+                           or None if no frame has been read.
+    """
+    frame_total = count_frames(video_file)
+    frame_numbers = np.unique(
+        np.linspace(0, max(frame_total - 1, 0), samples).astype(int)
+    )
+
+    cap = cv2.VideoCapture(video_file)
+    heatmap = None
+    read = 0
+    try:
+        for frame_number in frame_numbers:
+            frame = read_frame(cap, int(frame_number), y1_percent=0)
+            if frame is None:
+                continue
+
+            image = cv2.cvtColor(frame[1], cv2.COLOR_BGR2GRAY)
+            height = max(round(image.shape[0] * width / image.shape[1]), 1)
+            image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+            gradient = cv2.morphologyEx(
+                image, cv2.MORPH_GRADIENT, np.ones((3, 3), np.uint8)
+            )
+
+            if heatmap is None:
+                heatmap = np.zeros(gradient.shape, dtype=np.float64)
+            heatmap += gradient > CONTRAST_THRESHOLD
+            read += 1
+    finally:
+        cap.release()
+
+    return heatmap / read if heatmap is not None else None
+
+
+def find_subtitle_area(heatmap: np.ndarray) -> tuple[int, int, int, int] | None:
+    """
+    Finds the tight rectangle of the subtitles on the text presence heatmap.
+
+    The pixels present on almost every frame belong to the static graphics such as logos and are ignored.
+    The subtitles are the band of rows with the most text presence, and its columns with the text.
+
+    Args:
+        heatmap (np.ndarray): The text presence of each pixel.
+
+    Returns:
+        tuple[int, int, int, int] | None: The percentages of the area: left, right, top and bottom,
+                                          or None if there is no text.
+    """
+    heatmap = np.where(heatmap > STATIC_THRESHOLD, 0, heatmap)
+    height, width = heatmap.shape
+
+    rows = __band(heatmap.sum(axis=1), gap=max(height // 50, 1))
+    if rows is None:
+        return None
+
+    columns = __band(heatmap[rows[0] : rows[1]].sum(axis=0), gap=max(width // 10, 1))
+    if columns is None:
+        return None
+
+    return (
+        max(math.floor(columns[0] * 100 / width) - AREA_MARGIN, 0),
+        min(math.ceil(columns[1] * 100 / width) + AREA_MARGIN, 100),
+        max(math.floor(rows[0] * 100 / height) - AREA_MARGIN, 0),
+        min(math.ceil(rows[1] * 100 / height) + AREA_MARGIN, 100),
+    )
+
+
+def detect_subtitle_area(
+    video_file: str, samples: int = CALIBRATION_SAMPLES
+) -> tuple[int, int, int, int]:
+    """
+    Samples the frames of the video and finds the area of the subtitles on them.
+
+    Args:
+        video_file (str): The path to the video file.
+        samples (int, optional): The number of frames sampled evenly across the video. Defaults to 300.
+
+    Returns:
+        tuple[int, int, int, int]: The percentages of the area: left, right, top and bottom,
+                                   or DEFAULT_AREA if no text has been found.
+    """
+    heatmap = compute_heatmap(video_file, samples)
+    area = find_subtitle_area(heatmap) if heatmap is not None else None
+
+    if area is None:
+        print(f"No subtitles have been found, use the default area {DEFAULT_AREA}")
+        return DEFAULT_AREA
+
+    print(f"Subtitles have been found in the area {area}")
+    return area
@@ -0,0 +1,55 @@
+""" This module contains functions to detect changes between the subtitle crops. """
+
+import cv2
+import numpy as np
+
+# The width of the downscaled crop the signature is computed from
+SIGNATURE_WIDTH = 256
+
+# The brightness above which a pixel of the downscaled crop is considered to be a part of the text
+BINARIZATION_THRESHOLD = 160
+
+# The fraction of the signature pixels that have to differ for the crop to be considered changed
+CHANGE_THRESHOLD = 0.001
+
+
+def compute_signature(
+    image: np.ndarray,
+    binarization_threshold: int = BINARIZATION_THRESHOLD,
+    width: int = SIGNATURE_WIDTH,
+) -> np.ndarray:
+    """
+    Computes the signature of the crop, a downscaled and binarized grayscale copy of the image.
+
+    Args:
+        image (np.ndarray): The crop to compute the signature of.
+        binarization_threshold (int, optional): The brightness above which a pixel is set. Defaults to 160.
+        width (int, optional): The width of the signature. Defaults to 256.
+
+    Returns:
+        np.ndarray: The boolean matrix of the signature.
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    height = max(round(image.shape[0] * width / image.shape[1]), 1)
+    image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+
+    return image > binarization_threshold
+
+
+def signature_difference(signature: np.ndarray, other: np.ndarray) -> float:
+    """
+    Computes the mean absolute difference between two signatures.
+
+    Args:
+        signature (np.ndarray): The first signature.
+        other (np.ndarray): The second signature.
+
+    Returns:
+        float: The fraction of the pixels that differ, or 1.0 if the signatures have different shapes.
+    """
+    if signature.shape != other.shape:
+        return 1.0
+
+    return float(np.count_nonzero(signature != other)) / signature.size
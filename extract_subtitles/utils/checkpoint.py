@@ -0,0 +1,205 @@
+""" This module contains a checkpoint of the subtitle extraction to resume it after a crash. """
+
+from datetime import timedelta
+import collections.abc
+import json
+import os
+import time
+from srt import Subtitle
+
+# The number of seconds between the checkpoints
+CHECKPOINT_INTERVAL = 10
+
+
+class Checkpoint:
+    """
+    The state of the subtitle extraction saved to a JSON file every CHECKPOINT_INTERVAL seconds.
+
+    The state consists of the timestamp of the last processed frame, the text on it with the timestamp it
+    appeared at and its confidence, and the number and size of the subtitles written so far, so the extraction can continue
+    from the next frame and append to the subtitle file.
+    """
+
+    def __init__(
+        self,
+        checkpoint_file: str,
+        subtitle_file: str,
+        options: dict,
+        interval: float = CHECKPOINT_INTERVAL,
+    ) -> None:
+        """
+        Creates an empty checkpoint.
+
+        Args:
+            checkpoint_file (str): The path to the checkpoint file.
+            subtitle_file (str): The path to the subtitle file being written.
+            options (dict): The options of the extraction the state is only valid for.
+            interval (float, optional): The number of seconds between the checkpoints. Defaults to 10.
+        """
+        self.checkpoint_file = checkpoint_file
+        self.subtitle_file = subtitle_file
+        self.options = options
+        self.interval = interval
+        self.timestamp = None
+        self.prev = ""
+        self.start = None
+        self.confidence = 0.0
+        self.count = 0
+        self.saved = time.monotonic()
+
+    def load(self) -> bool:
+        """
+        Restores the state saved in the checkpoint file and cuts the subtitles written after it off the subtitle file.
+
+        Returns:
+            bool: True if the state has been restored, False if the file is missing or made with other options.
+        """
+        if not os.path.isfile(self.checkpoint_file):
+            return False
+
+        with open(self.checkpoint_file, "r", encoding="utf-8") as fp:
+            state = json.load(fp)
+
+        if state["options"] != self.options:
+            return False
+
+        self.timestamp = self.__to_timedelta(state["timestamp"])
+        self.prev = state["prev"]
+        self.start = self.__to_timedelta(state["start"])
+        # the checkpoints saved before the confidence was kept replay the text as the least confident
+        self.confidence = state.get("confidence", 0.0)
+        self.count = state["count"]
+
+        if os.path.isfile(self.subtitle_file):
+            os.truncate(self.subtitle_file, state["size"])
+
+        return True
+
+    def save(self) -> None:
+        """
+        Writes the state to the checkpoint file, replacing it at once so a crash does not leave it half-written.
+        """
+        size = 0
+        if os.path.isfile(self.subtitle_file):
+            size = os.path.getsize(self.subtitle_file)
+
+        state = {
+            "options": self.options,
+            "timestamp": self.__to_seconds(self.timestamp),
+            "prev": self.prev,
+            "start": self.__to_seconds(self.start),
+            "confidence": self.confidence,
+            "count": self.count,
+            "size": size,
+        }
+
+        temporary_file = f"{self.checkpoint_file}.tmp"
+        with open(temporary_file, "w", encoding="utf-8") as fp:
+            json.dump(state, fp, ensure_ascii=False)
+        os.replace(temporary_file, self.checkpoint_file)
+
+        self.saved = time.monotonic()
+
+    def remove(self) -> None:
+        """
+        Removes the checkpoint file once the extraction has finished.
+        """
+        if os.path.isfile(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
+
+    def replay(
+        self, readings: collections.abc.Iterable[tuple[timedelta, str, float]]
+    ) -> collections.abc.Generator[tuple[timedelta, str, float]]:
+        """
+        Yields the text restored from the checkpoint before the readings, so the subtitle on the screen continues
+        instead of starting again.
+
+        The restored text goes before the merging of the readings, so it is merged with the near-identical
+        readings after the resume point like any other.
+
+        Args:
+            readings (collections.abc.Iterable[tuple[timedelta, str, float]]): The timestamps, texts
+                                                                               and confidences of the frames.
+
+        Yields:
+            tuple[timedelta, str, float]: The restored readings and the readings unchanged.
+        """
+        if self.prev != "":
+            yield self.start, self.prev, self.confidence
+            yield self.timestamp, self.prev, self.confidence
+
+        yield from readings
+
+    def track(
+        self, readings: collections.abc.Iterable[tuple[timedelta, str, float]]
+    ) -> collections.abc.Generator[tuple[timedelta, str, float]]:
+        """
+        Records the state of each reading and saves the checkpoint before the first one and periodically.
+
+        The readings held back by the merging have not been tracked yet, so they are read again on resume.
+
+        Args:
+            readings (collections.abc.Iterable[tuple[timedelta, str, float]]): The timestamps, texts
+                                                                               and confidences of the frames.
+
+        Yields:
+            tuple[timedelta, str, float]: The readings unchanged.
+        """
+        # the first subtitle may be written before the interval has passed, and the checkpoint has to exist
+        # by then, so a crash does not leave the partial subtitle file without it
+        self.save()
+
+        for timestamp, sub, confidence in readings:
+            if sub != self.prev:
+                self.start = timestamp if sub != "" else None
+            self.prev = sub
+            self.confidence = confidence
+            self.timestamp = timestamp
+
+            yield timestamp, sub, confidence
+
+            # the subtitles ended by the reading have been written once the next one is requested
+            if time.monotonic() - self.saved >= self.interval:
+                self.save()
+
+    def record(
+        self, subs: collections.abc.Iterable[Subtitle]
+    ) -> collections.abc.Generator[Subtitle]:
+        """
+        Counts the subtitles collected from the tracked readings.
+
+        Args:
+            subs (collections.abc.Iterable[Subtitle]): The subtitles collected from the readings.
+
+        Yields:
+            Subtitle: The subtitles unchanged.
+        """
+        for sub in subs:
+            self.count += 1
+            yield sub
+
+    @staticmethod
+    def __to_seconds(timestamp: timedelta | None) -> float | None:
+        """
+        Converts the timestamp to seconds for JSON.
+
+        Args:
+            timestamp (timedelta | None): The timestamp.
+
+        Returns:
+            float | None: The number of seconds, or None if there is no timestamp.
+        """
+        return None if timestamp is None else timestamp.total_seconds()
+
+    @staticmethod
+    def __to_timedelta(seconds: float | None) -> timedelta | None:
+        """
+        Converts the number of seconds from JSON to the timestamp.
+
+        Args:
+            seconds (float | None): The number of seconds.
+
+        Returns:
+            timedelta | None: The timestamp, or None if there is no timestamp.
+        """
+        return None if seconds is None else timedelta(seconds=seconds)
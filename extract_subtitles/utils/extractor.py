@@ -1,58 +1,383 @@
-import os
-from srt import Subtitle, compose
+""" This module contains functions to recognize the subtitles on the video frames. """
+
 from datetime import timedelta
+import collections.abc
+import time
+import numpy as np
+from srt import Subtitle
 from paddleocr import PaddleOCR
 
+from extract_subtitles.utils.change_detector import (
+    BINARIZATION_THRESHOLD,
+    CHANGE_THRESHOLD,
+    compute_signature,
+    signature_difference,
+)
+from extract_subtitles.utils.checkpoint import Checkpoint
+from extract_subtitles.utils.frames import distribute_frames
+from extract_subtitles.utils.merger import MERGE_THRESHOLD, merge_readings
+from extract_subtitles.utils.ocr_cache import OCRCache
+from extract_subtitles.utils.recognizer import (
+    OCR_PROFILE,
+    LockedOCR,
+    get_ocr,
+    ocr_settings,
+    recognize_batch,
+)
+from extract_subtitles.utils.text_filter import EMPTY_THRESHOLD, is_empty
+
+
+def recognize_frames(
+    frames: collections.abc.Iterable[tuple[timedelta, np.ndarray]],
+    ocr: PaddleOCR,
+    change_threshold: float = CHANGE_THRESHOLD,
+    binarization_threshold: int = BINARIZATION_THRESHOLD,
+    batch_size: int = 1,
+    empty_threshold: float = EMPTY_THRESHOLD,
+    verify_empty: bool = False,
+    cache: OCRCache = None,
+    profile: str = OCR_PROFILE,
+    localize: bool = False,
+) -> collections.abc.Generator[tuple[timedelta, str, float]]:
+    """
+    Recognizes the text on each frame.
+
+    The frames whose crop has not changed since the last recognized one reuse its text instead of running the OCR,
+    and the changed crops that certainly have no text are not recognized at all.
+    The rest are recognized in batches of `batch_size`, so the frames are yielded once their batch is full.
+
+    Args:
+        frames (collections.abc.Iterable[tuple[timedelta, np.ndarray]]): The timestamps and images of the frames.
+        ocr (PaddleOCR): The OCR engine.
+        change_threshold (float, optional): The fraction of the signature pixels that have to differ
+                                            for the frame to be recognized again, 0 to recognize every frame.
+                                            Defaults to 0.001.
+        binarization_threshold (int, optional): The brightness above which a signature pixel is set.
+                                                Defaults to 160.
+        batch_size (int, optional): The number of crops recognized at once. Defaults to 1.
+        empty_threshold (float, optional): The fraction of the high-contrast pixels below which the crop
+                                           is considered empty, 0 to recognize every changed crop.
+                                           Defaults to 0.002.
+        verify_empty (bool, optional): Whether to recognize the empty crops anyway and report how many of them
+                                       have text. Defaults to False.
+        cache (OCRCache, optional): The cache of the recognized lines. Defaults to None.
+        profile (str, optional): The name of the profile in OCR_PROFILES to preprocess the crops with.
+                                 Defaults to "balanced".
+        localize (bool, optional): Whether to locate the lines without the text detector when possible.
+                                   Defaults to False.
+
+    Yields:
+        tuple[timedelta, str, float]: The timestamp of the frame, the recognized text and its confidence.
+    """
+    last_signature = None
+    sub = ""
+    confidence = 0.0
+    # the frames waiting for their batch to be recognized and how to get their text
+    pending = []
+    batch = []
+    recognized = 0
+    skipped = 0
+    filtered = 0
+    missed = 0
+    elapsed = 0.0
+
+    def flush() -> collections.abc.Generator[tuple[timedelta, str, float]]:
+        nonlocal pending, batch, sub, confidence
+        nonlocal recognized, skipped, filtered, missed, elapsed
+
+        started = time.perf_counter()
+        subs = iter(
+            recognize_batch(ocr, batch, cache, profile, localize) if batch else []
+        )
+        elapsed += time.perf_counter() - started
+
+        frames_to_yield, pending, batch = pending, [], []
+        for timestamp, status in frames_to_yield:
+            if status == "unchanged":
+                skipped += 1
+            elif status == "empty":
+                sub, confidence = "", 0.0
+                filtered += 1
+            else:
+                sub, confidence = next(subs)
+                recognized += 1
+                if status == "verify":
+                    filtered += 1
+                    missed += sub != ""
+                print(f"{timestamp}: {sub}")
+
+            yield timestamp, sub, confidence
 
-def extract_subtitle(frames_dir: str, language: str, subtitle_file: str):
-    frame_imgs = os.listdir(frames_dir)
-    frame_imgs.sort()
+    for timestamp, image in frames:
+        signature = None
+        if change_threshold > 0:
+            signature = compute_signature(image, binarization_threshold)
 
-    ocr = PaddleOCR(use_angle_cls=True, lang=language)
+        if (
+            last_signature is not None
+            and signature_difference(signature, last_signature) < change_threshold
+        ):
+            pending.append((timestamp, "unchanged"))
+        elif empty_threshold > 0 and is_empty(image, empty_threshold):
+            if verify_empty:
+                pending.append((timestamp, "verify"))
+                batch.append(image.copy())
+            else:
+                pending.append((timestamp, "empty"))
+            last_signature = signature
+        else:
+            pending.append((timestamp, "recognize"))
+            # the unchanged frames may keep the batch waiting after the decoder has reused the buffer of the image
+            batch.append(image.copy())
+            last_signature = signature
 
-    subs = []
+        if not batch or len(batch) == batch_size:
+            yield from flush()
+
+    yield from flush()
+
+    print(
+        f"OCR has recognized {recognized} frames, skipped {skipped} unchanged frames "
+        f"and {filtered} empty frames"
+    )
+    if verify_empty and filtered > 0:
+        print(
+            f"Text has been found on {missed} of {filtered} empty frames "
+            f"({missed / filtered:.2%} false negative rate)"
+        )
+    if elapsed > 0:
+        print(
+            f"OCR has taken {elapsed:.1f} s, {recognized / elapsed:.1f} frames per second "
+            f"with the batch size of {batch_size}"
+        )
+
+
+def collect_subtitles(
+    readings: collections.abc.Iterable[tuple[timedelta, str, float]],
+    end: timedelta = None,
+) -> collections.abc.Generator[Subtitle]:
+    """
+    Collects the subtitles from the text recognized on the consecutive frames.
+
+    A subtitle starts on the frame where the text appears and ends on the frame where it disappears or changes.
+
+    Args:
+        readings (collections.abc.Iterable[tuple[timedelta, str, float]]): The timestamps, texts and confidences
+                                                                           of the frames.
+        end (timedelta, optional): The timestamp the readings stop at, the end of the subtitle still on the screen
+                                   after the last reading, such as the first frame of the next segment.
+                                   Defaults to the timestamp of the last reading.
+
+    Yields:
+        Subtitle: The subtitles in the order of their appearance.
+    """
     prev = ""
-    for f in frame_imgs:
-        img_path = os.path.join(frames_dir, f)
-        print(img_path)
-        result = ocr.ocr(img_path, cls=True)
-
-        sub = ""
-        start = None
-        end = None
-
-        if result and len(result) > 0 and result[0] is not None:
-            for index in enumerate(result):
-                res = result[index]
-
-                for line in res:
-                    print(line[1][0])
-                    if sub == "":
-                        sub = line[1][0]
-                    else:
-                        sub += f" {line[1][0]}"
-
-        # Get hour, min, second from frame_h:m:s.jpg
-        h = int(f.split("_")[1].split(":")[0])
-        m = int(f.split("_")[1].split(":")[1])
-        s = ".".join(f.split("_")[1].split(":")[2].split(".")[:-1])
-        s = float(f"{s}")
+    start = None
+    timestamp = None
 
+    for timestamp, sub, _ in readings:
         if sub == "" and prev != "":  # end of subtitle
-            end = timedelta(hours=h, minutes=m, seconds=s)
-            subtitle = Subtitle(index=1, start=start, end=end, content=prev)
-            subs.append(subtitle)
+            yield Subtitle(index=1, start=start, end=timestamp, content=prev)
 
         if sub != "" and prev == "":  # start of subtitle
-            start = timedelta(hours=h, minutes=m, seconds=s)
+            start = timestamp
 
         if sub != "" and prev != "" and sub != prev:  # change of subtitle
-            end = timedelta(hours=h, minutes=m, seconds=s)
-            subtitle = Subtitle(index=1, start=start, end=end, content=prev)
-            subs.append(subtitle)
-            start = timedelta(hours=h, minutes=m, seconds=s)
+            yield Subtitle(index=1, start=start, end=timestamp, content=prev)
+            start = timestamp
 
         prev = sub
 
-    with open(subtitle_file, "w", encoding="utf-8") as fp:
-        fp.write(compose(subs))
+    if prev != "":  # the subtitle is still on the screen at the end of the video
+        yield Subtitle(
+            index=1, start=start, end=timestamp if end is None else end, content=prev
+        )
+
+
+def write_subtitles(
+    subs: collections.abc.Iterable[Subtitle],
+    subtitle_file: str,
+    index: int = 1,
+) -> None:
+    """
+    Writes each subtitle to the subtitle file as soon as it is collected.
+
+    The subtitles are numbered in sequence and flushed one by one, so the file can be read while it is written
+    and the subtitles are not kept in memory.
+
+    Args:
+        subs (collections.abc.Iterable[Subtitle]): The subtitles to be written.
+        subtitle_file (str): The path to the output subtitle file.
+        index (int, optional): The number of the first subtitle, the subtitles are appended to the file
+                               if it is greater than 1. Defaults to 1.
+
+    Returns:
+        None
+    """
+    with open(subtitle_file, "a" if index > 1 else "w", encoding="utf-8") as fp:
+        for sub in subs:
+            sub.index = index
+            fp.write(sub.to_srt())
+            fp.flush()
+            index += 1
+
+
+def extract_subtitle(
+    frames: collections.abc.Iterable[tuple[timedelta, np.ndarray]],
+    language: str,
+    subtitle_file: str,
+    change_threshold: float = CHANGE_THRESHOLD,
+    binarization_threshold: int = BINARIZATION_THRESHOLD,
+    batch_size: int = 1,
+    empty_threshold: float = EMPTY_THRESHOLD,
+    verify_empty: bool = False,
+    cache: OCRCache = None,
+    checkpoint: Checkpoint = None,
+    merge_threshold: float = MERGE_THRESHOLD,
+    profile: str = OCR_PROFILE,
+    localize: bool = False,
+    ocr: PaddleOCR = None,
+) -> None:
+    """
+    Extracts the subtitles from the frames and writes them to the subtitle file.
+
+    Args:
+        frames (collections.abc.Iterable[tuple[timedelta, np.ndarray]]): The timestamps and images of the frames.
+        language (str): The language of the subtitles.
+        subtitle_file (str): The path to the output subtitle file.
+        change_threshold (float, optional): The fraction of the signature pixels that have to differ
+                                            for the frame to be recognized again. Defaults to 0.001.
+        binarization_threshold (int, optional): The brightness above which a signature pixel is set.
+                                                Defaults to 160.
+        batch_size (int, optional): The number of crops recognized at once. Defaults to 1.
+        empty_threshold (float, optional): The fraction of the high-contrast pixels below which the crop
+                                           is considered empty. Defaults to 0.002.
+        verify_empty (bool, optional): Whether to recognize the empty crops anyway and report how many of them
+                                       have text. Defaults to False.
+        cache (OCRCache, optional): The cache of the recognized lines. Defaults to None.
+        checkpoint (Checkpoint, optional): The checkpoint to resume from and to save the state to.
+                                           Defaults to None.
+        merge_threshold (float, optional): The similarity above which the neighbouring readings are merged,
+                                           1 to disable merging. Defaults to 0.8.
+        profile (str, optional): The name of the profile in OCR_PROFILES. Defaults to "balanced".
+        localize (bool, optional): Whether to locate the lines without the text detector when possible.
+                                   Defaults to False.
+        ocr (PaddleOCR, optional): The OCR engine, the one of the language if not provided. Defaults to None.
+
+    Returns:
+        None
+    """
+    if ocr is None:
+        ocr = get_ocr(language, batch_size, profile)
+
+    readings = recognize_frames(
+        frames,
+        ocr,
+        change_threshold,
+        binarization_threshold,
+        batch_size,
+        empty_threshold,
+        verify_empty,
+        cache,
+        profile,
+        localize,
+    )
+
+    if checkpoint is None:
+        readings = merge_readings(readings, merge_threshold)
+        write_subtitles(collect_subtitles(readings), subtitle_file)
+        return
+
+    # the text restored on resume is merged with the readings after it, and the merged ones are tracked,
+    # so the state saved is the one of the subtitles collected and written
+    readings = merge_readings(checkpoint.replay(readings), merge_threshold)
+    subs = checkpoint.record(collect_subtitles(checkpoint.track(readings)))
+    write_subtitles(subs, subtitle_file, checkpoint.count + 1)
+
+
+def extract_subtitle_regions(
+    frames: collections.abc.Iterable[tuple[timedelta, dict[str, np.ndarray]]],
+    language: str,
+    subtitle_files: dict[str, str],
+    change_threshold: float = CHANGE_THRESHOLD,
+    binarization_threshold: int = BINARIZATION_THRESHOLD,
+    batch_size: int = 1,
+    empty_threshold: float = EMPTY_THRESHOLD,
+    verify_empty: bool = False,
+    cache_options: dict = None,
+    merge_threshold: float = MERGE_THRESHOLD,
+    profile: str = OCR_PROFILE,
+    localize: bool = False,
+) -> None:
+    """
+    Extracts the subtitles of several regions of the frames and writes each region to its own subtitle file.
+
+    The frames are read once, and each region goes through its own change detection and subtitles
+    in a thread of its own, sharing the OCR engine.
+
+    Args:
+        frames (collections.abc.Iterable[tuple[timedelta, dict[str, np.ndarray]]]): The timestamps of the frames
+                                                                                   and the crops of each region.
+        language (str): The language of the subtitles.
+        subtitle_files (dict[str, str]): The path to the output subtitle file of each region.
+        change_threshold (float, optional): The fraction of the signature pixels that have to differ
+                                            for the frame to be recognized again. Defaults to 0.001.
+        binarization_threshold (int, optional): The brightness above which a signature pixel is set.
+                                                Defaults to 160.
+        batch_size (int, optional): The number of crops recognized at once. Defaults to 1.
+        empty_threshold (float, optional): The fraction of the high-contrast pixels below which the crop
+                                           is considered empty. Defaults to 0.002.
+        verify_empty (bool, optional): Whether to recognize the empty crops anyway and report how many of them
+                                       have text. Defaults to False.
+        cache_options (dict, optional): The keyword arguments of `OCRCache` except for the settings,
+                                        or None not to use the cache. Defaults to None.
+        merge_threshold (float, optional): The similarity above which the neighbouring readings are merged,
+                                           1 to disable merging. Defaults to 0.8.
+        profile (str, optional): The name of the profile in OCR_PROFILES. Defaults to "balanced".
+        localize (bool, optional): Whether to locate the lines without the text detector when possible.
+                                   Defaults to False.
+
+    Returns:
+        None
+    """
+    ocr = LockedOCR(get_ocr(language, batch_size, profile))
+
+    def extract(subtitle_file: str) -> collections.abc.Callable:
+        def consume(
+            region_frames: collections.abc.Iterable[tuple[timedelta, np.ndarray]],
+        ) -> None:
+            # a database connection is used by the thread that has opened it
+            cache = None
+            if cache_options is not None:
+                settings = ocr_settings(language, batch_size, profile, localize)
+                cache = OCRCache(settings=settings, **cache_options)
+
+            try:
+                extract_subtitle(
+                    region_frames,
+                    language,
+                    subtitle_file,
+                    change_threshold,
+                    binarization_threshold,
+                    batch_size,
+                    empty_threshold,
+                    verify_empty,
+                    cache,
+                    merge_threshold=merge_threshold,
+                    profile=profile,
+                    localize=localize,
+                    ocr=ocr,
+                )
+            finally:
+                if cache is not None:
+                    cache.close()
+
+        return consume
+
+    distribute_frames(
+        frames,
+        {
+            name: extract(subtitle_file)
+            for name, subtitle_file in subtitle_files.items()
+        },
+    )
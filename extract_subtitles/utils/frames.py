@@ -0,0 +1,263 @@
+""" This module contains functions to buffer, save and load the sampled video frames. """
+
+from datetime import timedelta
+import collections.abc
+import queue
+import struct
+import threading
+import cv2
+import numpy as np
+
+FRAME_BUFFER_SIZE = 64
+
+# The header of a frame store: the magic, the height, width and channels of the crops (0 for grayscale),
+# the number of crops and the offset of the index
+HEADER = struct.Struct("<8sIIIQQ")
+HEADER_SIZE = 64
+MAGIC = b"VTFRAMES"
+
+# The index entry of a crop: the number of the frame, its PTS in seconds and the offset of the crop
+INDEX_DTYPE = np.dtype([("frame", "<i8"), ("pts", "<f8"), ("offset", "<i8")])
+
+
+def buffer_frames(
+    frames: collections.abc.Iterable[tuple[timedelta, np.ndarray]],
+    size: int = FRAME_BUFFER_SIZE,
+) -> collections.abc.Generator[tuple[timedelta, np.ndarray]]:
+    """
+    Reads the frames in a background thread and yields them through a bounded queue.
+
+    Decoding runs ahead of the consumer by at most `size` frames, so it overlaps with the OCR
+    without keeping the whole video in memory.
+
+    Args:
+        frames (collections.abc.Iterable[tuple[timedelta, np.ndarray]]): The frames to be buffered.
+        size (int, optional): The maximum number of frames waiting in the queue. Defaults to 64.
+
+    Yields:
+        tuple[timedelta, np.ndarray]: The timestamp of the frame and the image.
+    """
+    buffer = queue.Queue(maxsize=size)
+    stopped = threading.Event()
+
+    def put(item: tuple) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def produce() -> None:
+        try:
+            for frame in frames:
+                if not put((True, frame)):
+                    return
+        except Exception as error:
+            put((False, error))
+            return
+
+        put((False, None))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            has_frame, item = buffer.get()
+            if not has_frame:
+                if item is not None:
+                    raise item
+                break
+
+            yield item
+    finally:
+        stopped.set()
+        producer.join()
+
+
+def distribute_frames(
+    frames: collections.abc.Iterable[tuple[timedelta, dict[str, np.ndarray]]],
+    consumers: dict[str, collections.abc.Callable],
+    size: int = FRAME_BUFFER_SIZE,
+) -> None:
+    """
+    Reads the frames once and feeds the crop of each region to its consumer running in a thread of its own.
+
+    Each consumer gets the frames of its region through a bounded queue, so the regions are processed
+    at the same time and the reading runs ahead of the slowest one by at most `size` frames.
+    The first error of a consumer stops the reading and is raised once the other consumers have finished.
+
+    Args:
+        frames (collections.abc.Iterable[tuple[timedelta, dict[str, np.ndarray]]]): The timestamps of the frames
+                                                                                   and the crops of each region.
+        consumers (dict[str, collections.abc.Callable]): The function processing the frames of each region.
+        size (int, optional): The maximum number of frames waiting in the queue of a region. Defaults to 64.
+
+    Returns:
+        None
+    """
+    buffers = {name: queue.Queue(maxsize=size) for name in consumers}
+    errors = []
+
+    def consume(name: str) -> None:
+        finished = False
+
+        def region_frames() -> collections.abc.Generator[tuple[timedelta, np.ndarray]]:
+            nonlocal finished
+            while (item := buffers[name].get()) is not None:
+                yield item
+
+            finished = True
+
+        try:
+            consumers[name](region_frames())
+        except Exception as error:
+            errors.append(error)
+        finally:
+            # keep taking the frames of a consumer that has stopped early, so the reading does not block
+            while not finished and buffers[name].get() is not None:
+                continue
+
+    threads = [
+        threading.Thread(target=consume, args=(name,), daemon=True)
+        for name in consumers
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        for timestamp, crops in frames:
+            if errors:
+                break
+
+            for name, buffer in buffers.items():
+                buffer.put((timestamp, crops[name]))
+    finally:
+        for buffer in buffers.values():
+            buffer.put(None)
+
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+
+
+def save_frames(
+    frames: collections.abc.Iterable[tuple[timedelta, np.ndarray]],
+    frames_file: str,
+    frame_numbers: collections.abc.Iterable[int],
+    grayscale: bool = False,
+) -> collections.abc.Generator[tuple[timedelta, np.ndarray]]:
+    """
+    Saves the frames to a frame store and yields them unchanged.
+
+    The store is a single file with a header, the raw crops one after another and the index of the crops.
+    The store is completed even if the frames stop early, so it holds every frame yielded.
+
+    Args:
+        frames (collections.abc.Iterable[tuple[timedelta, np.ndarray]]): The frames to be saved.
+        frames_file (str): The path to the frame store.
+        frame_numbers (collections.abc.Iterable[int]): The numbers of the decoded frames in the order they are read.
+        grayscale (bool, optional): Whether to save the crops in grayscale. Defaults to False.
+
+    Yields:
+        tuple[timedelta, np.ndarray]: The timestamp of the frame and the image.
+    """
+    shape = None
+    index = []
+
+    with open(frames_file, "wb") as fp:
+        fp.write(bytes(HEADER_SIZE))
+
+        try:
+            for (timestamp, image), frame_number in zip(frames, frame_numbers):
+                crop = image
+                if grayscale and crop.ndim == 3:
+                    crop = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+
+                if shape is None:
+                    shape = crop.shape
+                elif crop.shape != shape:
+                    raise ValueError(
+                        f"Frame {timestamp} has the shape {crop.shape} instead of {shape}"
+                    )
+
+                index.append((frame_number, timestamp.total_seconds(), fp.tell()))
+                fp.write(np.ascontiguousarray(crop, dtype=np.uint8).data)
+
+                yield timestamp, image
+        finally:
+            height, width = shape[:2] if shape is not None else (0, 0)
+            # the grayscale crops have no channel axis
+            channels = shape[2] if shape is not None and len(shape) == 3 else 0
+            index_offset = fp.tell()
+            fp.write(np.array(index, dtype=INDEX_DTYPE).tobytes())
+
+            fp.seek(0)
+            fp.write(
+                HEADER.pack(
+                    MAGIC,
+                    height,
+                    width,
+                    channels,
+                    len(index),
+                    index_offset,
+                )
+            )
+
+    print(f"{len(index)} frames have been saved to {frames_file}")
+
+
+def load_frames(frames_file: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Maps the frame store into memory without reading it.
+
+    Args:
+        frames_file (str): The path to the frame store.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The index with the frame number, PTS in seconds and offset of each crop,
+                                       and the crops, both backed by the file.
+    """
+    with open(frames_file, "rb") as fp:
+        header = fp.read(HEADER.size)
+
+    if len(header) < HEADER.size or header[: len(MAGIC)] != MAGIC:
+        raise ValueError(f"File {frames_file} is not a frame store")
+
+    _, height, width, channels, count, index_offset = HEADER.unpack(header)
+    shape = (count, height, width, channels) if channels else (count, height, width)
+
+    if count == 0:
+        return np.zeros(0, dtype=INDEX_DTYPE), np.zeros(shape, dtype=np.uint8)
+
+    index = np.memmap(
+        frames_file, dtype=INDEX_DTYPE, mode="r", offset=index_offset, shape=(count,)
+    )
+    images = np.memmap(
+        frames_file, dtype=np.uint8, mode="r", offset=HEADER_SIZE, shape=shape
+    )
+
+    return index, images
+
+
+def read_frames_file(
+    frames_file: str,
+) -> collections.abc.Generator[tuple[timedelta, np.ndarray]]:
+    """
+    Yields the frames saved in the frame store in the order they have been saved.
+
+    Args:
+        frames_file (str): The path to the frame store.
+
+    Yields:
+        tuple[timedelta, np.ndarray]: The timestamp of the frame and the image backed by the file.
+    """
+    index, images = load_frames(frames_file)
+
+    for pts, image in zip(index["pts"], images):
+        yield timedelta(seconds=float(pts)), image
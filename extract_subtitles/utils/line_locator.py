@@ -0,0 +1,135 @@
+""" This module contains functions to find the lines of text on the subtitle crops without the text detector. """
+
+import cv2
+import numpy as np
+
+from extract_subtitles.utils.text_filter import CONTRAST_THRESHOLD
+
+# The width of the horizontal kernel joining the strokes of a line in fractions of the crop height
+JOIN_WIDTH = 0.1
+
+# The height of a line in pixels below which the connected strokes are considered noise
+MIN_LINE_HEIGHT = 8
+
+# The fraction of the vertical extent of the smaller of two components they have to share to be on the same line
+LINE_OVERLAP = 0.5
+
+# The number of lines above which the crop is not considered to have subtitles only
+MAX_LINES = 4
+
+# The fraction of the high-contrast pixels of a line above which it is a texture rather than text
+MAX_LINE_FILL = 0.5
+
+# The padding added to each side of a line in fractions of its height
+LINE_PADDING = 0.25
+
+# The fraction of the high-contrast pixels that have to belong to the found lines
+# for the lines to be recognized without the text detector
+LOCATION_THRESHOLD = 0.9
+
+
+def __join_lines(
+    components: list[tuple[int, int, int, int, int]]
+) -> list[tuple[int, int, int, int, int]]:
+    """
+    Joins the components sharing most of their rows into lines.
+
+    Args:
+        components (list[tuple[int, int, int, int, int]]): The left, top, right and bottom of each component
+                                                           and the number of its high-contrast pixels.
+
+    Returns:
+        list[tuple[int, int, int, int, int]]: The same values of each line, sorted from top to bottom.
+    """
+    lines = []
+    for left, top, right, bottom, mass in sorted(
+        components, key=lambda c: (c[1], c[0])
+    ):
+        for index, (l_left, l_top, l_right, l_bottom, l_mass) in enumerate(lines):
+            shared = min(bottom, l_bottom) - max(top, l_top)
+            if shared >= LINE_OVERLAP * min(bottom - top, l_bottom - l_top):
+                lines[index] = (
+                    min(left, l_left),
+                    min(top, l_top),
+                    max(right, l_right),
+                    max(bottom, l_bottom),
+                    mass + l_mass,
+                )
+                break
+        else:
+            lines.append((left, top, right, bottom, mass))
+
+    return sorted(lines, key=lambda line: line[1])
+
+
+def locate_lines(
+    image: np.ndarray,
+) -> tuple[list[tuple[int, int, int, int]], float]:
+    """
+    Finds the boxes of the lines of text on the crop with morphology and connected components.
+
+    The high-contrast pixels are the strokes of the text, joining them horizontally makes each word or line
+    a single component, and the components sharing their rows are a line. The confidence is the fraction of
+    the high-contrast pixels within the found lines, so a crop with a busy background or a text
+    the lines do not describe, such as a single tall character, has a low one.
+
+    Args:
+        image (np.ndarray): The crop, in color or grayscale.
+
+    Returns:
+        tuple[list[tuple[int, int, int, int]], float]: The left, top, right and bottom of each line padded
+                                                      and sorted from top to bottom, and the confidence of
+                                                      the location from 0 to 1, 0 if no line has been found.
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    height, width = image.shape
+
+    gradient = cv2.morphologyEx(image, cv2.MORPH_GRADIENT, np.ones((3, 3), np.uint8))
+    mask = (gradient > CONTRAST_THRESHOLD).astype(np.uint8)
+    total = np.count_nonzero(mask)
+    if total == 0:
+        return [], 0.0
+
+    kernel = np.ones((1, max(round(height * JOIN_WIDTH), 3)), np.uint8)
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(
+        cv2.dilate(mask, kernel), connectivity=8
+    )
+    masses = np.bincount(labels[mask > 0], minlength=count)
+
+    components = [
+        (
+            int(stats[label, cv2.CC_STAT_LEFT]),
+            int(stats[label, cv2.CC_STAT_TOP]),
+            int(stats[label, cv2.CC_STAT_LEFT] + stats[label, cv2.CC_STAT_WIDTH]),
+            int(stats[label, cv2.CC_STAT_TOP] + stats[label, cv2.CC_STAT_HEIGHT]),
+            int(masses[label]),
+        )
+        for label in range(1, count)
+        if stats[label, cv2.CC_STAT_HEIGHT] >= MIN_LINE_HEIGHT
+    ]
+
+    lines = [
+        line
+        for line in __join_lines(components)
+        # a line is wider than tall and has strokes separated by the background,
+        # otherwise it is likely a part of the picture
+        if line[2] - line[0] >= line[3] - line[1]
+        and line[4] <= MAX_LINE_FILL * (line[2] - line[0]) * (line[3] - line[1])
+    ]
+    if not lines or len(lines) > MAX_LINES:
+        return [], 0.0
+
+    boxes = []
+    for left, top, right, bottom, _ in lines:
+        padding = max(round((bottom - top) * LINE_PADDING), 2)
+        boxes.append(
+            (
+                max(left - padding, 0),
+                max(top - padding, 0),
+                min(right + padding, width),
+                min(bottom + padding, height),
+            )
+        )
+
+    return boxes, sum(line[4] for line in lines) / total
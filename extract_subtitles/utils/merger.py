@@ -0,0 +1,112 @@
+""" This module contains functions to merge the near-identical readings of a subtitle. """
+
+from datetime import timedelta
+import collections.abc
+import numpy as np
+
+# The similarity above which the neighbouring readings are the same subtitle recognized with an error,
+# 1 to merge only the identical readings
+MERGE_THRESHOLD = 0.8
+
+
+def edit_distance(a: str, b: str) -> int:
+    """
+    Computes the Levenshtein distance between the strings.
+
+    Each row of the distance matrix is computed at once: the substitutions and deletions come from
+    the previous row, and the insertions are resolved with a running minimum.
+
+    Args:
+        a (str): The first string.
+        b (str): The second string.
+
+    Returns:
+        int: The minimum number of the inserted, deleted and substituted characters.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+
+    if not b:
+        return len(a)
+
+    target = np.array([ord(char) for char in b])
+    columns = np.arange(len(b) + 1)
+
+    row = columns
+    for i, char in enumerate(a, 1):
+        current = np.empty_like(row)
+        current[0] = i
+        current[1:] = np.minimum(row[:-1] + (target != ord(char)), row[1:] + 1)
+        # current[j] = min(current[j], current[j - 1] + 1) for every j
+        row = np.minimum.accumulate(current - columns) + columns
+
+    return int(row[-1])
+
+
+def text_similarity(a: str, b: str) -> float:
+    """
+    Computes the similarity of the strings as the normalized edit distance.
+
+    Args:
+        a (str): The first string.
+        b (str): The second string.
+
+    Returns:
+        float: 1 for the identical strings down to 0 for the completely different ones.
+    """
+    if a == b:
+        return 1.0
+
+    return 1 - edit_distance(a, b) / max(len(a), len(b))
+
+
+def merge_readings(
+    readings: collections.abc.Iterable[tuple[timedelta, str, float]],
+    merge_threshold: float = MERGE_THRESHOLD,
+) -> collections.abc.Generator[tuple[timedelta, str, float]]:
+    """
+    Replaces the text of the neighbouring near-identical readings with the most confident one.
+
+    The readings are held back until their subtitle changes, so each subtitle becomes a single cue
+    instead of being split by the characters the OCR recognizes differently on some frames.
+
+    Args:
+        readings (collections.abc.Iterable[tuple[timedelta, str, float]]): The timestamps, texts and confidences
+                                                                           of the frames.
+        merge_threshold (float, optional): The similarity above which the neighbouring readings are merged,
+                                           1 to disable merging. Defaults to 0.8.
+
+    Yields:
+        tuple[timedelta, str, float]: The readings with the text of their subtitle.
+    """
+    run = []
+    best = ("", 0.0)
+    removed = 0
+
+    def flush() -> collections.abc.Generator[tuple[timedelta, str, float]]:
+        for timestamp in run:
+            yield timestamp, best[0], best[1]
+
+        run.clear()
+
+    prev = ""
+    for timestamp, sub, confidence in readings:
+        if run and sub != "" and text_similarity(sub, best[0]) >= merge_threshold:
+            # the reading would have started another cue
+            removed += sub != prev
+        else:
+            yield from flush()
+            best = (sub, confidence)
+
+        if sub == "":
+            yield timestamp, sub, confidence
+        else:
+            run.append(timestamp)
+            if confidence > best[1]:
+                best = (sub, confidence)
+
+        prev = sub
+
+    yield from flush()
+
+    print(f"Merging the near-identical readings has removed {removed} cues")
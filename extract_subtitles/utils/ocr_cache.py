@@ -0,0 +1,180 @@
+""" This module contains a persistent cache of the text recognized on the subtitle crops. """
+
+import hashlib
+import json
+import sqlite3
+import numpy as np
+
+# The default maximum size of the cached results in bytes
+OCR_CACHE_SIZE = 512 * 1024 * 1024
+
+# The number of changes written to the disk at once
+COMMIT_INTERVAL = 100
+
+# The fraction of the maximum size the cache is shrunk to when it gets full
+EVICTION_TARGET = 0.9
+
+
+class OCRCache:
+    """
+    A size-bounded least recently used cache of the recognized lines, backed by an SQLite database.
+
+    The results are keyed by the hash of the crop's shape and pixels and of the OCR settings, so a crop is
+    recognized once as long as its pixels and the settings are identical, such as on a rerun of the same video
+    or a frame sampled again at another rate. A crop of another subtitle area has other pixels, and the settings
+    differ between the batch size of 1 and the larger ones, so either misses the cache.
+    """
+
+    def __init__(
+        self, cache_file: str, settings: str, max_size: int = OCR_CACHE_SIZE
+    ) -> None:
+        """
+        Opens the cache, creating the database if it does not exist.
+
+        Args:
+            cache_file (str): The path to the database file.
+            settings (str): The language and the settings of the OCR the results depend on.
+            max_size (int, optional): The maximum size of the cached results in bytes. Defaults to 512 MiB.
+        """
+        self.settings = settings.encode("utf-8")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.changes = 0
+
+        self.connection = sqlite3.connect(cache_file, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key BLOB PRIMARY KEY, lines TEXT NOT NULL, size INTEGER NOT NULL, accessed INTEGER NOT NULL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+        )
+        self.connection.commit()
+
+        # the size is tracked in memory, so it is approximate when several processes share the cache
+        self.size = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()[0]
+
+    def key(self, image: np.ndarray) -> bytes:
+        """
+        Computes the key of the crop.
+
+        Args:
+            image (np.ndarray): The crop.
+
+        Returns:
+            bytes: The hash of the crop's shape, pixels and the OCR settings.
+        """
+        digest = hashlib.sha256(self.settings)
+        digest.update(str((image.shape, image.dtype.str)).encode("utf-8"))
+        digest.update(np.ascontiguousarray(image).data)
+
+        return digest.digest()
+
+    def __clock(self) -> int:
+        """
+        Returns the next value of the access clock.
+
+        Returns:
+            int: The value greater than the access time of every result.
+        """
+        row = self.connection.execute("SELECT MAX(accessed) FROM results").fetchone()
+
+        return (row[0] or 0) + 1
+
+    def __changed(self) -> None:
+        """
+        Counts a change and writes the changes to the disk every COMMIT_INTERVAL changes.
+        """
+        self.changes += 1
+        if self.changes % COMMIT_INTERVAL == 0:
+            self.connection.commit()
+
+    def get(self, image: np.ndarray) -> list[tuple[str, float]] | None:
+        """
+        Returns the lines recognized on the crop before.
+
+        Args:
+            image (np.ndarray): The crop.
+
+        Returns:
+            list[tuple[str, float]] | None: The text and the confidence of each line, or None if not cached.
+        """
+        key = self.key(image)
+        row = self.connection.execute(
+            "SELECT lines FROM results WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.connection.execute(
+            "UPDATE results SET accessed = ? WHERE key = ?", (self.__clock(), key)
+        )
+        self.__changed()
+
+        return [(text, confidence) for text, confidence in json.loads(row[0])]
+
+    def put(self, image: np.ndarray, lines: list[tuple[str, float]]) -> None:
+        """
+        Stores the lines recognized on the crop and evicts the least recently used results above the size limit.
+
+        Args:
+            image (np.ndarray): The crop.
+            lines (list[tuple[str, float]]): The text and the confidence of each line.
+        """
+        key = self.key(image)
+        value = json.dumps(lines, ensure_ascii=False)
+        size = len(key) + len(value.encode("utf-8"))
+
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results (key, lines, size, accessed) VALUES (?, ?, ?, ?)",
+            (key, value, size, self.__clock()),
+        )
+        self.__changed()
+
+        self.size += size
+        if self.size > self.max_size:
+            self.__evict(self.size - int(self.max_size * EVICTION_TARGET))
+
+    def __evict(self, excess: int) -> None:
+        """
+        Removes the least recently used results until their size covers the excess.
+
+        Args:
+            excess (int): The number of bytes to be freed.
+        """
+        rows = self.connection.execute(
+            "SELECT key, size FROM results ORDER BY accessed"
+        )
+
+        keys = []
+        for key, size in rows:
+            keys.append((key,))
+            excess -= size
+            self.size -= size
+            if excess <= 0:
+                break
+
+        self.connection.executemany("DELETE FROM results WHERE key = ?", keys)
+        self.connection.commit()
+
+    def close(self) -> None:
+        """
+        Writes the pending changes to the disk and prints the hit and miss statistics.
+        """
+        self.connection.commit()
+        self.connection.close()
+
+        lookups = self.hits + self.misses
+        if lookups > 0:
+            print(
+                f"OCR cache has {self.hits} hits and {self.misses} misses "
+                f"({self.hits / lookups:.2%} hit rate)"
+            )
@@ -0,0 +1,226 @@
+""" This module contains functions to extract subtitles from the segments of a video in parallel. """
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+import collections.abc
+import multiprocessing
+from srt import Subtitle
+
+from extract_subtitles.utils.extractor import (
+    collect_subtitles,
+    recognize_frames,
+    write_subtitles,
+)
+from extract_subtitles.utils.frames import save_frames
+from extract_subtitles.utils.merger import MERGE_THRESHOLD, merge_readings
+from extract_subtitles.utils.ocr_cache import OCRCache
+from extract_subtitles.utils.recognizer import (
+    OCR_PROFILE,
+    get_ocr,
+    ocr_settings,
+)
+from extract_subtitles.utils.video_converter import (
+    count_frames,
+    get_fps,
+    read_frames,
+    sampled_frames,
+)
+
+
+def split_frames(frame_total: int, segments: int) -> list[tuple[int, int]]:
+    """
+    Splits the frames of a video into segments of equal length.
+
+    Args:
+        frame_total (int): The number of frames in the video.
+        segments (int): The number of segments.
+
+    Returns:
+        list[tuple[int, int]]: The numbers of the first frame and the frame after the last one of each segment.
+    """
+    bounds = [frame_total * index // segments for index in range(segments + 1)]
+
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def __extract_segment(
+    video_file: str,
+    segment: tuple[int, int],
+    language: str,
+    read_options: dict,
+    recognition_options: dict,
+    frames_file: str = None,
+    cache_options: dict = None,
+    merge_threshold: float = MERGE_THRESHOLD,
+) -> list[Subtitle]:
+    """
+    Extracts the subtitles from a segment of the video in a worker process.
+
+    Args:
+        video_file (str): The path to the video file.
+        segment (tuple[int, int]): The numbers of the first frame and the frame after the last one.
+        language (str): The language of the subtitles.
+        read_options (dict): The keyword arguments of `read_frames`.
+        recognition_options (dict): The keyword arguments of `recognize_frames`.
+        frames_file (str, optional): The frame store to save the sampled frames to. Defaults to None.
+        cache_options (dict, optional): The keyword arguments of `OCRCache` except for the settings,
+                                        or None not to use the cache. Defaults to None.
+        merge_threshold (float, optional): The similarity above which the neighbouring readings are merged,
+                                           1 to disable merging. Defaults to 0.8.
+
+    Returns:
+        list[Subtitle]: The subtitles of the segment.
+    """
+    batch_size = recognition_options.get("batch_size", 1)
+    profile = recognition_options.get("profile", OCR_PROFILE)
+    ocr = get_ocr(language, batch_size, profile)
+
+    cache = None
+    if cache_options is not None:
+        settings = ocr_settings(
+            language, batch_size, profile, recognition_options.get("localize", False)
+        )
+        cache = OCRCache(settings=settings, **cache_options)
+
+    start_frame, end_frame = segment
+    fps = get_fps(video_file)
+    frames = read_frames(
+        video_file, start_frame=start_frame, end_frame=end_frame, **read_options
+    )
+    if frames_file is not None:
+        # each worker saves its segment to its own store
+        frame_numbers = sampled_frames(
+            video_file, read_options.get("frame_rate", 10), start_frame, end_frame
+        )
+        frames = save_frames(frames, f"{frames_file}.{start_frame}", frame_numbers)
+
+    try:
+        readings = recognize_frames(frames, ocr, cache=cache, **recognition_options)
+        # a subtitle running into the boundary lasts until the first frame of the next segment
+        return list(
+            collect_subtitles(
+                merge_readings(readings, merge_threshold),
+                timedelta(seconds=end_frame / fps),
+            )
+        )
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def stitch_subtitles(
+    segments: collections.abc.Iterable[list[Subtitle]],
+    gap: timedelta,
+) -> collections.abc.Generator[Subtitle]:
+    """
+    Joins the subtitles of the consecutive segments.
+
+    A subtitle cut by the boundary of two segments ends the first segment and starts the second one with
+    the same content, so the two are merged when there is at most `gap` between them.
+
+    Args:
+        segments (collections.abc.Iterable[list[Subtitle]]): The subtitles of each segment in order.
+        gap (timedelta): The maximum time between the parts of a subtitle cut by a boundary.
+
+    Yields:
+        Subtitle: The subtitles of the whole video.
+    """
+    pending = None
+
+    for subs in segments:
+        if not subs:
+            continue
+
+        subs = list(subs)
+        if pending is not None:
+            first = subs[0]
+            if pending.content == first.content and first.start - pending.end <= gap:
+                subs[0] = Subtitle(
+                    index=1, start=pending.start, end=first.end, content=first.content
+                )
+            else:
+                yield pending
+
+        yield from subs[:-1]
+        pending = subs[-1]
+
+    if pending is not None:
+        yield pending
+
+
+def create_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    Creates the pool of the worker processes.
+
+    The workers keep their OCR engines between the tasks, so a pool shared by several videos
+    loads the models once per worker.
+
+    Args:
+        workers (int): The number of worker processes.
+
+    Returns:
+        ProcessPoolExecutor: The pool of the worker processes.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def extract_subtitle_parallel(
+    video_file: str,
+    language: str,
+    subtitle_file: str,
+    workers: int,
+    read_options: dict,
+    recognition_options: dict,
+    frames_file: str = None,
+    cache_options: dict = None,
+    merge_threshold: float = MERGE_THRESHOLD,
+    executor: ProcessPoolExecutor = None,
+) -> None:
+    """
+    Extracts the subtitles from the video by splitting it into one segment per worker process.
+
+    Args:
+        video_file (str): The path to the video file.
+        language (str): The language of the subtitles.
+        subtitle_file (str): The path to the output subtitle file.
+        workers (int): The number of worker processes.
+        read_options (dict): The keyword arguments of `read_frames`.
+        recognition_options (dict): The keyword arguments of `recognize_frames`.
+        frames_file (str, optional): The frame store to save the sampled frames to. Defaults to None.
+        cache_options (dict, optional): The keyword arguments of `OCRCache` except for the settings,
+                                        or None not to use the cache. Defaults to None.
+        merge_threshold (float, optional): The similarity above which the neighbouring readings are merged,
+                                           1 to disable merging. Defaults to 0.8.
+        executor (ProcessPoolExecutor, optional): The pool of `workers` worker processes to be reused,
+                                                  or None to create one for the video. Defaults to None.
+
+    Returns:
+        None
+    """
+    segments = split_frames(count_frames(video_file), workers)
+    gap = timedelta(seconds=1.5 / read_options.get("frame_rate", 10))
+
+    # the pool created for the video is shut down with it
+    pool = None
+    if executor is None:
+        executor = pool = create_executor(workers)
+
+    try:
+        results = executor.map(
+            __extract_segment,
+            [video_file] * len(segments),
+            segments,
+            [language] * len(segments),
+            [read_options] * len(segments),
+            [recognition_options] * len(segments),
+            [frames_file] * len(segments),
+            [cache_options] * len(segments),
+            [merge_threshold] * len(segments),
+        )
+
+        write_subtitles(stitch_subtitles(results, gap), subtitle_file)
+    finally:
+        if pool is not None:
+            pool.shutdown()
@@ -0,0 +1,402 @@
+""" This module contains functions to recognize the text on the subtitle crops. """
+
+import functools
+import threading
+import cv2
+import numpy as np
+from paddleocr import PaddleOCR
+
+from extract_subtitles.utils.line_locator import LOCATION_THRESHOLD, locate_lines
+from extract_subtitles.utils.ocr_cache import OCRCache
+from extract_subtitles.utils.text_filter import estimate_text_height
+
+# The width the crops are downscaled to before being stacked into a mosaic,
+# the side length the detector limits a single crop to by default
+MOSAIC_WIDTH = 960
+
+# The height of the blank rows separating the crops in a mosaic
+MOSAIC_GAP = 16
+
+# The confidence below which PaddleOCR drops a recognized line, the same is used for the located lines
+DROP_SCORE = 0.5
+
+# The trade-offs between the speed and the accuracy of the OCR:
+# whether to classify the angle of the lines, to convert the crops to grayscale or to binarize them,
+# the height of the text the crops are downscaled to (None to keep the crops), the side length the detector
+# limits a crop to and the number of lines recognized at once
+OCR_PROFILES = {
+    "fast": {
+        "use_angle_cls": False,
+        "grayscale": True,
+        "binarize": True,
+        "text_height": 32,
+        "det_limit_side_len": 640,
+        "rec_batch_num": 16,
+    },
+    "balanced": {
+        "use_angle_cls": False,
+        "grayscale": True,
+        "binarize": False,
+        "text_height": 48,
+        "det_limit_side_len": 960,
+        "rec_batch_num": 8,
+    },
+    "accurate": {
+        "use_angle_cls": True,
+        "grayscale": False,
+        "binarize": False,
+        "text_height": None,
+        "det_limit_side_len": 1920,
+        "rec_batch_num": 6,
+    },
+}
+
+OCR_PROFILE = "balanced"
+
+
+def create_ocr(
+    language: str, batch_size: int = 1, profile: str = OCR_PROFILE
+) -> PaddleOCR:
+    """
+    Creates the OCR engine.
+
+    Args:
+        language (str): The language of the subtitles.
+        batch_size (int, optional): The number of crops recognized at once. Defaults to 1.
+        profile (str, optional): The name of the profile in OCR_PROFILES. Defaults to "balanced".
+
+    Returns:
+        PaddleOCR: The OCR engine.
+    """
+    settings = OCR_PROFILES[profile]
+
+    # a mosaic is as wide as a single crop, so let the detector see it at the same scale
+    return PaddleOCR(
+        use_angle_cls=settings["use_angle_cls"],
+        lang=language,
+        det_limit_side_len=settings["det_limit_side_len"] * batch_size,
+        rec_batch_num=settings["rec_batch_num"],
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_ocr(
+    language: str, batch_size: int = 1, profile: str = OCR_PROFILE
+) -> PaddleOCR:
+    """
+    Returns the OCR engine with the settings, creating it once per process.
+
+    Loading the models takes seconds, so the videos processed one after another share the engine.
+
+    Args:
+        language (str): The language of the subtitles.
+        batch_size (int, optional): The number of crops recognized at once. Defaults to 1.
+        profile (str, optional): The name of the profile in OCR_PROFILES. Defaults to "balanced".
+
+    Returns:
+        PaddleOCR: The OCR engine.
+    """
+    return create_ocr(language, batch_size, profile)
+
+
+class LockedOCR:
+    """
+    The OCR engine shared by several threads, which recognizes a single image at a time.
+    """
+
+    def __init__(self, ocr: PaddleOCR) -> None:
+        """
+        Wraps the OCR engine.
+
+        Args:
+            ocr (PaddleOCR): The OCR engine.
+        """
+        self.engine = ocr
+        self.use_angle_cls = ocr.use_angle_cls
+        self.lock = threading.Lock()
+
+    def ocr(self, *args, **kwargs) -> list:
+        """
+        Recognizes the image once no other thread is using the engine.
+
+        Args:
+            *args: The positional arguments of `PaddleOCR.ocr`.
+            **kwargs: The keyword arguments of `PaddleOCR.ocr`.
+
+        Returns:
+            list: The result of `PaddleOCR.ocr`.
+        """
+        with self.lock:
+            return self.engine.ocr(*args, **kwargs)
+
+
+def ocr_settings(
+    language: str,
+    batch_size: int = 1,
+    profile: str = OCR_PROFILE,
+    localize: bool = False,
+) -> str:
+    """
+    Describes the settings of the OCR the recognized text depends on.
+
+    Args:
+        language (str): The language of the subtitles.
+        batch_size (int, optional): The number of crops recognized at once. Defaults to 1.
+        profile (str, optional): The name of the profile in OCR_PROFILES. Defaults to "balanced".
+        localize (bool, optional): Whether the lines are located without the text detector. Defaults to False.
+
+    Returns:
+        str: The description of the settings.
+    """
+    # the crops of a mosaic are downscaled, so they may be recognized differently,
+    # and the located lines may be cut differently than the detected ones
+    return (
+        f"lang={language};mosaic={batch_size > 1};profile={profile};localize={localize}"
+    )
+
+
+def preprocess(image: np.ndarray, profile: str = OCR_PROFILE) -> np.ndarray:
+    """
+    Prepares the crop for the OCR as set by the profile.
+
+    Args:
+        image (np.ndarray): The crop.
+        profile (str, optional): The name of the profile in OCR_PROFILES. Defaults to "balanced".
+
+    Returns:
+        np.ndarray: The crop converted to grayscale or binarized and downscaled to the height of the text.
+    """
+    settings = OCR_PROFILES[profile]
+
+    if settings["text_height"] is not None:
+        height = estimate_text_height(image)
+        if height > settings["text_height"]:
+            scale = settings["text_height"] / height
+            size = (
+                max(round(image.shape[1] * scale), 1),
+                max(round(image.shape[0] * scale), 1),
+            )
+            image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+    if (settings["grayscale"] or settings["binarize"]) and image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    if settings["binarize"]:
+        _, image = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+
+    return image
+
+
+def __read_lines(result: list) -> list[tuple[list, str, float]]:
+    """
+    Reads the boxes, texts and confidences of the lines from the result of the OCR.
+
+    Args:
+        result (list): The result of `PaddleOCR.ocr` for a single image.
+
+    Returns:
+        list[tuple[list, str, float]]: The box, the text and the confidence of each line.
+    """
+    lines = []
+    for res in result or []:
+        if res is None:
+            continue
+
+        for line in res:
+            lines.append((line[0], line[1][0], float(line[1][1])))
+
+    return lines
+
+
+def build_mosaic(images: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Stacks the images on top of each other, separated by blank rows.
+
+    The images wider than MOSAIC_WIDTH are downscaled to it, the narrower ones are padded on the right.
+
+    Args:
+        images (list[np.ndarray]): The images to be stacked.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The mosaic and the row each image starts at.
+    """
+    width = min(max(image.shape[1] for image in images), MOSAIC_WIDTH)
+
+    rows = []
+    offsets = []
+    top = 0
+    for image in images:
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+
+        if image.shape[1] > width:
+            height = max(round(image.shape[0] * width / image.shape[1]), 1)
+            image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+
+        row = np.zeros((image.shape[0] + MOSAIC_GAP, width, 3), dtype=np.uint8)
+        row[: image.shape[0], : image.shape[1]] = image
+        rows.append(row)
+        offsets.append(top)
+        top += row.shape[0]
+
+    return np.concatenate(rows), np.array(offsets)
+
+
+def __recognize_lines(
+    ocr: PaddleOCR, images: list[np.ndarray]
+) -> list[list[tuple[str, float]]]:
+    """
+    Recognizes the lines on several images with a single run of the detector and the recognizer.
+
+    The images are stacked into a mosaic and each recognized line is mapped back to the image
+    containing the center of its box.
+
+    Args:
+        ocr (PaddleOCR): The OCR engine.
+        images (list[np.ndarray]): The images to be recognized.
+
+    Returns:
+        list[list[tuple[str, float]]]: The text and the confidence of each line of each image.
+    """
+    if len(images) == 1:
+        lines = __read_lines(ocr.ocr(images[0], cls=ocr.use_angle_cls))
+        return [[(text, confidence) for _, text, confidence in lines]]
+
+    mosaic, offsets = build_mosaic(images)
+
+    results = [[] for _ in images]
+    for box, text, confidence in __read_lines(ocr.ocr(mosaic, cls=ocr.use_angle_cls)):
+        center = np.mean([point[1] for point in box])
+        results[np.searchsorted(offsets, center, side="right") - 1].append(
+            (text, confidence)
+        )
+
+    return results
+
+
+def __recognize_located(
+    ocr: PaddleOCR, images: list[np.ndarray]
+) -> list[list[tuple[str, float]] | None]:
+    """
+    Recognizes the lines located on several images with a single run of the recognizer, skipping the detector.
+
+    Args:
+        ocr (PaddleOCR): The OCR engine.
+        images (list[np.ndarray]): The images to be recognized.
+
+    Returns:
+        list[list[tuple[str, float]] | None]: The text and the confidence of each line of each image,
+                                              or None for the images whose lines have not been located
+                                              confidently enough and need the detector.
+    """
+    results = [None] * len(images)
+    crops = []
+    owners = []
+    for index, image in enumerate(images):
+        boxes, confidence = locate_lines(image)
+        if confidence < LOCATION_THRESHOLD:
+            continue
+
+        results[index] = []
+        for left, top, right, bottom in boxes:
+            crop = image[top:bottom, left:right]
+            # the recognizer expects color images when given a list of them
+            crops.append(
+                cv2.cvtColor(crop, cv2.COLOR_GRAY2BGR) if crop.ndim == 2 else crop
+            )
+            owners.append(index)
+
+    if crops:
+        recognized = ocr.ocr(crops, det=False, cls=ocr.use_angle_cls)[0]
+        for index, (text, confidence) in zip(owners, recognized):
+            if text.strip() != "" and confidence >= DROP_SCORE:
+                results[index].append((text, float(confidence)))
+
+    return results
+
+
+def recognize_batch(
+    ocr: PaddleOCR,
+    images: list[np.ndarray],
+    cache: OCRCache = None,
+    profile: str = OCR_PROFILE,
+    localize: bool = False,
+) -> list[tuple[str, float]]:
+    """
+    Recognizes the text on several images at once.
+
+    The images found in the cache are not recognized again, and the recognized ones are added to it.
+    When localizing, the lines found with classical image processing are recognized without the detector,
+    and only the images whose lines have not been found confidently are passed to it.
+
+    Args:
+        ocr (PaddleOCR): The OCR engine.
+        images (list[np.ndarray]): The images to be recognized.
+        cache (OCRCache, optional): The cache of the recognized lines. Defaults to None.
+        profile (str, optional): The name of the profile in OCR_PROFILES to preprocess the images with.
+                                 Defaults to "balanced".
+        localize (bool, optional): Whether to locate the lines without the text detector when possible.
+                                   Defaults to False.
+
+    Returns:
+        list[tuple[str, float]]: The recognized lines of each image joined with a space
+                                 and their mean confidence, 0 if there is no text.
+    """
+    results = [None] * len(images)
+    if cache is not None:
+        results = [cache.get(image) for image in images]
+
+    misses = [index for index, lines in enumerate(results) if lines is None]
+    if misses:
+        preprocessed = [preprocess(images[index], profile) for index in misses]
+
+        recognized = [None] * len(misses)
+        if localize:
+            recognized = __recognize_located(ocr, preprocessed)
+
+        unlocated = [index for index, lines in enumerate(recognized) if lines is None]
+        if unlocated:
+            detected = __recognize_lines(
+                ocr, [preprocessed[index] for index in unlocated]
+            )
+            for index, lines in zip(unlocated, detected):
+                recognized[index] = lines
+
+        for index, lines in zip(misses, recognized):
+            results[index] = lines
+            if cache is not None:
+                cache.put(images[index], lines)
+
+    return [
+        (
+            " ".join(text for text, _ in lines),
+            float(np.mean([confidence for _, confidence in lines])) if lines else 0.0,
+        )
+        for lines in results
+    ]
+
+
+def recognize(
+    ocr: PaddleOCR,
+    image: np.ndarray,
+    cache: OCRCache = None,
+    profile: str = OCR_PROFILE,
+    localize: bool = False,
+) -> tuple[str, float]:
+    """
+    Recognizes the text on the image.
+
+    Args:
+        ocr (PaddleOCR): The OCR engine.
+        image (np.ndarray): The image to be recognized.
+        cache (OCRCache, optional): The cache of the recognized lines. Defaults to None.
+        profile (str, optional): The name of the profile in OCR_PROFILES to preprocess the image with.
+                                 Defaults to "balanced".
+        localize (bool, optional): Whether to locate the lines without the text detector when possible.
+                                   Defaults to False.
+
+    Returns:
+        tuple[str, float]: The recognized lines joined with a space, or an empty string if there is no text,
+                           and their mean confidence.
+    """
+    return recognize_batch(ocr, [image], cache, profile, localize)[0]
@@ -0,0 +1,88 @@
+""" This module contains functions to detect the subtitle crops that certainly have no text. """
+
+import cv2
+import numpy as np
+
+# The width of the downscaled crop the text density is computed on
+FILTER_WIDTH = 960
+
+# The brightness difference between the neighbouring pixels of a text stroke and its outline or background
+CONTRAST_THRESHOLD = 96
+
+# The fraction of the high-contrast pixels of a row of the crop above which the crop has text
+TEXT_ROW_THRESHOLD = 0.01
+
+# The fraction of the high-contrast pixels of the row with the most of them above which a row is a part of the text
+TEXT_ROW_FRACTION = 0.1
+
+# The fraction of the high-contrast pixels below which the crop is considered empty,
+# lower values miss less text, but send more empty crops to the OCR
+EMPTY_THRESHOLD = 0.002
+
+
+def text_density(image: np.ndarray, width: int = FILTER_WIDTH) -> float:
+    """
+    Computes the fraction of the high-contrast pixels of the crop.
+
+    Subtitle strokes are sharp and contrast with their outline or background, so a crop with text
+    has many pixels whose 3x3 neighbourhood spans a large brightness range.
+
+    Args:
+        image (np.ndarray): The crop to be checked.
+        width (int, optional): The width the crop is downscaled to when wider. Defaults to 960.
+
+    Returns:
+        float: The fraction of the high-contrast pixels.
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    if image.shape[1] > width:
+        height = max(round(image.shape[0] * width / image.shape[1]), 1)
+        image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+
+    gradient = cv2.morphologyEx(image, cv2.MORPH_GRADIENT, np.ones((3, 3), np.uint8))
+
+    return float(np.count_nonzero(gradient > CONTRAST_THRESHOLD)) / gradient.size
+
+
+def is_empty(image: np.ndarray, empty_threshold: float = EMPTY_THRESHOLD) -> bool:
+    """
+    Checks if the crop certainly has no text.
+
+    Args:
+        image (np.ndarray): The crop to be checked.
+        empty_threshold (float, optional): The fraction of the high-contrast pixels below which the crop is empty.
+                                           Defaults to 0.002.
+
+    Returns:
+        bool: True if the crop has no text, False if it may have some.
+    """
+    return text_density(image) < empty_threshold
+
+
+def estimate_text_height(image: np.ndarray) -> int:
+    """
+    Estimates the height of the text on the crop as the tallest band of rows with the high-contrast pixels.
+
+    Args:
+        image (np.ndarray): The crop to be checked.
+
+    Returns:
+        int: The height of the text in pixels, 0 if the crop has no text.
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    gradient = cv2.morphologyEx(image, cv2.MORPH_GRADIENT, np.ones((3, 3), np.uint8))
+    counts = np.count_nonzero(gradient > CONTRAST_THRESHOLD, axis=1)
+    if counts.max() <= TEXT_ROW_THRESHOLD * image.shape[1]:
+        return 0
+
+    # the rows crossing the strokes of the letters, not only their thin parts
+    rows = counts > TEXT_ROW_FRACTION * counts.max()
+
+    # the lengths of the runs of the text rows
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], rows.astype(np.int8), [0]))))
+
+    return int(np.max(edges[1::2] - edges[::2]))
@@ -1,86 +1,601 @@
-""" This module contains a function to convert a video file into a sequence of images. """
+""" This module contains functions to convert a video file into a sequence of images. """
 
 from datetime import timedelta
+import collections.abc
+import io
 import os
+import subprocess
 import cv2
+import numpy as np
 
+from extract_subtitles.utils.frames import distribute_frames, save_frames
 
-def convert_to_images(
+
+# The ways to sample the frames: decode every frame ("read"), decode only the kept frames ("grab")
+# or seek to each kept frame ("seek"), which is the fastest only for sparse sampling
+SAMPLING_MODES = ("read", "grab", "seek")
+
+# The ways to decode the video: OpenCV decodes the full frames and crops them in Python,
+# ffmpeg samples, crops and converts the frames to grayscale while decoding them
+DECODERS = ("opencv", "ffmpeg")
+
+# The ffmpeg executable
+FFMPEG_BINARY = "ffmpeg"
+
+# The number of buffers the ffmpeg frames are decoded into in turn, each frame stays valid
+# until this many frames have been decoded after it
+FRAME_POOL_SIZE = 128
+
+
+def __crop(
+    frame: np.ndarray,
+    x1_percent: int,
+    x2_percent: int,
+    y1_percent: int,
+    y2_percent: int,
+) -> np.ndarray:
+    """
+    Crops the frame to the given area.
+
+    Args:
+        frame (np.ndarray): The frame to be cropped.
+        x1_percent (int): The percentage of the width to start cropping from (left side).
+        x2_percent (int): The percentage of the width to end cropping at (right side).
+        y1_percent (int): The percentage of the height to start cropping from (top side).
+        y2_percent (int): The percentage of the height to end cropping at (bottom side).
+
+    Returns:
+        np.ndarray: The cropped frame.
+    """
+    # Get the dimensions of the image
+    height, width = frame.shape[:2]
+
+    # Calculate the pixel coordinates
+    x1 = int(width * x1_percent / 100)
+    y1 = int(height * y1_percent / 100)
+    x2 = int(width * x2_percent / 100)
+    y2 = int(height * y2_percent / 100)
+
+    return frame[y1:y2, x1:x2]
+
+
+def __timestamp(cap: cv2.VideoCapture) -> timedelta:
+    """
+    Returns the timestamp of the last decoded frame rounded to hundredths of a second.
+
+    Args:
+        cap (cv2.VideoCapture): The video capture.
+
+    Returns:
+        timedelta: The timestamp of the frame.
+    """
+    timestamp_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+    timestamp_s = round(timestamp_ms / 1000, 2)
+
+    return timedelta(seconds=timestamp_s)
+
+
+def __sample_frames(
+    cap: cv2.VideoCapture,
+    capture_rate: int,
+    sampling: str,
+    start_frame: int,
+    end_frame: int,
+) -> collections.abc.Generator[np.ndarray]:
+    """
+    Yields the frames whose number is a multiple of `capture_rate` between the start and end frames.
+
+    Args:
+        cap (cv2.VideoCapture): The video capture.
+        capture_rate (int): The number of frames between the sampled ones.
+        sampling (str): The sampling mode, one of SAMPLING_MODES.
+        start_frame (int): The number of the first frame to be read.
+        end_frame (int): The number of the frame to stop reading at.
+
+    Yields:
+        np.ndarray: The sampled frames.
+    """
+    # sample the same frames regardless of where the reading starts
+    first_frame = -(-start_frame // capture_rate) * capture_rate
+
+    if sampling == "seek":
+        for frame_number in range(first_frame, end_frame, capture_rate):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+            frame_exists, frame = cap.read()
+            if not frame_exists:
+                break
+
+            yield frame
+
+        return
+
+    if start_frame > 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+    for frame_number in range(start_frame, end_frame):
+        if frame_number % capture_rate == 0:
+            frame_exists, frame = cap.read()
+            if not frame_exists:
+                break
+
+            yield frame
+        elif sampling == "grab":
+            # skip the frame without decoding and converting it
+            if not cap.grab():
+                break
+        else:
+            frame_exists, _ = cap.read()
+            if not frame_exists:
+                break
+
+
+def count_frames(video_file: str) -> int:
+    """
+    Returns the number of frames in the video file as reported by its container.
+
+    Args:
+        video_file (str): The path to the video file.
+
+    Returns:
+        int: The number of frames.
+    """
+    cap = cv2.VideoCapture(video_file)
+    frame_total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    return frame_total
+
+
+def get_fps(video_file: str) -> float:
+    """
+    Returns the frame rate of the video file as reported by its container.
+
+    Args:
+        video_file (str): The path to the video file.
+
+    Returns:
+        float: The number of frames per second.
+    """
+    cap = cv2.VideoCapture(video_file)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    cap.release()
+
+    return fps
+
+
+def find_frame(video_file: str, timestamp: timedelta) -> int:
+    """
+    Returns the number of the frame shown at the timestamp.
+
+    Args:
+        video_file (str): The path to the video file.
+        timestamp (timedelta): The timestamp of the frame.
+
+    Returns:
+        int: The number of the frame.
+    """
+    return round(timestamp.total_seconds() * get_fps(video_file))
+
+
+def sampled_frames(
     video_file: str,
-    image_directory: str = None,
     frame_rate: int = 10,
+    start_frame: int = 0,
+    end_frame: int = None,
+) -> range:
+    """
+    Returns the numbers of the frames sampled at the given frame rate, in the order they are read.
+
+    Args:
+        video_file (str): The path to the video file.
+        frame_rate (int, optional): The desired frame rate for the extracted images. Defaults to 10.
+        start_frame (int, optional): The number of the first frame to be read. Defaults to 0.
+        end_frame (int, optional): The number of the frame to stop reading at.
+                                   If not provided, the video is read to the end. Defaults to None.
+
+    Returns:
+        range: The numbers of the sampled frames.
+    """
+    cap = cv2.VideoCapture(video_file)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    if end_frame is None:
+        end_frame = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    capture_rate = max(round(fps / frame_rate), 1)
+    # sample the same frames regardless of where the reading starts
+    first_frame = -(-start_frame // capture_rate) * capture_rate
+
+    return range(first_frame, end_frame, capture_rate)
+
+
+def read_frame(
+    cap: cv2.VideoCapture,
+    frame_number: int,
     x1_percent: int = 0,
     x2_percent: int = 100,
     y1_percent: int = 80,
     y2_percent: int = 100,
-) -> None:
+    grab: bool = False,
+) -> tuple[timedelta, np.ndarray] | None:
     """
-    Convert a video file into a sequence of images.
+    Seeks to the given frame of the video and reads it.
 
     Args:
-        video_file (str): The path to the video file.
-        image_directory (str, optional): The directory to save the extracted images.
-                                         If not provided, a directory with the name of the video file will be created.
-                                         Defaults to None.
-        frame_rate (int, optional): The desired frame rate for the extracted images. Defaults to 10.
+        cap (cv2.VideoCapture): The video capture.
+        frame_number (int): The number of the frame to be read.
         x1_percent (int, optional): The percentage of the width to start cropping from (left side). Defaults to 0.
         x2_percent (int, optional): The percentage of the width to end cropping at (right side). Defaults to 100.
         y1_percent (int, optional): The percentage of the height to start cropping from (top side). Defaults to 80.
         y2_percent (int, optional): The percentage of the height to end cropping at (bottom side). Defaults to 100.
+        grab (bool, optional): Whether to grab the frames up to the given one instead of seeking to it
+                               when it is ahead of the capture. Defaults to False.
 
     Returns:
-        None
+        tuple[timedelta, np.ndarray] | None: The timestamp of the frame and the cropped image,
+                                             or None if the frame does not exist.
+    """
+    position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+    if grab and position <= frame_number:
+        # skip the frames in between without decoding them, instead of seeking from the keyframe
+        for _ in range(frame_number - position):
+            if not cap.grab():
+                return None
+    else:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+
+    frame_exists, frame = cap.read()
+    if not frame_exists:
+        return None
+
+    return __timestamp(cap), __crop(
+        frame, x1_percent, x2_percent, y1_percent, y2_percent
+    )
+
+
+def __read_into(stream: io.BufferedReader, buffer: np.ndarray) -> bool:
+    """
+    Fills the buffer with the bytes read from the stream.
+
+    Args:
+        stream (io.BufferedReader): The stream to read from.
+        buffer (np.ndarray): The contiguous buffer to be filled.
+
+    Returns:
+        bool: True if the buffer has been filled, False if the stream has ended before.
+    """
+    view = memoryview(buffer).cast("B")
+    while view:
+        count = stream.readinto(view)
+        if not count:
+            return False
+
+        view = view[count:]
+
+    return True
+
+
+def __decode_opencv(
+    video_file: str,
+    capture_rate: int,
+    area: tuple[int, int, int, int],
+    sampling: str,
+    start_frame: int,
+    end_frame: int,
+    pool_size: int,
+) -> collections.abc.Generator[tuple[timedelta, np.ndarray]]:
+    """
+    Decodes the full frames with OpenCV and crops them.
+
+    Args:
+        video_file (str): The path to the video file.
+        capture_rate (int): The number of frames between the sampled ones.
+        area (tuple[int, int, int, int]): The percentages of the crop: left, right, top and bottom.
+        sampling (str): The sampling mode, one of SAMPLING_MODES.
+        start_frame (int): The number of the first frame to be read.
+        end_frame (int): The number of the frame to stop reading at.
+        pool_size (int): Unused, each frame is decoded into a new buffer.
+
+    Yields:
+        tuple[timedelta, np.ndarray]: The timestamp of the frame and the cropped image.
+    """
+    cap = cv2.VideoCapture(video_file)
+
+    try:
+        for frame in __sample_frames(
+            cap, capture_rate, sampling, start_frame, end_frame
+        ):
+            yield __timestamp(cap), __crop(frame, *area)
+    finally:
+        cap.release()
+
+
+def __decode_ffmpeg(
+    video_file: str,
+    capture_rate: int,
+    area: tuple[int, int, int, int],
+    sampling: str,
+    start_frame: int,
+    end_frame: int,
+    pool_size: int,
+) -> collections.abc.Generator[tuple[timedelta, np.ndarray]]:
+    """
+    Decodes the sampled frames with ffmpeg, which crops them and converts them to grayscale.
+
+    The raw frames are piped into a pool of buffers reused in turn, so no frame is copied in Python.
+
+    Args:
+        video_file (str): The path to the video file.
+        capture_rate (int): The number of frames between the sampled ones.
+        area (tuple[int, int, int, int]): The percentages of the crop: left, right, top and bottom.
+        sampling (str): Unused, ffmpeg drops the skipped frames right after decoding them.
+        start_frame (int): The number of the first frame to be read.
+        end_frame (int): The number of the frame to stop reading at.
+        pool_size (int): The number of the buffers the frames are decoded into in turn.
+
+    Yields:
+        tuple[timedelta, np.ndarray]: The timestamp of the frame and the cropped grayscale image.
     """
     cap = cv2.VideoCapture(video_file)
     fps = cap.get(cv2.CAP_PROP_FPS)
-    capture_rate = max(round(fps / frame_rate), 1)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    cap.release()
+
+    # the same pixels as cropped from the OpenCV frames
+    x1_percent, x2_percent, y1_percent, y2_percent = area
+    x1, x2 = int(width * x1_percent / 100), int(width * x2_percent / 100)
+    y1, y2 = int(height * y1_percent / 100), int(height * y2_percent / 100)
+
+    # sample the same frames as OpenCV regardless of where the reading starts
+    first_frame = -(-start_frame // capture_rate) * capture_rate
+    frame_numbers = range(first_frame, end_frame, capture_rate)
+    if not frame_numbers or x2 <= x1 or y2 <= y1:
+        return
+
+    command = [FFMPEG_BINARY, "-v", "error", "-nostdin"]
+    if first_frame > 0:
+        command += ["-ss", f"{first_frame / fps:.6f}"]
+    command += [
+        "-i",
+        video_file,
+        "-vf",
+        f"select=not(mod(n\\,{capture_rate})),crop={x2 - x1}:{y2 - y1}:{x1}:{y1},format=gray",
+        "-fps_mode",
+        "passthrough",
+        "-frames:v",
+        str(len(frame_numbers)),
+        "-f",
+        "rawvideo",
+        "-pix_fmt",
+        "gray",
+        "-",
+    ]
+
+    pool = np.empty((pool_size, y2 - y1, x2 - x1), dtype=np.uint8)
+    with subprocess.Popen(
+        command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    ) as process:
+        stopped = True
+        try:
+            for index, frame_number in enumerate(frame_numbers):
+                buffer = pool[index % pool_size]
+                if not __read_into(process.stdout, buffer):
+                    break
+
+                yield timedelta(seconds=round(frame_number / fps, 2)), buffer
+
+            stopped = False
+        finally:
+            # the consumer has stopped early, so ffmpeg is killed instead of decoding the rest of the frames
+            if stopped:
+                process.stdout.close()
+                process.kill()
+
+        # ffmpeg exits by itself once it has written the last frame or failed
+        error = process.stderr.read().decode("utf-8", errors="replace")
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg has failed to decode {video_file}: {error}")
+
+
+def read_frames(
+    video_file: str,
+    frame_rate: int = 10,
+    x1_percent: int = 0,
+    x2_percent: int = 100,
+    y1_percent: int = 80,
+    y2_percent: int = 100,
+    sampling: str = "grab",
+    start_frame: int = 0,
+    end_frame: int = None,
+    decoder: str = "opencv",
+    pool_size: int = FRAME_POOL_SIZE,
+) -> collections.abc.Generator[tuple[timedelta, np.ndarray]]:
+    """
+    Read a video file and yield the cropped frames sampled at the given frame rate.
+
+    Args:
+        video_file (str): The path to the video file.
+        frame_rate (int, optional): The desired frame rate for the extracted images. Defaults to 10.
+        x1_percent (int, optional): The percentage of the width to start cropping from (left side). Defaults to 0.
+        x2_percent (int, optional): The percentage of the width to end cropping at (right side). Defaults to 100.
+        y1_percent (int, optional): The percentage of the height to start cropping from (top side). Defaults to 80.
+        y2_percent (int, optional): The percentage of the height to end cropping at (bottom side). Defaults to 100.
+        sampling (str, optional): The sampling mode of OpenCV, one of SAMPLING_MODES. Defaults to "grab".
+        start_frame (int, optional): The number of the first frame to be read. Defaults to 0.
+        end_frame (int, optional): The number of the frame to stop reading at.
+                                   If not provided, the video is read to the end. Defaults to None.
+        decoder (str, optional): The decoder, one of DECODERS. Defaults to "opencv".
+        pool_size (int, optional): The number of the frames ffmpeg decodes before reusing the buffer of a frame,
+                                   more than the frames kept by the consumer at once. Defaults to 128.
+
+    Yields:
+        tuple[timedelta, np.ndarray]: The timestamp of the frame and the cropped image.
+    """
+    frame_numbers = sampled_frames(video_file, frame_rate, start_frame, end_frame)
+    capture_rate = frame_numbers.step
     print(
         f"Capture the image every {capture_rate} frames to have {frame_rate} images per second."
     )
 
-    frame_count = 0
-    image_count = 0
-    # Get the video file's name without extension
-    video_name = os.path.splitext(os.path.basename(video_file))[0]
-
-    # Create an output folder with a name corresponding to the video
-    if image_directory is None:
-        image_directory = f"{video_name}_frames"
-    os.makedirs(image_directory, exist_ok=True)
-
-    while cap.isOpened():
-        frame_exists, frame = cap.read()
-        if frame_exists:
-            if frame_count % capture_rate == 0:
-                timestamp_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
-                timestamp_s = round(timestamp_ms / 1000, 2)
-                timestamp = timedelta(seconds=timestamp_s)
-
-                output_file = f"{image_directory}/frame_{timestamp}.jpg"
-
-                # Get the dimensions of the image
-                height, width = frame.shape[:2]
-
-                # Calculate the pixel coordinates
-                x1 = int(width * x1_percent / 100)
-                y1 = int(height * y1_percent / 100)
-                x2 = int(width * x2_percent / 100)
-                y2 = int(height * y2_percent / 100)
-
-                # Crop the image
-                frame = frame[y1:y2, x1:x2]
-
-                cv2.imwrite(output_file, frame)
-                image_count += 1
-                print(
-                    f"Frame {frame_count} has been extracted and saved as {output_file}"
-                )
-                print(f"for frame : {frame_count}, timestamp is: {timestamp}")
-        else:
-            break
-        frame_count += 1
+    decode = __decode_ffmpeg if decoder == "ffmpeg" else __decode_opencv
+    yield from decode(
+        video_file,
+        capture_rate,
+        (x1_percent, x2_percent, y1_percent, y2_percent),
+        sampling,
+        start_frame,
+        frame_numbers.stop,
+        pool_size,
+    )
+
 
+def read_regions(
+    video_file: str,
+    regions: dict[str, tuple[int, int, int, int]],
+    frame_rate: int = 10,
+    sampling: str = "grab",
+    start_frame: int = 0,
+    end_frame: int = None,
+    decoder: str = "opencv",
+    pool_size: int = FRAME_POOL_SIZE,
+) -> collections.abc.Generator[tuple[timedelta, dict[str, np.ndarray]]]:
+    """
+    Read a video file once and yield the crop of each region of the frames sampled at the given frame rate.
+
+    The frames are cropped to the smallest area covering every region, and each region is a view of that crop
+    with the same pixels as if the frame had been cropped to the region alone.
+
+    Args:
+        video_file (str): The path to the video file.
+        regions (dict[str, tuple[int, int, int, int]]): The percentages of the area of each region:
+                                                        left, right, top and bottom.
+        frame_rate (int, optional): The desired frame rate for the extracted images. Defaults to 10.
+        sampling (str, optional): The sampling mode of OpenCV, one of SAMPLING_MODES. Defaults to "grab".
+        start_frame (int, optional): The number of the first frame to be read. Defaults to 0.
+        end_frame (int, optional): The number of the frame to stop reading at.
+                                   If not provided, the video is read to the end. Defaults to None.
+        decoder (str, optional): The decoder, one of DECODERS. Defaults to "opencv".
+        pool_size (int, optional): The number of the frames ffmpeg decodes before reusing the buffer of a frame,
+                                   more than the frames kept by the consumers at once. Defaults to 128.
+
+    Yields:
+        tuple[timedelta, dict[str, np.ndarray]]: The timestamp of the frame and the crop of each region.
+    """
+    cap = cv2.VideoCapture(video_file)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
     cap.release()
-    cv2.destroyAllWindows()
 
-    return
+    areas = regions.values()
+    union = (
+        min(area[0] for area in areas),
+        max(area[1] for area in areas),
+        min(area[2] for area in areas),
+        max(area[3] for area in areas),
+    )
+
+    # the pixels of each region relative to the top left corner of the union
+    left = int(width * union[0] / 100)
+    top = int(height * union[2] / 100)
+    bounds = {
+        name: (
+            int(width * x1_percent / 100) - left,
+            int(width * x2_percent / 100) - left,
+            int(height * y1_percent / 100) - top,
+            int(height * y2_percent / 100) - top,
+        )
+        for name, (x1_percent, x2_percent, y1_percent, y2_percent) in regions.items()
+    }
+
+    for timestamp, image in read_frames(
+        video_file,
+        frame_rate,
+        *union,
+        sampling,
+        start_frame,
+        end_frame,
+        decoder,
+        pool_size,
+    ):
+        yield timestamp, {
+            name: image[y1:y2, x1:x2] for name, (x1, x2, y1, y2) in bounds.items()
+        }
+
+
+def convert_to_frames(
+    video_file: str,
+    frames_file: str = None,
+    frame_rate: int = 10,
+    x1_percent: int = 0,
+    x2_percent: int = 100,
+    y1_percent: int = 80,
+    y2_percent: int = 100,
+    sampling: str = "grab",
+    grayscale: bool = False,
+    decoder: str = "opencv",
+    regions: dict[str, tuple[int, int, int, int]] = None,
+) -> None:
+    """
+    Convert a video file into a frame store of the cropped frames.
+
+    With several regions, the video is decoded once and each region is saved to a frame store of its own
+    named after it.
+
+    Args:
+        video_file (str): The path to the video file.
+        frames_file (str, optional): The path to the frame store.
+                                     If not provided, a file with the name of the video file will be created.
+                                     Defaults to None.
+        frame_rate (int, optional): The desired frame rate for the extracted images. Defaults to 10.
+        x1_percent (int, optional): The percentage of the width to start cropping from (left side). Defaults to 0.
+        x2_percent (int, optional): The percentage of the width to end cropping at (right side). Defaults to 100.
+        y1_percent (int, optional): The percentage of the height to start cropping from (top side). Defaults to 80.
+        y2_percent (int, optional): The percentage of the height to end cropping at (bottom side). Defaults to 100.
+        sampling (str, optional): The sampling mode, one of SAMPLING_MODES. Defaults to "grab".
+        grayscale (bool, optional): Whether to save the crops in grayscale. Defaults to False.
+        decoder (str, optional): The decoder, one of DECODERS. Defaults to "opencv".
+        regions (dict[str, tuple[int, int, int, int]], optional): The percentages of the area of each region
+                                                                  (left, right, top and bottom) to be saved
+                                                                  to `{frames_file}.{name}` instead of the area
+                                                                  given by the percentages. Defaults to None.
+
+    Returns:
+        None
+    """
+    # Create an output file with a name corresponding to the video
+    if frames_file is None:
+        video_name = os.path.splitext(os.path.basename(video_file))[0]
+        frames_file = f"{video_name}.frames"
+
+    frame_numbers = sampled_frames(video_file, frame_rate)
+
+    if regions is not None:
+
+        def save(name: str) -> collections.abc.Callable:
+            def consume(frames: collections.abc.Iterable) -> None:
+                for _ in save_frames(
+                    frames, f"{frames_file}.{name}", frame_numbers, grayscale
+                ):
+                    pass
+
+            return consume
+
+        distribute_frames(
+            read_regions(video_file, regions, frame_rate, sampling, decoder=decoder),
+            {name: save(name) for name in regions},
+        )
+        return
+
+    frames = read_frames(
+        video_file,
+        frame_rate,
+        x1_percent,
+        x2_percent,
+        y1_percent,
+        y2_percent,
+        sampling,
+        decoder=decoder,
+    )
+    for _ in save_frames(frames, frames_file, frame_numbers, grayscale):
+        pass
@@ -0,0 +1,154 @@
+""" This module contains a local stand-in of the translation service compatible with the OpenAI API. """
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import collections
+import json
+import threading
+import time
+
+from translate_subtitles.utils.backends import MockBackend
+
+
+class StandInService:
+    """
+    The service that answers the chat completions on a local port the way the OpenAI API does,
+    filling the translated column of the table with the original sentences.
+
+    The next requests can be answered with the errors and delays put into `responses`,
+    and the connections the requests have come on are counted to see them reused.
+    """
+
+    def __init__(self) -> None:
+        """
+        Sets up the service without starting it.
+        """
+        # the status, headers and delay of the next responses, the completion once they run out
+        self.responses = collections.deque()
+        self.requests = 0
+        self.connections = set()
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.__handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        """
+        Returns the URL of the service.
+
+        Returns:
+            str: The URL the client sends the requests to.
+        """
+        host, port = self.server.server_address[:2]
+
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self) -> "StandInService":
+        """
+        Starts the service.
+
+        Returns:
+            StandInService: The service.
+        """
+        self.thread.start()
+
+        return self
+
+    def __exit__(self, *_) -> None:
+        """
+        Stops the service.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def __respond(self, body: dict, client: tuple) -> tuple[int, dict, float, dict]:
+        """
+        Answers the request with the next response put into `responses`, or with the completion.
+
+        Args:
+            body (dict): The request of the chat completion.
+            client (tuple): The address of the connection the request has come on.
+
+        Returns:
+            tuple[int, dict, float, dict]: The status, the headers, the delay and the body of the response.
+        """
+        with self.lock:
+            self.requests += 1
+            self.connections.add(client)
+            if self.responses:
+                status, headers, delay = self.responses.popleft()
+                return (
+                    status,
+                    headers,
+                    delay,
+                    {"error": {"message": f"Status {status}"}},
+                )
+
+        messages = {message["role"]: message["content"] for message in body["messages"]}
+        content = MockBackend().complete(messages["system"], messages["user"])
+
+        return (
+            200,
+            {},
+            0.0,
+            {
+                "id": f"chatcmpl-{self.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+            },
+        )
+
+    def __handler(self) -> type[BaseHTTPRequestHandler]:
+        """
+        Creates the handler of the requests to the service.
+
+        Returns:
+            type[BaseHTTPRequestHandler]: The handler class.
+        """
+        respond = self.__respond
+
+        class Handler(BaseHTTPRequestHandler):
+            """
+            The handler of the chat completions, keeping the connections open between the requests.
+            """
+
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:
+                """
+                Answers the chat completion.
+                """
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length))
+                status, headers, delay, response = respond(body, self.client_address)
+                if delay > 0:
+                    time.sleep(delay)
+
+                content = json.dumps(response).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(content)))
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    self.wfile.write(content)
+                except (BrokenPipeError, ConnectionResetError):
+                    # the client has given up waiting for the delayed response
+                    self.close_connection = True
+
+            def log_message(self, *_) -> None:
+                """
+                Keeps the requests out of the test output.
+                """
+
+        return Handler
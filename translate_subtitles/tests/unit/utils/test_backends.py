@@ -0,0 +1,207 @@
+""" Test the backends module. """
+
+from unittest import mock
+
+import os
+import unittest
+import httpx
+import openai
+
+from translate_subtitles.tests.stand_in_service import StandInService
+from translate_subtitles.utils.backends import (
+    CLIENT_RETRIES,
+    MockBackend,
+    OpenAIBackend,
+    RateLimitExceeded,
+    ServiceUnavailable,
+    TranslationBackend,
+    get_backend,
+)
+from translate_subtitles.utils.translator import translate_string
+from translate_subtitles.utils.validator import parse_translation
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestBackends(unittest.TestCase):
+    """
+    Unit test suite for the backends module.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up the test case by initializing the table to be translated.
+        """
+        self.table = (
+            "| Original | Translated |\n| --- | --- |\n"
+            "| ::0:: Hello |     |\n"
+            "| ::1:: World |     |"
+        )
+
+    def test_mock_backend(self) -> None:
+        """
+        Test the mock backend copies the original sentences to a valid translation.
+        """
+        backend = MockBackend()
+
+        translation = translate_string(self.table, "en", "en", backend)
+
+        self.assertDictEqual(
+            {0: "Hello", 1: "World"}, parse_translation(translation, {0, 1})
+        )
+        self.assertIn("| ::1:: World | ::1:: World |", translation)
+        self.assertEqual(1, backend.calls)
+
+    @mock.patch.dict(os.environ, {"OPENAI_API_KEY": "key"})
+    def test_openai_backend(self) -> None:
+        """
+        Test the OpenAI backend connects to the given service and completes the prompt with its client.
+        """
+        backend = OpenAIBackend("http://localhost:8000/v1", timeout=5, keep_alive=30)
+        self.assertEqual("http://localhost:8000/v1/", str(backend.client.base_url))
+        self.assertEqual(5, backend.client.timeout.read)
+
+        completion = mock.Mock()
+        completion.choices = [mock.Mock()]
+        completion.choices[0].message.content = "translated"
+        with mock.patch.object(
+            backend.client.chat.completions, "create", return_value=completion
+        ) as create:
+            self.assertEqual("translated", backend.complete("prompt", self.table))
+
+        create.assert_called_once()
+        messages = create.call_args.kwargs["messages"]
+        self.assertEqual("prompt", messages[0]["content"])
+        self.assertEqual(self.table, messages[1]["content"])
+
+    @mock.patch.dict(os.environ, {"OPENAI_API_KEY": "key"})
+    def test_openai_backend_errors(self) -> None:
+        """
+        Test the OpenAI backend raises the rejected and failed requests to be repeated.
+        """
+        self.assertEqual(CLIENT_RETRIES, OpenAIBackend().client.max_retries)
+        backend = OpenAIBackend(max_retries=0)
+        self.assertEqual(0, backend.client.max_retries)
+
+        request = httpx.Request("POST", "http://localhost/v1/chat/completions")
+        errors = [
+            openai.RateLimitError(
+                "Too many requests",
+                response=httpx.Response(
+                    429, headers={"retry-after-ms": "1500"}, request=request
+                ),
+                body=None,
+            ),
+            openai.RateLimitError(
+                "Too many requests",
+                response=httpx.Response(
+                    429, headers={"retry-after": "3"}, request=request
+                ),
+                body=None,
+            ),
+            openai.APIConnectionError(request=request),
+        ]
+
+        with mock.patch.object(
+            backend.client.chat.completions, "create", side_effect=errors
+        ):
+            with self.assertRaises(RateLimitExceeded) as context:
+                backend.complete("prompt", self.table)
+            self.assertEqual(1.5, context.exception.retry_after)
+
+            with self.assertRaises(RateLimitExceeded) as context:
+                backend.complete("prompt", self.table)
+            self.assertEqual(3.0, context.exception.retry_after)
+
+            with self.assertRaises(ServiceUnavailable) as context:
+                backend.complete("prompt", self.table)
+            self.assertIsNone(context.exception.retry_after)
+
+    @mock.patch.dict(os.environ, {"OPENAI_API_KEY": "key"})
+    def test_openai_backend_service(self) -> None:
+        """
+        Test the OpenAI backend translates through a local service, reusing the connection for every request.
+        """
+        with StandInService() as service:
+            backend = OpenAIBackend(service.base_url, max_retries=0)
+
+            for _ in range(3):
+                translation = translate_string(self.table, "en", "en", backend)
+                self.assertDictEqual(
+                    {0: "Hello", 1: "World"}, parse_translation(translation, {0, 1})
+                )
+
+        self.assertEqual(3, service.requests)
+        self.assertEqual(1, len(service.connections))
+
+    @mock.patch.dict(os.environ, {"OPENAI_API_KEY": "key"})
+    def test_openai_backend_service_errors(self) -> None:
+        """
+        Test the OpenAI backend without retries raises the rejected, failed and timed out requests of a local service.
+        """
+        with StandInService() as service:
+            backend = OpenAIBackend(service.base_url, timeout=0.2, max_retries=0)
+            service.responses.extend(
+                [
+                    (429, {"retry-after-ms": "1500"}, 0.0),
+                    (503, {}, 0.0),
+                    (200, {}, 1.0),
+                ]
+            )
+
+            with self.assertRaises(RateLimitExceeded) as context:
+                backend.complete("prompt", self.table)
+            self.assertEqual(1.5, context.exception.retry_after)
+
+            with self.assertRaises(ServiceUnavailable):
+                backend.complete("prompt", self.table)
+
+            with self.assertRaises(ServiceUnavailable):
+                backend.complete("prompt", self.table)
+
+        self.assertEqual(3, service.requests)
+
+    @mock.patch.dict(os.environ, {"OPENAI_API_KEY": "key"})
+    def test_openai_backend_service_retries(self) -> None:
+        """
+        Test the OpenAI backend with the default retries repeats the failed requests of a local service itself.
+        """
+        with StandInService() as service:
+            backend = OpenAIBackend(service.base_url)
+            service.responses.extend(
+                [
+                    (503, {"retry-after-ms": "10"}, 0.0),
+                    (429, {"retry-after-ms": "10"}, 0.0),
+                ]
+            )
+
+            translation = backend.complete("prompt", self.table)
+
+        self.assertIn("| ::1:: World | ::1:: World |", translation)
+        self.assertEqual(3, service.requests)
+
+    def test_incomplete_backend(self) -> None:
+        """
+        Test a backend without the completion cannot be created.
+        """
+
+        class IncompleteBackend(TranslationBackend):
+            """
+            The backend that does not complete the prompt.
+            """
+
+        with self.assertRaises(TypeError):
+            IncompleteBackend()
+
+    @mock.patch.dict(os.environ, {"OPENAI_API_KEY": "key"})
+    def test_get_backend(self) -> None:
+        """
+        Test the get_backend function creates the backend with the same settings once.
+        """
+        self.assertIs(get_backend("openai"), get_backend("openai"))
+        self.assertIsNot(get_backend("openai"), get_backend("openai", "http://a/v1"))
+        self.assertEqual(0, get_backend("openai", max_retries=0).client.max_retries)
+        self.assertIsInstance(get_backend("mock"), MockBackend)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,14 +3,19 @@
 from unittest import mock
 
 import os
+import time
 import unittest
 import datetime
 import srt
 
+from translate_subtitles.utils.backends import MockBackend
 from translate_subtitles.utils.converter import to_list
+from translate_subtitles.utils.validator import InvalidTranslation
 from translate_subtitles.utils.chunks import (
     __max_token_limit_exceeded as max_token_limit_exceeded,
     __num_tokens_from_string as num_tokens_from_string,
+    __translate_chunk as translate_chunk,
+    REPAIR_RETRIES,
     create_translation_chunks,
     skip_chunks,
     translate_chunks,
@@ -71,6 +76,23 @@ class TestChunks(unittest.TestCase):
             content=content,
         )
 
+    def __translate(self, text: str) -> str:
+        """
+        Translate the table of subtitles by converting the original sentences to uppercase.
+
+        Args:
+            text (str): The table of the encoded subtitles.
+
+        Returns:
+            str: The table with the translated column filled in.
+        """
+        rows = text.split("\n")
+        for index, row in enumerate(rows[2:], 2):
+            original = row.split("|")[1].strip()
+            rows[index] = f"| {original} | {original.upper()} |"
+
+        return "\n".join(rows)
+
     def test_num_tokens_from_string(self) -> None:
         """
         Test the __num_tokens_from_string function.
@@ -103,7 +125,7 @@ class TestChunks(unittest.TestCase):
 
     @mock.patch(
         "translate_subtitles.utils.chunks.translate_string",
-        side_effect=lambda text, _, __: text,
+        side_effect=lambda text, _, __, ___: MockBackend().complete("", text),
     )
     def test_translate_chunks_small(self, _) -> None:
         """
@@ -114,7 +136,7 @@ class TestChunks(unittest.TestCase):
 
     @mock.patch(
         "translate_subtitles.utils.chunks.translate_string",
-        side_effect=lambda text, _, __: text,
+        side_effect=lambda text, _, __, ___: MockBackend().complete("", text),
     )
     def test_translate_chunks_large(self, _) -> None:
         """
@@ -123,6 +145,136 @@ class TestChunks(unittest.TestCase):
         actual = to_list(translate_chunks(self.large_chunk_to_translate, "zh", "en"))
         self.assertListEqual(self.large_translated_chunk, actual)
 
+    @mock.patch("translate_subtitles.utils.chunks.translate_string")
+    def test_translate_chunks_concurrency(self, translate_string) -> None:
+        """
+        Test the translate_chunks function yields the chunks translated at the same time in their order.
+        """
+
+        def translate(text: str, *_) -> str:
+            # the first chunk is translated last
+            if "first" in text:
+                time.sleep(0.1)
+            return self.__translate(text)
+
+        translate_string.side_effect = translate
+        chunks = [
+            [self.__create_subtitle("first", 1), self.__create_subtitle("one", 2)],
+            [self.__create_subtitle("second", 3)],
+            [self.__create_subtitle("third", 4)],
+        ]
+
+        actual = [
+            [(sub.index, sub.content) for sub in chunk]
+            for chunk in translate_chunks(chunks, "en", "en", concurrency=3)
+        ]
+
+        self.assertListEqual(
+            [[(1, "FIRST"), (2, "ONE")], [(3, "SECOND")], [(4, "THIRD")]], actual
+        )
+
+    @mock.patch("translate_subtitles.utils.chunks.translate_string")
+    def test_translate_chunks_failure(self, translate_string) -> None:
+        """
+        Test the translate_chunks function keeps the original text of a failed chunk and translates the rest.
+        """
+
+        def translate(text: str, *_) -> str:
+            if "second" in text:
+                raise ConnectionError("Connection reset")
+            return self.__translate(text)
+
+        translate_string.side_effect = translate
+        chunks = [
+            [self.__create_subtitle("first", 1)],
+            [self.__create_subtitle("second", 2)],
+            [self.__create_subtitle("third", 3)],
+        ]
+
+        actual = []
+        with self.assertRaises(SystemExit) as context:
+            for chunk in translate_chunks(chunks, "en", "en", concurrency=2):
+                actual.append([sub.content for sub in chunk])
+
+        self.assertListEqual([["FIRST"], ["second"], ["THIRD"]], actual)
+        self.assertIn("1 of 3 chunks", context.exception.code)
+        self.assertIn("chunk 2 (subtitles 2-2)", context.exception.code)
+
+    @mock.patch("translate_subtitles.utils.chunks.translate_string")
+    def test_translate_chunks_exit(self, translate_string) -> None:
+        """
+        Test the translate_chunks function does not take an exit of the translation for a failed chunk.
+        """
+        translate_string.side_effect = SystemExit("Stopped")
+        chunks = [[self.__create_subtitle("first", 1)]]
+
+        with self.assertRaises(SystemExit) as context:
+            list(translate_chunks(chunks, "en", "en"))
+
+        self.assertEqual("Stopped", context.exception.code)
+
+    @mock.patch("translate_subtitles.utils.chunks.translate_string")
+    def test_translate_chunks_repair(self, translate_string) -> None:
+        """
+        Test the translate_chunks function requests again only the rows missing from the translation
+        or misaligned in it.
+        """
+        responses = iter(
+            [
+                "| Original | Translated |\n| --- | --- |\n"
+                "| ::0:: first | ::0:: FIRST |\n"
+                "| ::1:: second | ::2:: SECOND |\n"
+                "| ::3:: fourth | ::3:: FOURTH |",
+                "| Original | Translated |\n| --- | --- |\n"
+                "| ::1:: second | ::1:: SECOND |\n"
+                "| ::2:: third | ::2:: THIRD |",
+            ]
+        )
+        translate_string.side_effect = lambda *_: next(responses)
+        chunks = [
+            [
+                self.__create_subtitle(content, index)
+                for index, content in enumerate(
+                    ("first", "second", "third", "fourth"), 1
+                )
+            ]
+        ]
+
+        actual = [sub.content for sub in next(translate_chunks(chunks, "en", "en"))]
+
+        self.assertListEqual(["FIRST", "SECOND", "THIRD", "FOURTH"], actual)
+        self.assertEqual(2, translate_string.call_count)
+        self.assertEqual(
+            "| Original | Translated |\n| --- | --- |\n"
+            "| ::1:: second |     |\n"
+            "| ::2:: third |     |",
+            translate_string.call_args.args[0],
+        )
+
+    @mock.patch(
+        "translate_subtitles.utils.chunks.translate_string",
+        side_effect=lambda text, _, __, ___: text,
+    )
+    def test_translate_chunks_repair_failure(self, translate_string) -> None:
+        """
+        Test the translate_chunks function gives up on a chunk after the retries and keeps its original text.
+        """
+        chunks = [[self.__create_subtitle("first", 1)]]
+
+        actual = []
+        with self.assertRaises(SystemExit) as context:
+            for chunk in translate_chunks(chunks, "en", "en"):
+                actual.append([sub.content for sub in chunk])
+
+        self.assertListEqual([["first"]], actual)
+        self.assertEqual(REPAIR_RETRIES + 1, translate_string.call_count)
+        self.assertIn("chunk 1 (subtitles 1-1)", context.exception.code)
+
+        with self.assertRaisesRegex(
+            InvalidTranslation, "1 of 1 subtitles is invalid: 1"
+        ):
+            list(translate_chunk(chunks[0], "en", "en"))
+
     def test_skip_chunks(self) -> None:
         """
         Test the skip_chunks function.
@@ -6,7 +6,8 @@ import unittest
 import srt
 
 from translate_subtitles.utils.converter import to_list
-from translate_subtitles.utils.encoder import decode_string, encode_chunk, encode_chunks
+from translate_subtitles.utils.encoder import encode_chunk, encode_chunks
+from translate_subtitles.utils.validator import parse_translation
 
 
 @unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
@@ -90,14 +91,16 @@ class TestEncoder(unittest.TestCase):
             self.encoded_chunks, actual, "The encoded chunks are incorrect."
         )
 
-    def test_decode_string(self) -> None:
+    def test_parse_encoded_string(self) -> None:
         """
-        Test the decode_string function.
+        Test the parse_translation function.
 
-        This test case verifies that the decode_string function correctly decodes the encoded string and returns the
-        expected result.
+        This test case verifies that the parse_translation function correctly decodes the encoded string and returns
+        the expected result.
         """
-        actual = list(decode_string(self.encoded_string))
+        actual = parse_translation(self.encoded_string, {0, 1})
         self.assertEqual(
-            self.decoded_string, actual, "The decoded string is incorrect."
+            dict(enumerate(self.decoded_string)),
+            actual,
+            "The decoded string is incorrect.",
         )
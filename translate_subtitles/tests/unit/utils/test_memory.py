@@ -0,0 +1,144 @@
+""" Test the memory module. """
+
+import collections
+import datetime
+import os
+import tempfile
+import unittest
+import srt
+
+from translate_subtitles.utils.memory import (
+    TranslationMemory,
+    recall_translations,
+    restore_translations,
+)
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestMemory(unittest.TestCase):
+    """
+    Unit test suite for the memory module.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up the test case by creating a directory for the memory database.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.memory_file = os.path.join(self.directory.name, "memory.db")
+
+    def tearDown(self) -> None:
+        """
+        Remove the memory database.
+        """
+        self.directory.cleanup()
+
+    def __create_subtitle(self, content: str, index: int) -> srt.Subtitle:
+        """
+        Create a subtitle object with the given content and index.
+
+        Args:
+            content (str): The content of the subtitle.
+            index (int): The index of the subtitle.
+
+        Returns:
+            srt.Subtitle: The created subtitle object.
+        """
+        return srt.Subtitle(
+            index=index,
+            start=datetime.timedelta(seconds=index - 1),
+            end=datetime.timedelta(seconds=index),
+            content=content,
+        )
+
+    def test_get_put(self) -> None:
+        """
+        Test the memory returns the remembered translations of the same languages and model across the runs.
+        """
+        memory = TranslationMemory(self.memory_file, "en", "ru", "model")
+        self.assertIsNone(memory.get("Hello"))
+        memory.put("Hello  world", "Привет мир")
+        memory.close()
+
+        memory = TranslationMemory(self.memory_file, "en", "ru", "model")
+        self.assertEqual("Привет мир", memory.get(" Hello world "))
+        self.assertIsNone(memory.get("Hello"))
+        self.assertEqual((1, 1), (memory.hits, memory.misses))
+        memory.close()
+
+        for languages in (("en", "de", "model"), ("en", "ru", "other")):
+            memory = TranslationMemory(self.memory_file, *languages)
+            self.assertIsNone(memory.get("Hello world"))
+            memory.close()
+
+    def test_recall_restore(self) -> None:
+        """
+        Test only the subtitles missing from the memory are translated, and all of them are restored in order.
+        """
+        memory = TranslationMemory(self.memory_file, "en", "ru", "model")
+        memory.put("Yes.", "Да.")
+
+        subs = [
+            self.__create_subtitle(content, index)
+            for index, content in enumerate(
+                ("Yes.", "Hello", "Yes.", "World", "Bye", "Yes."), 1
+            )
+        ]
+        ledger = collections.deque()
+
+        to_translate = list(recall_translations(iter(subs), ledger, memory))
+        self.assertListEqual(
+            ["Hello", "World", "Bye"], [s.content for s in to_translate]
+        )
+
+        # the second chunk has failed and keeps its original text
+        to_translate[0].content = "Привет"
+        to_translate[1].content = "Мир"
+        chunks = [to_translate[:2], to_translate[2:]]
+
+        restored = list(restore_translations(iter(chunks), ledger, memory))
+
+        self.assertListEqual(
+            [[1, 2, 3, 4], [5], [6]],
+            [[sub.index for sub in chunk] for chunk in restored],
+        )
+        self.assertListEqual(
+            ["Да.", "Привет", "Да.", "Мир", "Bye", "Да."],
+            [sub.content for chunk in restored for sub in chunk],
+        )
+        self.assertEqual("Мир", memory.get("World"))
+        self.assertIsNone(memory.get("Bye"))
+        memory.close()
+
+    def test_recall_restore_repeated(self) -> None:
+        """
+        Test each repeated text is translated once and its translation is given to every subtitle with it.
+        """
+        subs = [
+            self.__create_subtitle(content, index)
+            for index, content in enumerate(
+                ("What?", "Hello", "What? ", "Hello", "Bye", "What?"), 1
+            )
+        ]
+        ledger = collections.deque()
+        repeated = collections.Counter()
+
+        to_translate = list(recall_translations(iter(subs), ledger, None, repeated))
+        self.assertListEqual([1, 2, 5], [sub.index for sub in to_translate])
+        self.assertDictEqual({"What?": 2, "Hello": 1}, dict(repeated))
+
+        for sub, translation in zip(to_translate, ("Что?", "Привет", "Пока")):
+            sub.content = translation
+
+        restored = list(restore_translations(iter([to_translate]), ledger))
+
+        self.assertListEqual(
+            [(1, "Что?"), (2, "Привет"), (3, "Что?"), (4, "Привет"), (5, "Пока")],
+            [(sub.index, sub.content) for sub in restored[0]],
+        )
+        self.assertListEqual([(6, "Что?")], [(s.index, s.content) for s in restored[1]])
+        self.assertEqual(0, len(ledger))
+
+
+if __name__ == "__main__":
+    unittest.main()
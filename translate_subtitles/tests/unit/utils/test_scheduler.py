@@ -0,0 +1,97 @@
+""" Test the scheduler module. """
+
+from unittest import mock
+
+import os
+import unittest
+
+from translate_subtitles.utils.backends import RateLimitExceeded, ServiceUnavailable
+from translate_subtitles.utils.scheduler import RateScheduler, TokenBucket
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestScheduler(unittest.TestCase):
+    """
+    Unit test suite for the scheduler module.
+    """
+
+    @mock.patch("translate_subtitles.utils.scheduler.time.monotonic")
+    def test_token_bucket(self, monotonic: mock.MagicMock) -> None:
+        """
+        Test the token bucket admits the requests within its budget and delays the rest.
+        """
+        monotonic.return_value = 0.0
+        bucket = TokenBucket(60)
+
+        self.assertEqual(0.0, bucket.reserve(50))
+        self.assertEqual(0.0, bucket.reserve(10))
+        self.assertAlmostEqual(5.0, bucket.reserve(5))
+
+        # the budget is replenished by one per second
+        monotonic.return_value = 10.0
+        self.assertEqual(0.0, bucket.reserve(5))
+
+        # a request larger than the bucket waits for the full bucket
+        self.assertAlmostEqual(60.0, bucket.reserve(1000))
+
+    @mock.patch("translate_subtitles.utils.scheduler.time.sleep")
+    @mock.patch("translate_subtitles.utils.scheduler.time.monotonic")
+    def test_acquire(self, monotonic: mock.MagicMock, sleep: mock.MagicMock) -> None:
+        """
+        Test the scheduler waits for the budget of both the requests and the tokens.
+        """
+        monotonic.return_value = 0.0
+        scheduler = RateScheduler(requests_per_minute=2, tokens_per_minute=600)
+
+        scheduler.acquire(300)
+        scheduler.acquire(200)
+        sleep.assert_not_called()
+
+        # the tokens are replenished sooner than the requests
+        scheduler.acquire(200)
+        sleep.assert_called_once_with(30.0)
+        self.assertEqual(30.0, scheduler.waited)
+
+    @mock.patch("translate_subtitles.utils.scheduler.time.sleep")
+    @mock.patch("translate_subtitles.utils.scheduler.time.monotonic")
+    def test_run_retries(
+        self, monotonic: mock.MagicMock, sleep: mock.MagicMock
+    ) -> None:
+        """
+        Test the scheduler repeats the rejected requests after the delay the service asks for or a backoff.
+        """
+        clock = [0.0]
+        monotonic.side_effect = lambda: clock[0]
+        sleep.side_effect = lambda seconds: clock.__setitem__(0, clock[0] + seconds)
+        request = mock.Mock(
+            side_effect=[
+                RateLimitExceeded("Too many requests", retry_after=5.0),
+                ServiceUnavailable("Connection reset"),
+                "translated",
+            ]
+        )
+        scheduler = RateScheduler(backoff=1.0)
+
+        self.assertEqual("translated", scheduler.run(request, 100))
+        self.assertEqual(3, request.call_count)
+        self.assertEqual(2, scheduler.retries)
+
+        first, second = [call.args[0] for call in sleep.call_args_list]
+        self.assertTrue(5.0 <= first <= 6.0)
+        self.assertTrue(1.0 <= second <= 2.0)
+
+    @mock.patch("translate_subtitles.utils.scheduler.time.sleep")
+    def test_run_gives_up(self, _) -> None:
+        """
+        Test the scheduler raises the rejection once the request has been repeated too many times.
+        """
+        request = mock.Mock(side_effect=RateLimitExceeded("Too many requests"))
+        scheduler = RateScheduler(max_retries=2)
+
+        with self.assertRaises(RateLimitExceeded):
+            scheduler.run(request, 100)
+        self.assertEqual(3, request.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+""" Test the validator module. """
+
+import os
+import unittest
+
+from translate_subtitles.utils.validator import parse_translation
+
+
+@unittest.skipUnless(os.getenv("TEST_TYPE") == "unit", "Skipping non-unit tests")
+class TestValidator(unittest.TestCase):
+    """
+    Unit test suite for the validator module.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up the test case by initializing the translation with a missing and a misaligned row.
+        """
+        self.translation = (
+            "| Original | Translated |\n| --- | --- |\n"
+            "| ::0:: Hello | ::0:: Привет |\n"
+            "| ::1:: World | ::2:: Мир |\n"
+            "| ::3:: Bye | ::3:: Пока |\n"
+            "| ::4:: Yes | |\n"
+            "| ::3:: Bye | ::3:: До свидания |\n"
+            "| ::9:: Extra | ::9:: Лишний |"
+        )
+
+    def test_parse_translation(self) -> None:
+        """
+        Test the parse_translation function accepts the well-formed rows of the requested indices only.
+        """
+        actual = parse_translation(self.translation, {0, 1, 2, 3, 4})
+        self.assertDictEqual({0: "Привет", 3: "Пока"}, actual)
+
+        actual = parse_translation(self.translation, {1, 9})
+        self.assertDictEqual({9: "Лишний"}, actual)
+
+        actual = parse_translation(self.translation.rsplit("\n", 5)[0], {0})
+        self.assertDictEqual({0: "Привет"}, actual)
+
+    def test_parse_translation_malformed(self) -> None:
+        """
+        Test the parse_translation function skips the rows without both columns or with an invalid index.
+        """
+        translation = (
+            "| ::0:: Hello | ::0:: Привет | extra |\n"
+            "| ::1:: World\n"
+            "| ::x:: Bye | ::x:: Пока |\n"
+            "| ::3:: Yes | ::3:: Да |"
+        )
+
+        self.assertDictEqual({3: "Да"}, parse_translation(translation, range(4)))
+
+
+if __name__ == "__main__":
+    unittest.main()
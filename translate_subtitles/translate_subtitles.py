@@ -1,12 +1,32 @@
 """ Translate subtitles from one language to another. """
 
 import argparse
+import collections
 import sys
 import os
+import openai
 
+from translate_subtitles.utils.backends import (
+    BACKENDS,
+    KEEP_ALIVE,
+    TIMEOUT,
+    TranslationBackend,
+    get_backend,
+)
+from translate_subtitles.utils.memory import (
+    TranslationMemory,
+    recall_translations,
+    restore_translations,
+)
+from translate_subtitles.utils.scheduler import MAX_RETRIES, RateScheduler
 from translate_subtitles.utils.progress import print_progress_chunks
 from translate_subtitles.utils.subtitle import read_subtitle, write_subtitle
-from translate_subtitles.utils.chunks import create_translation_chunks, translate_chunks
+from translate_subtitles.utils.chunks import (
+    CONCURRENCY,
+    create_translation_chunks,
+    estimate_row_tokens,
+    translate_chunks,
+)
 
 
 def __parse_arguments() -> argparse.Namespace:
@@ -45,6 +65,64 @@ def __parse_arguments() -> argparse.Namespace:
         required=True,
     )
 
+    parser.add_argument(
+        "--concurrency",
+        help="the number of chunks of the subtitles translated at the same time",
+        type=int,
+        default=CONCURRENCY,
+    )
+
+    parser.add_argument(
+        "--backend",
+        help="the service to translate the subtitles with, mock copies the original text without translating it",
+        choices=BACKENDS,
+        default="openai",
+    )
+
+    parser.add_argument(
+        "--base-url",
+        help="the URL of the service compatible with the OpenAI API, the OpenAI API by default",
+    )
+
+    parser.add_argument(
+        "--timeout",
+        help="the number of seconds to wait for the translation of a chunk",
+        type=float,
+        default=TIMEOUT,
+    )
+
+    parser.add_argument(
+        "--keep-alive",
+        help="the number of seconds an idle connection to the service is kept open to be reused",
+        type=float,
+        default=KEEP_ALIVE,
+    )
+
+    parser.add_argument(
+        "--requests-per-minute",
+        help="the number of requests per minute the service allows, unlimited by default",
+        type=float,
+    )
+
+    parser.add_argument(
+        "--tokens-per-minute",
+        help="the number of tokens per minute the service allows, unlimited by default",
+        type=float,
+    )
+
+    parser.add_argument(
+        "--max-retries",
+        help="the number of times a request rejected by the rate limits or failed by the service is repeated",
+        type=int,
+        default=MAX_RETRIES,
+    )
+
+    parser.add_argument(
+        "--translation-memory",
+        help="the database file to remember the translations in across the runs, "
+        "so the lines translated before are not sent to the service again",
+    )
+
     return parser.parse_args()
 
 
@@ -55,6 +133,8 @@ def __check_arguments(args: argparse.Namespace) -> None:
     This function checks if the input subtitle file exists and if the output subtitle file already exists.
     If the input subtitle file does not exist, it prints an error message and exits the program.
     If the output subtitle file already exists, it prints an error message and exits the program.
+    If the concurrency, the timeout, the keep-alive or the rate limits are not positive,
+    or the number of retries is negative, it prints an error message and exits the program.
     """
     if not os.path.isfile(args.input_subtitle):
         sys.exit(f"File {args.input_subtitle} does not exist")
@@ -62,35 +142,131 @@ def __check_arguments(args: argparse.Namespace) -> None:
     if os.path.isfile(args.output_subtitle):
         sys.exit(f"File {args.output_subtitle} already exists")
 
+    if args.concurrency < 1:
+        sys.exit("Concurrency must be at least 1")
 
-def main() -> None:
-    """
-    Main function for translating subtitles.
+    if args.timeout <= 0:
+        sys.exit("Timeout must be positive")
 
-    This function parses command line arguments, checks the arguments, and performs the translation process.
+    if args.keep_alive <= 0:
+        sys.exit("Keep-alive must be positive")
+
+    for limit in (args.requests_per_minute, args.tokens_per_minute):
+        if limit is not None and limit <= 0:
+            sys.exit("Rate limits must be positive")
+
+    if args.max_retries < 0:
+        sys.exit("Number of retries must not be negative")
+
+
+def __translate(
+    args: argparse.Namespace,
+    backend: TranslationBackend,
+    scheduler: RateScheduler,
+    memory: TranslationMemory | None,
+    repeated: collections.Counter,
+) -> None:
+    """
+    Translates the subtitle file.
 
     Args:
-        None
+        args (argparse.Namespace): The command-line arguments.
+        backend (TranslationBackend): The service to translate the subtitles with.
+        scheduler (RateScheduler): The scheduler of the requests to the service.
+        memory (TranslationMemory | None): The memory of the translations, or None not to use it.
+        repeated (collections.Counter): The counter of the repeated texts that have not been sent.
 
     Returns:
         None
     """
-
-    args = __parse_arguments()
-    __check_arguments(args)
+    # the subtitles in their order, so the recalled and repeated ones are put back between the translated ones
+    ledger = collections.deque()
 
     generator = args.input_subtitle
     for function in (
         read_subtitle,
+        lambda subtitle: recall_translations(subtitle, ledger, memory, repeated),
         create_translation_chunks,
         lambda chunk: translate_chunks(
-            chunk, args.input_language, args.output_language
+            chunk,
+            args.input_language,
+            args.output_language,
+            args.concurrency,
+            backend,
+            scheduler,
         ),
+        lambda chunks: restore_translations(chunks, ledger, memory),
         print_progress_chunks,
         lambda chunk: write_subtitle(chunk, args.output_subtitle),
     ):
         generator = function(generator)
 
 
+def main() -> None:
+    """
+    Main function for translating subtitles.
+
+    This function parses command line arguments, checks the arguments, and performs the translation process.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+
+    args = __parse_arguments()
+    __check_arguments(args)
+
+    try:
+        # the connections of the backend are shared by the chunks translated at the same time,
+        # and the scheduler repeats the failed requests within the rate limits instead of the client
+        backend = get_backend(
+            args.backend,
+            args.base_url,
+            args.timeout,
+            args.keep_alive,
+            args.concurrency,
+            max_retries=0,
+        )
+    except openai.OpenAIError as error:
+        sys.exit(f"Error: {error}")
+
+    scheduler = RateScheduler(
+        args.requests_per_minute, args.tokens_per_minute, args.max_retries
+    )
+
+    memory = None
+    if args.translation_memory is not None:
+        memory = TranslationMemory(
+            args.translation_memory,
+            args.input_language,
+            args.output_language,
+            backend.model,
+        )
+
+    repeated = collections.Counter()
+    try:
+        __translate(args, backend, scheduler, memory, repeated)
+    finally:
+        if repeated:
+            tokens = sum(
+                count * estimate_row_tokens(text) for text, count in repeated.items()
+            )
+            print(
+                f"{repeated.total()} repeated subtitles have not been sent "
+                f"(about {tokens} tokens saved)"
+            )
+
+        if memory is not None:
+            memory.close()
+
+    if scheduler.waited > 0 or scheduler.retries > 0:
+        print(
+            f"Rate limits have delayed the requests by {scheduler.waited:.1f} s "
+            f"and {scheduler.retries} requests have been repeated"
+        )
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,271 @@
+""" This module contains the services the subtitles are translated with. """
+
+from email.utils import parsedate_to_datetime
+import abc
+import datetime
+import functools
+import os
+import time
+import httpx
+import openai
+
+from translate_subtitles.utils.models import TRANSLATION_MODEL
+
+# The number of seconds to wait for a response of the translation service
+TIMEOUT = 120.0
+
+# The number of seconds to wait for a connection to the translation service
+CONNECT_TIMEOUT = 10.0
+
+# The number of seconds an idle connection is kept open to be reused by the next request
+KEEP_ALIVE = 60.0
+
+# The number of connections to the translation service kept open at most
+CONNECTIONS = 8
+
+# The number of times the client repeats a failed request itself, unless a scheduler repeats it instead
+CLIENT_RETRIES = openai.DEFAULT_MAX_RETRIES
+
+# The name of the model the subtitles are translated with
+MODEL = TRANSLATION_MODEL.get("name")
+
+# The names of the backends
+BACKENDS = ("openai", "mock")
+
+
+class ServiceUnavailable(Exception):
+    """
+    The error of a request the service has failed for the time being, which may succeed when repeated.
+    """
+
+    def __init__(self, message: str, retry_after: float = None) -> None:
+        """
+        Describes the error.
+
+        Args:
+            message (str): The description of the error.
+            retry_after (float, optional): The number of seconds the service asks to wait before repeating
+                                           the request, None if it has not asked. Defaults to None.
+        """
+        super().__init__(message, retry_after)
+        self.retry_after = retry_after
+
+    def __str__(self) -> str:
+        """
+        Describes the error.
+
+        Returns:
+            str: The description of the error.
+        """
+        return self.args[0]
+
+
+class RateLimitExceeded(ServiceUnavailable):
+    """
+    The error of a request the service has rejected for exceeding the rate limits.
+    """
+
+
+class TranslationBackend(abc.ABC):
+    """
+    The service that completes the translation prompt with the model named by `model`.
+    """
+
+    model = None
+
+    @abc.abstractmethod
+    def complete(self, prompt: str, text: str) -> str:
+        """
+        Completes the prompt for the text.
+
+        Args:
+            prompt (str): The instructions of the translation.
+            text (str): The table of the sentences to be translated.
+
+        Returns:
+            str: The completion, the table with the translated sentences.
+        """
+
+
+class OpenAIBackend(TranslationBackend):
+    """
+    The backend of the OpenAI API or any service compatible with it.
+
+    The client and its connections are kept open and shared by all the requests, so only the first ones
+    pay for the connection setup. The failed requests the client has not repeated itself are raised
+    as ServiceUnavailable, so a client without retries leaves them to be repeated within the rate limits.
+    """
+
+    def __init__(
+        self,
+        base_url: str = None,
+        timeout: float = TIMEOUT,
+        keep_alive: float = KEEP_ALIVE,
+        connections: int = CONNECTIONS,
+        model: str = MODEL,
+        max_retries: int = CLIENT_RETRIES,
+    ) -> None:
+        """
+        Creates the client of the service.
+
+        Args:
+            base_url (str, optional): The URL of the service, the OpenAI API if not provided. Defaults to None.
+            timeout (float, optional): The number of seconds to wait for a response. Defaults to 120.
+            keep_alive (float, optional): The number of seconds an idle connection is kept open. Defaults to 60.
+            connections (int, optional): The number of connections kept open at most. Defaults to 8.
+            model (str, optional): The name of the model. Defaults to the translation model.
+            max_retries (int, optional): The number of times the client repeats a failed request,
+                                         0 if a scheduler repeats it. Defaults to 2.
+        """
+        self.model = model
+        self.client = openai.OpenAI(
+            api_key=os.environ.get("OPENAI_API_KEY"),
+            base_url=base_url,
+            timeout=httpx.Timeout(timeout, connect=CONNECT_TIMEOUT),
+            max_retries=max_retries,
+            http_client=openai.DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=connections,
+                    max_keepalive_connections=connections,
+                    keepalive_expiry=keep_alive,
+                )
+            ),
+        )
+
+    @staticmethod
+    def __retry_after(response: httpx.Response) -> float | None:
+        """
+        Reads the delay the service asks to wait before repeating the request.
+
+        Args:
+            response (httpx.Response): The response rejecting the request.
+
+        Returns:
+            float | None: The number of seconds to wait, or None if the service has not asked.
+        """
+        try:
+            if "retry-after-ms" in response.headers:
+                return float(response.headers["retry-after-ms"]) / 1000
+
+            if "retry-after" in response.headers:
+                value = response.headers["retry-after"]
+                if value.replace(".", "", 1).isdigit():
+                    return float(value)
+
+                delay = parsedate_to_datetime(value) - datetime.datetime.now(
+                    datetime.timezone.utc
+                )
+                return max(delay.total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            pass
+
+        return None
+
+    def complete(self, prompt: str, text: str) -> str:
+        """
+        Completes the prompt for the text with the model.
+
+        Args:
+            prompt (str): The instructions of the translation.
+            text (str): The table of the sentences to be translated.
+
+        Returns:
+            str: The completion, the table with the translated sentences.
+
+        Raises:
+            RateLimitExceeded: The service has rejected the request for exceeding the rate limits.
+            ServiceUnavailable: The service cannot be reached or has failed to complete the request.
+        """
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": text},
+                ],
+            )
+        except openai.RateLimitError as error:
+            # the exhausted quota is rejected with the same status, but waiting does not help
+            if error.code == "insufficient_quota":
+                raise
+
+            raise RateLimitExceeded(
+                str(error), self.__retry_after(error.response)
+            ) from error
+        except (openai.APIConnectionError, openai.InternalServerError) as error:
+            raise ServiceUnavailable(str(error)) from error
+
+        return response.choices[0].message.content
+
+
+class MockBackend(TranslationBackend):
+    """
+    The backend that copies the original sentences to the translated column, so the translation can be tested
+    and measured without the service.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """
+        Sets up the backend.
+
+        Args:
+            latency (float, optional): The number of seconds each completion takes. Defaults to 0.
+        """
+        self.model = "mock"
+        self.latency = latency
+        self.calls = 0
+
+    def complete(self, prompt: str, text: str) -> str:
+        """
+        Fills the translated column of the table with the original sentences.
+
+        Args:
+            prompt (str): Ignored, the instructions of the translation.
+            text (str): The table of the sentences to be translated.
+
+        Returns:
+            str: The table with the original sentences in both columns.
+        """
+        self.calls += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        rows = text.split("\n")
+        for index, row in enumerate(rows[2:], 2):
+            columns = row.split("|")
+            if len(columns) == 4:
+                rows[index] = f"| {columns[1].strip()} | {columns[1].strip()} |"
+
+        return "\n".join(rows)
+
+
+@functools.lru_cache(maxsize=None)
+def get_backend(
+    name: str = "openai",
+    base_url: str = None,
+    timeout: float = TIMEOUT,
+    keep_alive: float = KEEP_ALIVE,
+    connections: int = CONNECTIONS,
+    max_retries: int = CLIENT_RETRIES,
+) -> TranslationBackend:
+    """
+    Returns the backend with the settings, creating it once per process.
+
+    Args:
+        name (str, optional): The name of the backend in BACKENDS. Defaults to "openai".
+        base_url (str, optional): The URL of the service, the OpenAI API if not provided. Defaults to None.
+        timeout (float, optional): The number of seconds to wait for a response. Defaults to 120.
+        keep_alive (float, optional): The number of seconds an idle connection is kept open. Defaults to 60.
+        connections (int, optional): The number of connections kept open at most. Defaults to 8.
+        max_retries (int, optional): The number of times the client repeats a failed request,
+                                     0 if a scheduler repeats it. Defaults to 2.
+
+    Returns:
+        TranslationBackend: The backend.
+    """
+    if name == "mock":
+        return MockBackend()
+
+    return OpenAIBackend(
+        base_url, timeout, keep_alive, connections, max_retries=max_retries
+    )
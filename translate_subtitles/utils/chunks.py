@@ -1,18 +1,29 @@
 """ This module contains functions to create and print chunks of subtitles to be translated. """
 
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import sys
+import collections
 import collections.abc
 import srt
 import tiktoken
 
+from translate_subtitles.utils.backends import TranslationBackend
 from translate_subtitles.utils.models import TRANSLATION_MODEL
-from translate_subtitles.utils.encoder import decode_string, encode_chunk
-from translate_subtitles.utils.translator import translate_string
-from translate_subtitles.utils.validator import translation_is_valid
+from translate_subtitles.utils.encoder import encode_chunk
+from translate_subtitles.utils.scheduler import RateScheduler
+from translate_subtitles.utils.translator import translate_string, translation_prompt
+from translate_subtitles.utils.validator import InvalidTranslation, parse_translation
 
 TOKEN_LIMIT = TRANSLATION_MODEL.get("tokens") * 64 / 100
 ENCODING = tiktoken.encoding_for_model(TRANSLATION_MODEL.get("name"))
 
+# The number of chunks translated at the same time by default
+CONCURRENCY = 1
+
+# The number of times the rows missing from a translation or misaligned in it are requested again
+REPAIR_RETRIES = 2
+
 
 def __num_tokens_from_string(string: str) -> int:
     """
@@ -42,6 +53,36 @@ def __max_token_limit_exceeded(tokens: int) -> bool:
     return tokens > TOKEN_LIMIT
 
 
+def __estimate_tokens(table: str, input_language: str, output_language: str) -> int:
+    """
+    Estimates the number of tokens of the translation request before it is sent.
+
+    Args:
+        table (str): The table of the subtitles to be translated.
+        input_language (str):  The input language code.
+        output_language (str): The output language code.
+
+    Returns:
+        int: The number of tokens of the prompt, the table and the completion, the table with both columns filled.
+    """
+    prompt = translation_prompt(input_language, output_language)
+
+    return __num_tokens_from_string(prompt) + 3 * __num_tokens_from_string(table)
+
+
+def estimate_row_tokens(text: str) -> int:
+    """
+    Estimates the number of tokens a row of the text adds to the translation request.
+
+    Args:
+        text (str): The text of the subtitle.
+
+    Returns:
+        int: The number of tokens of the row in the table and in the completion, the row with both columns filled.
+    """
+    return 3 * __num_tokens_from_string(f"| {text} |     |")
+
+
 def create_translation_chunks(
     subtitle: collections.abc.Generator[srt.Subtitle],
 ) -> collections.abc.Generator[collections.abc.Generator[srt.Subtitle]]:
@@ -73,65 +114,211 @@ def create_translation_chunks(
         yield chunk
 
 
+def __request_translation(
+    table: str,
+    input_language: str,
+    output_language: str,
+    backend: TranslationBackend = None,
+    scheduler: RateScheduler = None,
+) -> str:
+    """
+    Sends the table to be translated, within the rate limits if a scheduler is given.
+
+    Args:
+        table (str): The table of the encoded subtitles.
+        input_language (str):  The input language code.
+        output_language (str): The output language code.
+        backend (TranslationBackend, optional): The service to translate the subtitles with. Defaults to None.
+        scheduler (RateScheduler, optional): The scheduler of the requests to the service. Defaults to None.
+
+    Returns:
+        str: The table with the translated column filled in.
+    """
+    request = functools.partial(
+        translate_string, table, input_language, output_language, backend
+    )
+    if scheduler is None:
+        return request()
+
+    tokens = __estimate_tokens(table, input_language, output_language)
+    return scheduler.run(request, tokens)
+
+
 def __translate_chunk(
     chunk: collections.abc.Generator[srt.Subtitle],
     input_language: str,
     output_language: str,
+    backend: TranslationBackend = None,
+    scheduler: RateScheduler = None,
 ) -> collections.abc.Generator[srt.Subtitle]:
     """
     Translates each subtitle in the given chunk from the input language to the output language.
 
+    The well-formed rows of the translation are accepted by their index, and only the missing or misaligned
+    ones are requested again, up to REPAIR_RETRIES times.
+
     Args:
         chunk (collections.abc.Generator[srt.Subtitle]):
                                A generator of srt.Subtitle objects representing the subtitles to be translated.
         input_language (str):  The input language code.
         output_language (str): The output language code.
+        backend (TranslationBackend, optional): The service to translate the subtitles with. Defaults to None.
+        scheduler (RateScheduler, optional): The scheduler of the requests to the service. Defaults to None.
 
     Yields:
         collections.abc.Generator[srt.Subtitle]: A generator of srt.Subtitle objects with translated content.
 
+    Raises:
+        InvalidTranslation: If some rows are still missing or misaligned after the retries.
     """
-    # store the subtitles in a string
     subtitle_list = list(encode_chunk(chunk))
-    original = "| Original | Translated |\n| --- | --- |\n" + "\n".join(
-        [sub.content for sub in subtitle_list]
-    )
+    translations = {}
+    missing = list(range(len(subtitle_list)))
+
+    for _ in range(REPAIR_RETRIES + 1):
+        # the rows requested again keep their indices, so they are matched to their subtitles
+        table = "| Original | Translated |\n| --- | --- |\n" + "\n".join(
+            [subtitle_list[index].content for index in missing]
+        )
+        translation = __request_translation(
+            table, input_language, output_language, backend, scheduler
+        )
+
+        translations.update(parse_translation(translation, set(missing)))
+        missing = [index for index in missing if index not in translations]
+        if not missing:
+            break
+
+    if missing:
+        indices = ", ".join(str(subtitle_list[index].index) for index in missing)
+        raise InvalidTranslation(
+            f"The translation of {len(missing)} of {len(subtitle_list)} subtitles is invalid: {indices}"
+        )
+
+    for index, sub in enumerate(subtitle_list):
+        sub.content = translations[index]
+        yield sub
+
+
+def __translate_isolated(
+    chunk: list[srt.Subtitle],
+    input_language: str,
+    output_language: str,
+    backend: TranslationBackend = None,
+    scheduler: RateScheduler = None,
+) -> tuple[list[srt.Subtitle], bool]:
+    """
+    Translates the chunk, keeping its original text if the translation fails.
 
-    translation = translate_string(original, input_language, output_language)
-    if not translation_is_valid(translation, len(subtitle_list)):
-        if len(subtitle_list) <= 1:
-            sys.exit("Error: The translation is invalid.")
+    Args:
+        chunk (list[srt.Subtitle]): The subtitles to be translated.
+        input_language (str):  The input language code.
+        output_language (str): The output language code.
+        backend (TranslationBackend, optional): The service to translate the subtitles with. Defaults to None.
+        scheduler (RateScheduler, optional): The scheduler of the requests to the service. Defaults to None.
 
-        __translate_chunk(chunk[: len(chunk) // 2], input_language, output_language)
-        __translate_chunk(chunk[len(chunk) // 2 :], input_language, output_language)
+    Returns:
+        tuple[list[srt.Subtitle], bool]: The translated subtitles, or the original ones if the translation
+                                         has failed, and whether it has failed.
+    """
+    contents = [sub.content for sub in chunk]
 
-    translation_list = list(decode_string(translation))
+    try:
+        translated = __translate_chunk(
+            chunk, input_language, output_language, backend, scheduler
+        )
+        return list(translated), False
+    except Exception as error:
+        # the subtitles are encoded in place before the translation
+        for sub, content in zip(chunk, contents):
+            sub.content = content
 
-    for _, (original, translation) in enumerate(zip(subtitle_list, translation_list)):
-        original.content = translation
-        yield original
+        print(
+            f"\nSubtitles {chunk[0].index}-{chunk[-1].index} have not been translated: {error}"
+        )
+        return chunk, True
 
 
 def translate_chunks(
     chunks: collections.abc.Generator[collections.abc.Generator[srt.Subtitle]],
     input_language: str,
     output_language: str,
+    concurrency: int = CONCURRENCY,
+    backend: TranslationBackend = None,
+    scheduler: RateScheduler = None,
 ) -> collections.abc.Generator[collections.abc.Generator[srt.Subtitle]]:
     """
     Translates a sequence of subtitle chunks from one language to another.
 
+    Up to `concurrency` chunks are translated at the same time, and the chunks are yielded in their original
+    order. A chunk that fails to be translated keeps its original text and does not stop the others,
+    the run exits with an error naming the failed chunks and their subtitles once all the chunks have been yielded.
+
     Args:
         chunks (collections.abc.Generator[collections.abc.Generator[srt.Subtitle]]):
                                A generator of generators containing subtitle chunks.
         input_language (str):  The language of the input subtitles.
         output_language (str): The language to translate the subtitles into.
+        concurrency (int, optional): The number of chunks translated at the same time. Defaults to 1.
+        backend (TranslationBackend, optional): The service to translate the subtitles with,
+                                                the OpenAI API if not provided. Defaults to None.
+        scheduler (RateScheduler, optional): The scheduler keeping the requests within the rate limits
+                                             of the service, shared by the chunks translated at the same time.
+                                             Defaults to None.
 
     Yields:
         collections.abc.Generator[collections.abc.Generator[srt.Subtitle]]:
                                A generator of generators containing translated subtitle chunks.
     """
-    for chunk in chunks:
-        yield __translate_chunk(chunk, input_language, output_language)
+    total = 0
+    collected = 0
+    failed = []
+
+    def collect(
+        translated: list[srt.Subtitle], chunk_failed: bool
+    ) -> list[srt.Subtitle]:
+        nonlocal collected
+
+        # the chunks are collected in their original order
+        collected += 1
+        if chunk_failed:
+            failed.append(
+                f"chunk {collected} (subtitles {translated[0].index}-{translated[-1].index})"
+            )
+
+        return translated
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = collections.deque()
+        try:
+            for chunk in chunks:
+                pending.append(
+                    executor.submit(
+                        __translate_isolated,
+                        chunk,
+                        input_language,
+                        output_language,
+                        backend,
+                        scheduler,
+                    )
+                )
+                total += 1
+
+                # the next chunk is read once the oldest one in flight is translated and yielded
+                while len(pending) >= concurrency:
+                    yield collect(*pending.popleft().result())
+
+            while pending:
+                yield collect(*pending.popleft().result())
+        finally:
+            for future in pending:
+                future.cancel()
+
+    if failed:
+        sys.exit(
+            f"Error: {len(failed)} of {total} chunks have not been translated and keep their original text: "
+            f"{', '.join(failed)}."
+        )
 
 
 def skip_chunks(
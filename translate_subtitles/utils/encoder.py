@@ -1,7 +1,6 @@
-""" This module contains the functions to encode and decode subtitles. """
+""" This module contains the functions to encode subtitles. """
 
 import collections.abc
-import re
 import srt
 
 
@@ -39,21 +38,3 @@ def encode_chunks(
     """
     for chunk in chunks:
         yield encode_chunk(chunk)
-
-
-def decode_string(string: str) -> collections.abc.Generator[str]:
-    """
-    Decode a string by splitting it based on a pattern and yielding the decoded lines.
-
-    Args:
-        string (str): The string to be decoded.
-
-    Yields:
-        str: The decoded lines.
-
-    """
-    for line in string.split("\n")[2:]:
-        columns = line.split("|")
-        if len(columns) == 4:
-            translation = columns[2].strip()
-            yield "".join(filter(None, re.split(r"::\d+::", translation))).strip()
@@ -0,0 +1,207 @@
+""" This module contains a persistent memory of the translated subtitles and the stages that reuse them. """
+
+import collections
+import collections.abc
+import sqlite3
+import unicodedata
+import srt
+
+# The number of changes written to the disk at once
+COMMIT_INTERVAL = 100
+
+
+class TranslationMemory:
+    """
+    The translations of the subtitles backed by an SQLite database, so the lines repeated across the files,
+    such as the intros, the songs and the credits of a season, are translated once.
+
+    The translations are keyed by the normalized original text, the languages and the model.
+    """
+
+    def __init__(
+        self, memory_file: str, input_language: str, output_language: str, model: str
+    ) -> None:
+        """
+        Opens the memory, creating the database if it does not exist.
+
+        Args:
+            memory_file (str): The path to the database file.
+            input_language (str): The language of the original subtitles.
+            output_language (str): The language of the translated subtitles.
+            model (str): The name of the model the subtitles are translated with.
+        """
+        self.languages = (input_language, output_language, model)
+        self.hits = 0
+        self.misses = 0
+        self.changes = 0
+
+        self.connection = sqlite3.connect(memory_file, timeout=60)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "original TEXT NOT NULL, input_language TEXT NOT NULL, output_language TEXT NOT NULL, "
+            "model TEXT NOT NULL, translation TEXT NOT NULL, "
+            "PRIMARY KEY (original, input_language, output_language, model))"
+        )
+        self.connection.commit()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Normalizes the text, so the same line written differently has the same key.
+
+        Args:
+            text (str): The original text.
+
+        Returns:
+            str: The text in the NFC form with the whitespace collapsed.
+        """
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    def get(self, text: str) -> str | None:
+        """
+        Returns the translation of the text remembered before.
+
+        Args:
+            text (str): The original text.
+
+        Returns:
+            str | None: The translation, or None if the text has not been translated before.
+        """
+        row = self.connection.execute(
+            "SELECT translation FROM translations "
+            "WHERE original = ? AND input_language = ? AND output_language = ? AND model = ?",
+            (self.normalize(text), *self.languages),
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return row[0]
+
+    def put(self, text: str, translation: str) -> None:
+        """
+        Remembers the translation of the text.
+
+        Args:
+            text (str): The original text.
+            translation (str): The translated text.
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO translations "
+            "(original, input_language, output_language, model, translation) VALUES (?, ?, ?, ?, ?)",
+            (self.normalize(text), *self.languages, translation),
+        )
+
+        self.changes += 1
+        if self.changes % COMMIT_INTERVAL == 0:
+            self.connection.commit()
+
+    def close(self) -> None:
+        """
+        Writes the pending changes to the disk and prints the hit and miss statistics.
+        """
+        self.connection.commit()
+        self.connection.close()
+
+        lookups = self.hits + self.misses
+        if lookups > 0:
+            print(
+                f"Translation memory has {self.hits} hits and {self.misses} misses "
+                f"({self.hits / lookups:.2%} hit rate)"
+            )
+
+
+def recall_translations(
+    subtitle: collections.abc.Generator[srt.Subtitle],
+    ledger: collections.deque,
+    memory: TranslationMemory = None,
+    repeated: collections.Counter = None,
+) -> collections.abc.Generator[srt.Subtitle]:
+    """
+    Replaces the text of the subtitles translated before with their translation,
+    and yields only the rest to be translated, each text once.
+
+    Every subtitle is added to the ledger in its order with its original text and the subtitle
+    whose translation it takes: itself, or the first one with the same text.
+    `restore_translations` puts the subtitles that have not been sent back between the translated ones.
+
+    Args:
+        subtitle (collections.abc.Generator[srt.Subtitle]): A generator that yields each subtitle.
+        ledger (collections.deque): The subtitles in their order, their original text and their representative.
+        memory (TranslationMemory, optional): The memory of the translations, None to translate every text.
+                                              Defaults to None.
+        repeated (collections.Counter, optional): The counter to add each repetition of a text to,
+                                                  the subtitles that have not been sent for it. Defaults to None.
+
+    Yields:
+        srt.Subtitle: The subtitles to be translated.
+    """
+    representatives = {}
+    for sub in subtitle:
+        key = TranslationMemory.normalize(sub.content)
+        if key in representatives:
+            ledger.append((sub, sub.content, representatives[key]))
+            if repeated is not None:
+                repeated[key] += 1
+            continue
+
+        representatives[key] = sub
+        ledger.append((sub, sub.content, sub))
+
+        translation = memory.get(sub.content) if memory is not None else None
+        if translation is None:
+            yield sub
+        else:
+            sub.content = translation
+
+
+def restore_translations(
+    chunks: collections.abc.Generator[collections.abc.Generator[srt.Subtitle]],
+    ledger: collections.deque,
+    memory: TranslationMemory = None,
+) -> collections.abc.Generator[collections.abc.Generator[srt.Subtitle]]:
+    """
+    Puts the subtitles that have not been sent back between the translated ones in their order,
+    and remembers the translations.
+
+    The repeated subtitles take the translation of the first one with the same text,
+    which precedes them, so it has been translated by the time they are restored.
+
+    Args:
+        chunks (collections.abc.Generator[collections.abc.Generator[srt.Subtitle]]):
+                               A generator of generators containing translated subtitle chunks.
+        ledger (collections.deque): The subtitles in their order, their original text and their representative.
+        memory (TranslationMemory, optional): The memory to add the translations to. Defaults to None.
+
+    Yields:
+        collections.abc.Generator[collections.abc.Generator[srt.Subtitle]]:
+                               A generator of generators containing all the subtitle chunks.
+    """
+    for chunk in chunks:
+        restored = []
+        for sub in chunk:
+            # the subtitles that have not been sent precede the translated one in the ledger
+            recalled, original, representative = ledger.popleft()
+            while recalled is not sub:
+                recalled.content = representative.content
+                restored.append(recalled)
+                recalled, original, representative = ledger.popleft()
+
+            # a chunk that has failed keeps its original text, which is not a translation to remember
+            if memory is not None and sub.content and sub.content != original:
+                memory.put(original, sub.content)
+
+            restored.append(sub)
+
+        yield restored
+
+    if ledger:
+        for recalled, _, representative in ledger:
+            recalled.content = representative.content
+
+        yield [recalled for recalled, _, _ in ledger]
+        ledger.clear()
@@ -0,0 +1,167 @@
+""" This module contains the scheduler that keeps the translation requests within the rate limits of the service. """
+
+import collections.abc
+import random
+import threading
+import time
+
+from translate_subtitles.utils.backends import ServiceUnavailable
+
+# The number of times a request is repeated after the service has rejected it for the time being
+MAX_RETRIES = 6
+
+# The number of seconds to wait before the first repetition, doubled for each next one
+BACKOFF = 1.0
+
+# The longest number of seconds to wait before a repetition
+MAX_BACKOFF = 60.0
+
+
+class TokenBucket:
+    """
+    The budget of a resource replenished evenly over a minute, such as requests or tokens per minute.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        """
+        Fills the bucket.
+
+        Args:
+            per_minute (float): The amount of the resource available per minute.
+        """
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Takes the amount from the bucket, going into debt if there is not enough of it.
+
+        Args:
+            amount (float): The amount of the resource to be used, at most the capacity of the bucket.
+
+        Returns:
+            float: The number of seconds to wait until the amount is replenished.
+        """
+        now = time.monotonic()
+        self.level = min(self.level + (now - self.updated) * self.rate, self.capacity)
+        self.updated = now
+
+        # a request larger than the bucket would never be admitted, so it waits for the full bucket
+        self.level -= min(amount, self.capacity)
+
+        return max(-self.level / self.rate, 0.0)
+
+
+class RateScheduler:
+    """
+    The scheduler that admits the requests within the requests and tokens per minute of the service,
+    and repeats the rejected ones after a jittered exponential backoff or the delay the service asks for.
+
+    It is shared by the threads translating the chunks at the same time, and a rejected request pauses all
+    of them, so the rate drops below the limit instead of every thread hitting it.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = None,
+        tokens_per_minute: float = None,
+        max_retries: int = MAX_RETRIES,
+        backoff: float = BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+    ) -> None:
+        """
+        Sets up the budgets.
+
+        Args:
+            requests_per_minute (float, optional): The number of requests per minute, None if unlimited.
+                                                   Defaults to None.
+            tokens_per_minute (float, optional): The number of tokens per minute, None if unlimited.
+                                                 Defaults to None.
+            max_retries (int, optional): The number of times a rejected request is repeated. Defaults to 6.
+            backoff (float, optional): The number of seconds to wait before the first repetition. Defaults to 1.
+            max_backoff (float, optional): The longest number of seconds to wait before a repetition.
+                                           Defaults to 60.
+        """
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.lock = threading.Lock()
+        self.paused_until = 0.0
+        self.waited = 0.0
+        self.retries = 0
+
+    def acquire(self, tokens: int) -> None:
+        """
+        Waits until the request fits the budgets and the service is not paused.
+
+        Args:
+            tokens (int): The estimated number of the tokens of the request, the prompt and the completion.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            delay = self.paused_until - time.monotonic()
+            if self.requests is not None:
+                delay = max(delay, self.requests.reserve(1))
+            if self.tokens is not None:
+                delay = max(delay, self.tokens.reserve(tokens))
+
+            if delay > 0:
+                self.waited += delay
+
+        if delay > 0:
+            time.sleep(delay)
+
+    def __backoff(self, attempt: int, error: ServiceUnavailable) -> float:
+        """
+        Computes the delay before repeating the rejected request.
+
+        Args:
+            attempt (int): The number of the times the request has been repeated.
+            error (ServiceUnavailable): The rejection.
+
+        Returns:
+            float: The number of seconds to wait, the delay the service has asked for or the exponential backoff,
+                   with a random part, so the threads do not repeat their requests at the same time.
+        """
+        delay = min(self.backoff * 2**attempt, self.max_backoff)
+        if error.retry_after is not None:
+            return error.retry_after + random.uniform(0, self.backoff)
+
+        return random.uniform(delay / 2, delay)
+
+    def run(self, request: collections.abc.Callable[[], str], tokens: int) -> str:
+        """
+        Sends the request once it fits the budgets, repeating it while the service rejects it for the time being.
+
+        Args:
+            request (collections.abc.Callable[[], str]): The function sending the request.
+            tokens (int): The estimated number of the tokens of the request, the prompt and the completion.
+
+        Returns:
+            str: The response.
+
+        Raises:
+            ServiceUnavailable: The service has rejected the request more than `max_retries` times.
+        """
+        attempt = 0
+        while True:
+            self.acquire(tokens)
+            try:
+                return request()
+            except ServiceUnavailable as error:
+                if attempt >= self.max_retries:
+                    raise
+
+                delay = self.__backoff(attempt, error)
+                with self.lock:
+                    self.paused_until = max(self.paused_until, time.monotonic() + delay)
+                    self.retries += 1
+                attempt += 1
@@ -1,27 +1,20 @@
 """ Translate a given text from one language to another. """
 
-import os
-import json
-import openai
+from translate_subtitles.utils.backends import TranslationBackend, get_backend
 
-from translate_subtitles.utils.models import TRANSLATION_MODEL
 
-
-def translate_string(text: str, input_language: str, output_language: str) -> str:
+def translation_prompt(input_language: str, output_language: str) -> str:
     """
-    Translates the given text from the input language to the output language.
+    Creates the instructions to translate the table of sentences.
 
     Args:
-        text (str): The text to be translated.
         input_language (str): The language of the input text.
         output_language (str): The language to translate the text into.
 
     Returns:
-        str: The translated text.
+        str: The instructions of the translation.
     """
-    openAiClient = openai.OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-
-    prompt = (
+    return (
         f"You will be provided with a table of sentences in {input_language}, "
         f"and your task is to translate it into {output_language}, "
         "using the following table format:\n"
@@ -36,18 +29,29 @@ def translate_string(text: str, input_language: str, output_language: str) -> st
         "and the translations in the 'Translated' column. Translate row by row."
     )
 
-    response = openAiClient.chat.completions.create(
-        model=TRANSLATION_MODEL.get("name"),
-        messages=[
-            {
-                "role": "system",
-                "content": prompt,
-            },
-            {"role": "user", "content": text},
-        ],
-    )
 
-    response_json = json.loads(response.model_dump_json(indent=2))
-    content = response_json["choices"][0]["message"]["content"]
+def translate_string(
+    text: str,
+    input_language: str,
+    output_language: str,
+    backend: TranslationBackend = None,
+) -> str:
+    """
+    Translates the given text from the input language to the output language.
+
+    Args:
+        text (str): The text to be translated.
+        input_language (str): The language of the input text.
+        output_language (str): The language to translate the text into.
+        backend (TranslationBackend, optional): The service to translate the text with,
+                                                the OpenAI API if not provided. Defaults to None.
+
+    Returns:
+        str: The translated text.
+    """
+    if backend is None:
+        backend = get_backend()
+
+    prompt = translation_prompt(input_language, output_language)
 
-    return content
+    return backend.complete(prompt, text)
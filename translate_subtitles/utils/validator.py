@@ -1,4 +1,12 @@
-""" This module contains the functions to validate a translation. """
+""" This module contains the functions to parse and validate a translation. """
+
+import collections.abc
+
+
+class InvalidTranslation(Exception):
+    """
+    The error of a translation whose rows are still missing or misaligned after they have been requested again.
+    """
 
 
 def __decode_string(value: str) -> tuple[int, str]:
@@ -13,7 +21,7 @@ def __decode_string(value: str) -> tuple[int, str]:
 
     """
     parts = value.split("::")
-    if len(parts) != 3:
+    if len(parts) != 3 or not parts[1].strip().isdigit():
         return -1, ""
 
     number = int(parts[1].strip())
@@ -22,34 +30,37 @@ def __decode_string(value: str) -> tuple[int, str]:
     return number, string
 
 
-def translation_is_valid(translation: str, entries_number: int) -> bool:
+def parse_translation(
+    translation: str, indices: collections.abc.Container[int]
+) -> dict[int, str]:
     """
-    Check if the translation is valid.
+    Parse the well-formed rows of the translation, regardless of the rest of it.
+
+    A row is well-formed when it has both columns, the same requested index in both of them and neither of
+    the sentences is empty. The rows are matched by their index rather than their position, so a missing,
+    repeated or reordered row does not invalidate the others.
 
     Args:
-        subtitle_list (list[srt.Subtitle]): The list of subtitles.
-        entries_number (int): The number of entries in the translation.
+        translation (str): The table of the translated sentences.
+        indices (collections.abc.Container[int]): The indices of the requested sentences.
 
     Returns:
-        bool: True if the translation is valid, False otherwise.
+        dict[int, str]: The translated sentences by their index, the first one of each index.
     """
-    translation_list = translation.split("\n")[2:]
-
-    if len(translation_list) != entries_number:
-        return False
+    rows = {}
 
-    for line in translation_list:
+    for line in translation.split("\n"):
         columns = line.split("|")
         if len(columns) != 4:
-            return False
+            continue
 
         o_index, o_value = __decode_string(columns[1].strip())
         t_index, t_value = __decode_string(columns[2].strip())
 
-        if o_index != t_index:
-            return False
+        if o_index != t_index or o_index not in indices or o_index in rows:
+            continue
 
-        if not o_value or not t_value:
-            return False
+        if o_value and t_value:
+            rows[o_index] = t_value
 
-    return True
+    return rows